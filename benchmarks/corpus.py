@@ -0,0 +1,125 @@
+"""Synthetic corpora for the Grid benchmarks. Everything is generated locally."""
+import os
+import random
+import subprocess
+
+# name -> knobs. 'small' is quick enough for CI, 'large' mimics a big monorepo.
+SCALES = {
+    "small": {"small_files": 200, "huge_files": 1, "huge_kb": 512, "nested_depth": 60, "staged_files": 100},
+    "medium": {"small_files": 1500, "huge_files": 2, "huge_kb": 2048, "nested_depth": 90, "staged_files": 600},
+    "large": {"small_files": 6000, "huge_files": 4, "huge_kb": 4096, "nested_depth": 95, "staged_files": 3000},
+}
+
+# Looks like a key to the scanner, but isn't one
+FAKE_SECRET = "ghp_" + "A1b2C3d4E5" * 3 + "F6g7H8"
+
+def small_module(rng, index):
+    """A realistic little module: a class, a few functions, some branching."""
+    lines = [f'"""Module {index}."""', "import os", ""]
+    for f in range(rng.randint(2, 6)):
+        args = ", ".join(f"a{i}" for i in range(rng.randint(0, 5)))
+        lines += [
+            f"def func_{index}_{f}({args}):",
+            f"    total = {f}",
+            "    for item in range(10):",
+            "        if item % 2 and total:",
+            "            total += item",
+            "        elif item > 5:",
+            "            total -= 1",
+            "    return total",
+            "",
+        ]
+    lines += [
+        f"class Widget{index}:",
+        "    def __init__(self, name):",
+        "        self.name = name",
+        "",
+        "    def render(self):",
+        "        return [c for c in self.name if c.isalpha()]",
+        "",
+    ]
+    return "\n".join(lines)
+
+def huge_module(rng, target_kb):
+    """A multi-megabyte generated-looking file (think protobuf output)."""
+    chunks = []
+    size = 0
+    index = 0
+    while size < target_kb * 1024:
+        chunk = (
+            f"def generated_{index}(msg, field_{index}=None):\n"
+            f"    if msg is None:\n"
+            f"        return {{'id': {index}, 'name': 'field_{index}', 'values': [{index}, {index + 1}]}}\n"
+            f"    return msg\n\n"
+        )
+        chunks.append(chunk)
+        size += len(chunk)
+        index += 1
+    return "".join(chunks)
+
+def nested_module(depth):
+    """Deeply nested blocks + a deeply nested literal (recursion stress)."""
+    lines = ["def deep(x):"]
+    for level in range(depth):
+        lines.append("    " * (level + 1) + f"if x > {level}:")
+    lines.append("    " * (depth + 1) + "return x")
+    literal = "[" * depth + "0" + "]" * depth
+    lines.append(f"\nDATA = {literal}\n")
+    return "\n".join(lines)
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+def build(root, scale="small", seed=1337):
+    """
+    Writes a corpus under `root` and returns a summary dict.
+    The folder becomes a git repo with a commit plus a batch of staged files,
+    so secret scans have something realistic to chew on.
+    """
+    knobs = SCALES[scale]
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+
+    # 1. Many small files spread over packages
+    for i in range(knobs["small_files"]):
+        package = os.path.join(root, "src", f"pkg_{i % 40:02}")
+        os.makedirs(package, exist_ok=True)
+        with open(os.path.join(package, f"mod_{i:05}.py"), "w") as f:
+            f.write(small_module(rng, i))
+
+    # 2. A few huge files
+    os.makedirs(os.path.join(root, "generated"), exist_ok=True)
+    for i in range(knobs["huge_files"]):
+        with open(os.path.join(root, "generated", f"huge_{i}_pb2.py"), "w") as f:
+            f.write(huge_module(rng, knobs["huge_kb"]))
+
+    # 3. Deeply nested code
+    with open(os.path.join(root, "generated", "nested.py"), "w") as f:
+        f.write(nested_module(knobs["nested_depth"]))
+
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "bench@grid.local")
+    _git(root, "config", "user.name", "bench")
+    _git(root, "add", ".")
+    _git(root, "commit", "-qm", "corpus")
+
+    # 4. Staged changes for the secret scanner (a few of them leak)
+    staged = os.path.join(root, "staged")
+    os.makedirs(staged, exist_ok=True)
+    for i in range(knobs["staged_files"]):
+        body = small_module(rng, 100000 + i)
+        if i % 50 == 0:
+            body += f'\nTOKEN = "{FAKE_SECRET}"\n'
+        with open(os.path.join(staged, f"change_{i:05}.py"), "w") as f:
+            f.write(body)
+    _git(root, "add", "staged")
+
+    total_bytes = 0
+    total_files = 0
+    for current, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d != ".git"]
+        for file in files:
+            total_files += 1
+            total_bytes += os.path.getsize(os.path.join(current, file))
+
+    return {"scale": scale, "files": total_files, "bytes": total_bytes, **knobs}
@@ -0,0 +1,181 @@
+"""
+Grid benchmark suite.
+
+    python -m benchmarks.run --scale small --output bench.json
+    python -m benchmarks.run --scale small --compare bench.json
+
+Builds a synthetic corpus in a temp folder, times the hot paths and writes
+machine-readable results. With --compare, exits non-zero when any benchmark
+got slower than the baseline by more than --tolerance.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+
+def _timed(func, repeat):
+    """Runs func `repeat` times, returns (best seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+@contextlib.contextmanager
+def _silenced():
+    """Mutes rich + print output from the commands being measured."""
+    from grid.core import utils
+    utils.console.quiet = True
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        utils.console.quiet = False
+
+def _python_files(root):
+    paths = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d != ".git"]
+        paths += [os.path.join(current, f) for f in files if f.endswith(".py")]
+    return sorted(paths)
+
+def bench_analyze_python(root, repeat):
+    from grid.core import analyzer
+
+    paths = _python_files(root)
+    size = sum(os.path.getsize(p) for p in paths)
+    seconds, _ = _timed(lambda: [analyzer.analyze_python(p) for p in paths], repeat)
+    return {
+        "seconds": seconds,
+        "files": len(paths),
+        "files_per_second": len(paths) / seconds,
+        "mb_per_second": size / 1024 / 1024 / seconds,
+    }
+
+def bench_analyze_huge(root, repeat):
+    from grid.core import analyzer
+
+    paths = [p for p in _python_files(root) if "huge_" in p]
+    size = sum(os.path.getsize(p) for p in paths)
+    seconds, _ = _timed(lambda: [analyzer.analyze_python(p) for p in paths], repeat)
+    return {"seconds": seconds, "files": len(paths), "mb_per_second": size / 1024 / 1024 / seconds}
+
+def bench_roast_project(root, repeat, jobs):
+    from grid.commands import roast
+
+    def run():
+        with _silenced():
+            roast.roast_project(jobs=jobs, use_cache=False)
+
+    seconds, _ = _timed(run, repeat)
+    files = len(_python_files(root))
+    return {"seconds": seconds, "files": files, "files_per_second": files / seconds, "jobs": jobs}
+
+def bench_scan_for_secrets(root, repeat):
+    from grid.core import git_police
+
+    seconds, leaks = _timed(git_police.scan_for_secrets, repeat)
+    staged = subprocess.check_output(["git", "diff", "--cached", "--name-only"]).decode().splitlines()
+    return {
+        "seconds": seconds,
+        "staged_files": len(staged),
+        "files_per_second": len(staged) / seconds,
+        "leaks_found": len(leaks or []),
+    }
+
+def bench_tree(root, repeat):
+    from grid.commands import tree
+
+    def run():
+        with _silenced():
+            tree.run()
+
+    seconds, _ = _timed(run, repeat)
+    return {"seconds": seconds}
+
+def run_suite(scale, repeat, jobs, workdir=None):
+    """Builds a corpus, runs every benchmark inside it, returns the results dict."""
+    root = workdir or tempfile.mkdtemp(prefix="grid-bench-")
+    previous = os.getcwd()
+    try:
+        info = corpus.build(root, scale=scale)
+        os.chdir(root)
+
+        benchmarks = {
+            "analyze_python": bench_analyze_python(root, repeat),
+            "analyze_python_huge": bench_analyze_huge(root, repeat),
+            "roast_project": bench_roast_project(root, repeat, jobs),
+            "scan_for_secrets": bench_scan_for_secrets(root, repeat),
+            "tree": bench_tree(root, repeat),
+        }
+    finally:
+        os.chdir(previous)
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "corpus": info,
+        "repeat": repeat,
+        "benchmarks": benchmarks,
+    }
+
+def compare(results, baseline, tolerance):
+    """Returns a list of (name, old, new) for benchmarks slower than baseline * (1 + tolerance)."""
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        old = baseline.get("benchmarks", {}).get(name)
+        if not old:
+            continue
+        if current["seconds"] > old["seconds"] * (1 + tolerance):
+            regressions.append((name, old["seconds"], current["seconds"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grid benchmark suite")
+    parser.add_argument("--scale", choices=sorted(corpus.SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (best is kept)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes for roast_project")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", metavar="BASELINE", help="Fail if slower than this results file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--workdir", help="Build the corpus here and keep it (default: temp folder)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.scale, args.repeat, args.jobs, workdir=args.workdir)
+
+    for name, data in results["benchmarks"].items():
+        extra = ", ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+                          for k, v in data.items() if k != "seconds")
+        print(f"{name:<22} {data['seconds']:8.3f}s  {extra}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {old:.3f}s -> {new:.3f}s")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
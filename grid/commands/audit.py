@@ -0,0 +1,76 @@
+from rich.markup import escape
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+from rich.table import Table
+from rich import box
+from grid.core import utils, audit, config, git_police, policy, scraper
+
+# Findings listed in the report (the rest are summarized)
+REPORT_LIMIT = 50
+
+def run(jobs=None, restart=False):
+    """Scans every blob ever committed for secrets and banned files."""
+    utils.print_header("AUDITING FULL HISTORY")
+
+    cfg = config.load_project_config()
+    banned_files = git_police.SENSITIVE_FILES + (cfg.get("banned_files", []) if cfg else [])
+    secrets = git_police.build_matcher(cfg)
+    for pattern_id, error in secrets.errors:
+        utils.print_warning(f"Ignoring broken secret pattern '{pattern_id}': {error}")
+    for pattern, error in policy.compile_policy(banned_files).errors:
+        utils.print_warning(f"Ignoring broken banned_files pattern '{pattern}': {error}")
+
+    log = audit.AuditLog(audit.fingerprint(secrets, banned_files), restart=restart)
+    if log.resumed:
+        utils.print_info("Resuming previous audit. (--restart to start over)")
+
+    # 1. Walk history (each unique blob is read once; finished chunks are checkpointed)
+    progress = Progress(
+        TextColumn("[cyan]Scanning blobs"), BarColumn(), MofNCompleteColumn(), TimeRemainingColumn(),
+        console=utils.console, transient=True
+    )
+    task = progress.add_task("audit", total=None)
+    try:
+        with progress:
+            total, scanned = audit.run(
+                log, git_police.secret_rules(cfg), banned_files, jobs=jobs,
+                progress=lambda done, count: progress.update(task, completed=done, total=count)
+            )
+    except KeyboardInterrupt:
+        log.close()
+        utils.print_warning("Audit interrupted. Progress saved, run 'grid audit' again to resume.")
+        return
+    except OSError as e:
+        log.close()
+        utils.print_error(f"Audit failed: {e}")
+        return
+
+    findings = log.findings()
+    skipped = log.skipped_count()
+    log.close()
+
+    utils.print_info(f"{total} unique blobs in history, {scanned} scanned this run.")
+    if skipped:
+        utils.print_warning(f"{skipped} blobs over {audit.MAX_BLOB_BYTES // 1024 // 1024} MB were not read.")
+
+    if not findings:
+        utils.print_success("History is clean. No secrets ever committed.")
+        return
+
+    # 2. Report (oldest commit carrying each leaking blob, so you know how far back to rewrite)
+    table = Table(title="Secrets In History", box=box.ROUNDED)
+    table.add_column("File Name", style="cyan")
+    table.add_column("Line", justify="right")
+    table.add_column("Pattern", style="red")
+    table.add_column("First Commit", style="magenta")
+
+    origins = audit.first_commits(sha for *_, sha in findings[:REPORT_LIMIT])
+    for path, pattern_id, _, line, sha in findings[:REPORT_LIMIT]:
+        table.add_row(escape(path), str(line or "-"), pattern_id, escape(origins.get(sha) or sha[:8]))
+
+    utils.console.print(table)
+    if len(findings) > REPORT_LIMIT:
+        utils.print_warning(f"...and {len(findings) - REPORT_LIMIT} more.")
+
+    roast = scraper.get_random_roast("secrets")
+    utils.print_error(f"{len(findings)} leaks found in history. {roast}")
+    utils.print_warning("Rotate these credentials: rewriting history does not un-leak them.")
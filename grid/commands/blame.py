@@ -1,12 +1,25 @@
 import subprocess
 import os
-from grid.core import utils, config, scraper, broadcaster
+import time
+from rich.table import Table
+from rich.markup import escape
+from grid.core import utils, config, scraper, broadcaster, cache, ownership
 
 def run(target, line, share):
     if not os.path.exists(target):
         utils.print_error(f"File {target} not found.")
         return
 
+    # Ranges ("10-80") and whole files get an ownership report instead
+    if line is None or not str(line).isdigit():
+        try:
+            start, end = ownership.parse_range(line)
+        except ValueError:
+            utils.print_error(f"Bad line range '{line}'. Use a line (42), a range (10-80) or nothing for the whole file.")
+            return
+        run_report(target, start, end, share)
+        return
+
     # 1. Run Git Blame
     # -L 5,5 means "only line 5"
     try:
@@ -40,4 +53,57 @@ def run(target, line, share):
     # 4. Public Shame
     if share:
         broadcaster.broadcast_roast(identity, author, f"Suspect Line {line} in {target}", roast, False)
-        utils.print_success("Shame broadcasted to team.")
\ No newline at end of file
+        utils.print_success("Shame broadcasted to team.")
+
+def run_report(target, start, end, share):
+    """Who owns a file (or a range of it), lines aggregated per author while git blame streams."""
+    where = f"{target}:{start}-{end}" if start else target
+    utils.print_header(f"BLAME INVESTIGATION: {where}")
+
+    # 1. Blame (cached per blob + path + range in .grid_cache/blame.db)
+    store = cache.open_store("blame")
+    try:
+        with utils.console.status("[bold green]Following the paper trail...[/]", spinner="dots") as status:
+            progress = lambda lines: status.update(f"[bold green]Following the paper trail... {lines} lines[/]")
+            report = ownership.who_owns(target, start, end, store=store, progress=progress)
+    except (OSError, subprocess.CalledProcessError):
+        utils.print_error("Could not blame this file. (Is it committed?)")
+        return
+    finally:
+        if store:
+            store.close()
+
+    if not report["lines"]:
+        utils.print_warning("Nothing to blame here.")
+        return
+
+    # 2. The Lineup
+    table = Table(title="Ownership Report")
+    table.add_column("Author", style="cyan")
+    table.add_column("Lines", justify="right")
+    table.add_column("Share", justify="right")
+    table.add_column("Commits", justify="right")
+    table.add_column("Last Touched", justify="right")
+
+    ranking = ownership.ranked(report)
+    for author, entry in ranking:
+        share_pct = 100 * entry["lines"] / report["lines"]
+        touched = time.strftime("%Y-%m-%d", time.localtime(entry["latest"])) if entry["latest"] else "-"
+        table.add_row(escape(author), str(entry["lines"]), f"{share_pct:.0f}%", str(entry["commits"]), touched)
+    utils.console.print(table)
+
+    # 3. The Verdict (aimed at the biggest owner)
+    identity = config.get_global_identity()
+    author, entry = ranking[0]
+    share_pct = 100 * entry["lines"] / report["lines"]
+    if author.lower() == identity.lower():
+        roast = f"You own {share_pct:.0f}% of this. Every bug in here has your name on it."
+        utils.print_error(f">> Grid: {roast}")
+    else:
+        roast = scraper.get_random_roast("roasts")
+        utils.print_success(f">> Grid: {roast}")
+
+    # 4. Public Shame
+    if share:
+        broadcaster.broadcast_roast(identity, author, f"Owns {share_pct:.0f}% of {where}", roast, False)
+        utils.print_success("Shame broadcasted to team.")
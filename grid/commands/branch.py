@@ -1,19 +1,20 @@
 import subprocess
-from grid.core import utils, git_police, scraper
+from grid.core import utils, scraper, repo
 
 def run(name):
     utils.print_header("BRANCH MANAGER")
     
     # 1. Get List of Branches
+    git = repo.current()
     try:
-        raw = subprocess.check_output(["git", "branch"], stderr=subprocess.DEVNULL).decode()
-        # Clean up output (remove * and spaces)
-        branches = [b.strip().replace("* ", "") for b in raw.splitlines()]
+        branches = git.branches()
     except:
+        branches = None
+    if not git.is_repo or branches is None:
         utils.print_error("Not a git repository.")
         return
 
-    current = git_police.get_current_branch()
+    current = git.current_branch()
 
     # 2. NAMING POLICE (Sassy Check)
     # If creating a new branch, judge the name
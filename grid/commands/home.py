@@ -1,18 +1,17 @@
 import subprocess
-from grid.core import utils, git_police
+from grid.core import utils, repo
 
 def run(clean):
     utils.print_header("RETURNING TO BASE")
 
     # 1. Identify "Home" (main or master)
-    try:
-        branches = subprocess.check_output(["git", "branch"], stderr=subprocess.DEVNULL).decode()
-    except:
+    git = repo.current()
+    if not git.is_repo:
         utils.print_error("Not a git repository.")
         return
 
-    target = "main" if "main" in branches else "master"
-    current = git_police.get_current_branch()
+    target = git.home_branch()
+    current = git.current_branch()
 
     if current == target:
         utils.print_warning(f"You are already on {target}.")
@@ -21,6 +20,7 @@ def run(clean):
     # 2. Switch
     utils.spin_action(f"Switching to {target}...", 
         lambda: subprocess.run(["git", "checkout", target], check=True))
+    git.invalidate()
     
     # 3. Update
     utils.spin_action("Pulling latest updates...", 
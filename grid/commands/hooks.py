@@ -0,0 +1,122 @@
+import os
+import socket
+import subprocess
+import sys
+from grid.core import utils, hookd
+
+def _hooks_dir():
+    try:
+        return hookd.git_path("hooks")
+    except (OSError, subprocess.CalledProcessError):
+        utils.print_error("Not a git repository.")
+        return None
+
+def _is_ours(path):
+    with open(path, errors="replace") as f:
+        return hookd.MARKER in f.read()
+
+def install(force=False):
+    """Writes Grid's pre-commit and pre-push hooks."""
+    utils.print_header("ARMING GIT HOOKS")
+    hooks_dir = _hooks_dir()
+    if not hooks_dir:
+        return
+
+    os.makedirs(hooks_dir, exist_ok=True)
+    sock = hookd.socket_path()
+    for hook in hookd.HOOKS:
+        path = os.path.join(hooks_dir, hook)
+        if os.path.exists(path) and not _is_ours(path) and not force:
+            utils.print_warning(f"{hook}: existing hook left alone (use --force to replace it)")
+            continue
+        with open(path, "w") as f:
+            f.write(hookd.hook_script(hook, sock))
+        os.chmod(path, 0o755)
+        utils.print_success(f"{hook} hook installed.")
+
+    if not hasattr(socket, "AF_UNIX"):
+        utils.print_info("No Unix sockets on this platform: hooks will scan in-process.")
+    else:
+        utils.print_info("Hooks start a warm Grid worker on first use ('grid hooks stop' to end it).")
+
+def uninstall():
+    """Removes hooks written by Grid (foreign hooks are kept)."""
+    utils.print_header("DISARMING GIT HOOKS")
+    hooks_dir = _hooks_dir()
+    if not hooks_dir:
+        return
+
+    for hook in hookd.HOOKS:
+        path = os.path.join(hooks_dir, hook)
+        if os.path.exists(path) and _is_ours(path):
+            os.remove(path)
+            utils.print_success(f"{hook} hook removed.")
+    stop(quiet=True)
+
+def serve():
+    """Runs the resident hook worker in the foreground."""
+    if not hasattr(socket, "AF_UNIX"):
+        utils.print_error("The hook worker needs Unix sockets, which this platform lacks.")
+        return
+    try:
+        sock = hookd.socket_path()
+    except (OSError, subprocess.CalledProcessError):
+        utils.print_error("Not a git repository.")
+        return
+
+    utils.print_info(f"Grid hook worker listening on {sock} (pid {os.getpid()})")
+    if not hookd.serve(sock):
+        utils.print_warning("A worker is already running for this repository.")
+
+def stop(quiet=False):
+    """Stops this repository's hook worker, if any."""
+    try:
+        sock = hookd.socket_path()
+    except (OSError, subprocess.CalledProcessError):
+        return
+    if hookd.request(sock, {"hook": "stop"}) is not None:
+        utils.print_success("Hook worker stopped.")
+    elif not quiet:
+        utils.print_info("No hook worker running.")
+
+def status():
+    """Shows which hooks are installed and whether the worker is warm."""
+    hooks_dir = _hooks_dir()
+    if not hooks_dir:
+        return
+    for hook in hookd.HOOKS:
+        path = os.path.join(hooks_dir, hook)
+        state = "[green]installed[/]" if os.path.exists(path) and _is_ours(path) else "[dim]not installed[/]"
+        utils.console.print(f"  {hook:<11} {state}")
+
+    reply = hookd.request(hookd.socket_path(), {"hook": "ping"})
+    worker = f"[green]warm[/] (pid {reply['pid']})" if reply else "[dim]not running[/]"
+    utils.console.print(f"  {'worker':<11} {worker}")
+
+def run(hook):
+    """
+    Runs a hook's scan (what hooks in frozen builds call): asks the warm worker, else scans
+    in-process and starts one for next time. Exits non-zero on leaks.
+    """
+    payload = hookd.hook_payload(hook, sys.stdin.read() if hook == "pre-push" else "")
+    try:
+        sock = hookd.socket_path()
+    except (OSError, subprocess.CalledProcessError):
+        utils.print_error("Not a git repository.")
+        sys.exit(1)
+
+    reply = hookd.request(sock, payload, timeout=120)
+    if reply is None or "error" in reply:
+        reply = hookd.handle(payload)
+        hookd.start_worker()
+    if "error" in reply:
+        utils.print_warning(f"{hook} scan failed ({reply['error']}), not blocking.")
+
+    findings = reply.get("findings", [])
+    if not findings:
+        utils.print_success("Clean.")
+        return
+    for path, pattern_id, line in findings:
+        where = f":{line}" if line is not None else ""
+        utils.print_warning(f"  {path}{where} \\[{pattern_id}]")
+    sys.exit(1)
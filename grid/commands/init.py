@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from grid.core import utils, config, cloud
+from grid.core import utils, config, repo
 
 def run():
     utils.print_header("INITIALIZING GRID PROJECT")
@@ -16,7 +16,7 @@ def run():
     project_id = f"QG/{date_stamp}/{project_name}"
     
     # Get GitHub URL from git remote
-    repo_url = cloud.get_git_remote() or ""
+    repo_url = repo.current().web_url() or ""
     
     # Create template .grid file
     template = {
@@ -53,6 +53,7 @@ def _update_gitignore():
         "# Grid CLI - Sensitive Configuration",
         ".grid",
         ".grid_identity",
+        ".grid_cache/",
         "",
         "# Common Secret Files",
         ".env",
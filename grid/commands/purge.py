@@ -1,36 +1,141 @@
+import fnmatch
+import os
 import subprocess
-from grid.core import utils, git_police
+from grid.core import utils, repo
 
-def run():
+# Never deleted, locally or on the remote
+PROTECTED = ["main", "master", "dev", "production"]
+
+# Branch names per 'git branch -d' call (keeps the command line well under OS limits)
+BATCH = 500
+
+# Remote branches 'grid purge --remote' considers unless given --pattern (teammates' others are theirs)
+REMOTE_PATTERN = "cowboy/*"
+
+def _untranslated():
+    """Environment for git runs whose messages we parse (git translates them otherwise)."""
+    return {**os.environ, "LC_ALL": "C"}
+
+def _delete_local(branches):
+    """Deletes local branches with batched 'git branch -d'. Returns the names git deleted."""
+    deleted = []
+    for i in range(0, len(branches), BATCH):
+        result = subprocess.run(["git", "branch", "-d", *branches[i:i + BATCH]],
+                                capture_output=True, text=True, env=_untranslated())
+        # "Deleted branch cowboy/x (was 1a2b3c4)."
+        deleted += [line.split()[2] for line in result.stdout.splitlines() if line.startswith("Deleted branch ")]
+    return deleted
+
+def _delete_remote(remote, branches):
+    """Deletes remote branches with one multi-ref 'git push --delete'. Returns the names deleted."""
+    result = subprocess.run(["git", "push", "--porcelain", remote, "--delete", *branches],
+                            capture_output=True, text=True, env=_untranslated())
+
+    # One branch that's already gone makes git refuse the whole push; retry without those
+    # ("error: unable to delete 'cowboy/x': remote ref does not exist")
+    prefix, suffix = "error: unable to delete '", "': remote ref does not exist"
+    missing = {line[len(prefix):-len(suffix)] for line in result.stderr.splitlines()
+               if line.startswith(prefix) and line.endswith(suffix)}
+    remaining = [branch for branch in branches if branch not in missing]
+    if missing and remaining:
+        return _delete_remote(remote, remaining)
+
+    # Porcelain lines: "-\t:refs/heads/cowboy/x\t[deleted]" (flag "!" means rejected)
+    deleted = []
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) >= 2 and parts[0] == "-" and parts[1].startswith(":refs/heads/"):
+            deleted.append(parts[1][len(":refs/heads/"):])
+    return deleted
+
+def _report(to_delete, deleted, dry_run, where):
+    if dry_run:
+        for branch in to_delete:
+            print(f"   [ ] Would delete '{where}{branch}'")
+        utils.print_info(f"Dry run: {len(to_delete)} branches would be deleted.")
+        return
+    if deleted is None:
+        utils.print_info("Aborted. Nothing was deleted.")
+        return
+
+    for branch in to_delete:
+        if branch in deleted:
+            print(f"   [x] Deleted '{where}{branch}'")
+        else:
+            print(f"   [!] Failed to delete '{where}{branch}' (Unmerged changes?)")
+
+def run(remote=False, dry_run=False, pattern=REMOTE_PATTERN, yes=False):
     utils.print_header("INITIATING GARBAGE COLLECTION")
-    
-    # 1. Get Merged Branches
+    git = repo.current()
+    if not git.is_repo:
+        utils.print_error("Git error: Not a repository or no branches found.")
+        return
+
+    if remote:
+        _purge_remote(git, dry_run, pattern=pattern, yes=yes)
+    else:
+        _purge_local(git, dry_run)
+
+def _purge_local(git, dry_run):
+    # 1. Get Merged Branches (one for-each-ref)
     try:
-        raw = subprocess.check_output(["git", "branch", "--merged"], stderr=subprocess.DEVNULL).decode()
+        branches = git.merged_branches()
     except:
         utils.print_error("Git error: Not a repository or no branches found.")
         return
 
-    branches = [b.strip().replace("* ", "") for b in raw.splitlines()]
-    
     # 2. Filter Protected Branches
-    current = git_police.get_current_branch()
-    protected = ["main", "master", "dev", "production", current]
-    
+    protected = PROTECTED + [git.current_branch()]
     to_delete = [b for b in branches if b not in protected]
-    
+
     if not to_delete:
         utils.print_success("System is clean. No trash detected.")
         return
 
-    # 3. The Purge
-    utils.print_warning(f"Deleting {len(to_delete)} dead branches...")
-    
-    for branch in to_delete:
-        try:
-            subprocess.run(["git", "branch", "-d", branch], check=True, stderr=subprocess.DEVNULL)
-            print(f"   [x] Deleted '{branch}'")
-        except:
-            print(f"   [!] Failed to delete '{branch}' (Unmerged changes?)")
-            
-    utils.print_success("Recycle Bin Emptied.")
\ No newline at end of file
+    # 3. The Purge (batched)
+    utils.print_warning(f"{'Found' if dry_run else 'Deleting'} {len(to_delete)} dead branches...")
+    deleted = [] if dry_run else _delete_local(to_delete)
+    git.invalidate()
+    _report(to_delete, deleted, dry_run, "")
+    if not dry_run:
+        utils.print_success("Recycle Bin Emptied.")
+
+def _purge_remote(git, dry_run, remote="origin", pattern=REMOTE_PATTERN, yes=False):
+    # 1. Refresh remote-tracking refs so we don't chase branches that are already gone
+    if subprocess.run(["git", "fetch", "--prune", "--quiet", remote], stderr=subprocess.DEVNULL).returncode:
+        utils.print_warning(f"Could not reach '{remote}'; using the last known state of its branches.")
+    git.invalidate()
+
+    # 2. Branches merged into the remote's default branch
+    home = git.remote_home(remote)
+    if not home:
+        utils.print_error(f"Can't find the default branch of '{remote}'.")
+        return
+    try:
+        branches = git.merged_branches(target=home, remote=remote)
+    except:
+        utils.print_error("Git error: Not a repository or no branches found.")
+        return
+
+    # A branch whose tip still equals main counts as merged, even if it was pushed a minute ago:
+    # only touch the branches the pattern names
+    protected = PROTECTED + [home.split("/", 1)[1], git.current_branch()]
+    to_delete = [b for b in branches if b not in protected and fnmatch.fnmatchcase(b, pattern)]
+
+    if not to_delete:
+        utils.print_success(f"'{remote}' is clean. No '{pattern}' trash detected.")
+        return
+
+    # 3. The Purge (one push for every branch, once the list is confirmed)
+    utils.print_warning(f"Found {len(to_delete)} merged '{pattern}' branches on '{remote}'...")
+    if dry_run:
+        deleted = []
+    else:
+        for branch in to_delete:
+            print(f"   [ ] {remote}/{branch}")
+        confirmed = yes or utils.confirm(f"Delete these {len(to_delete)} branches from '{remote}' for everyone?")
+        deleted = _delete_remote(remote, to_delete) if confirmed else None
+    git.invalidate()
+    _report(to_delete, deleted, dry_run, f"{remote}/")
+    if not dry_run and deleted is not None:
+        utils.print_success("Remote Recycle Bin Emptied.")
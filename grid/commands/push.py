@@ -1,7 +1,11 @@
 import subprocess
 import random
 import urllib.parse
-from grid.core import utils, git_police, scraper, config, cloud
+from rich.markup import escape
+from rich.table import Table
+from rich import box
+from grid.core import utils, git_police, scraper, config, cache, repo, policy
+from grid.core.timings import Profiler, phase
 
 def corporate_translator(message):
     """Turns 'fixing bug' into 'Resolved critical stability issues'."""
@@ -16,7 +20,7 @@ def corporate_translator(message):
 
 def generate_pr_link(branch, message):
     """Generates a GitHub URL that pre-fills the PR Title & Body."""
-    repo_url = cloud.get_git_remote() 
+    repo_url = repo.current().web_url()
     if not repo_url: return None
 
     base_url = repo_url.replace(".git", "")
@@ -35,78 +39,174 @@ def generate_pr_link(branch, message):
     
     return f"{base_url}/compare/main...{branch}?expand=1&title={safe_title}&body={safe_body}"
 
-def run(message):
+def run(message, diff_only=False, timings=False, timings_json=None):
+    """Safe push. With timings/timings_json, profiles each phase of the push."""
+    if not (timings or timings_json):
+        _push(message, diff_only, None)
+        return
+
+    profiler = Profiler()
+    try:
+        with profiler.installed():
+            _push(message, diff_only, profiler)
+    finally:
+        if timings:
+            print_timings(profiler.report())
+        if timings_json:
+            profiler.append_json(timings_json, command="push", diff_only=diff_only)
+
+def print_timings(report):
+    """Breakdown table: where the push spent its time."""
+    table = Table(title="Push Timings", box=box.ROUNDED)
+    table.add_column("Phase", style="cyan")
+    table.add_column("Total", justify="right")
+    table.add_column("Subprocess", justify="right")
+    table.add_column("Network", justify="right")
+    table.add_column("Python", justify="right")
+    table.add_column("Calls", justify="right")
+
+    ms = lambda seconds: f"{seconds * 1000:.0f} ms"
+    for record in report["phases"]:
+        table.add_row(record["name"], ms(record["seconds"]), ms(record["subprocess"]),
+                      ms(record["network"]), ms(record["python"]), str(record["calls"]))
+    utils.console.print(table)
+
+    slowest = report["slowest_calls"][:5]
+    for call in slowest:
+        utils.print_info(escape(f"{call['seconds'] * 1000:7.0f} ms  {call['kind']:<10} [{call['phase']}] {call['target']}"))
+    utils.print_info(f"Total: {report['total_seconds'] * 1000:.0f} ms")
+
+def _push(message, diff_only, profiler):
     utils.print_header("INITIATING PUSH SEQUENCE")
 
-    # 1. AUTO-STAGE
-    subprocess.run(["git", "add", "."])
+    # 1. WHAT CHANGED (git status compares stat info, so untouched files are never read)
+    with phase(profiler, "status"):
+        try:
+            changes = git_police.working_changes()
+        except (OSError, subprocess.CalledProcessError):
+            utils.print_error("Not a git repository.")
+            return
 
-    # 2. SECRET SCAN
+    # 2. SECRET SCAN (changed files straight from disk, before anything is staged)
     cfg = config.load_project_config()
     banned_files = cfg.get("banned_files", []) if cfg else [".env"]
-    leaks = git_police.scan_for_secrets(custom_patterns=banned_files)
+    for pattern_id, error in git_police.build_matcher(cfg).errors:
+        utils.print_warning(f"Ignoring broken secret pattern '{pattern_id}': {error}")
+    for pattern, error in policy.compile_policy(git_police.SENSITIVE_FILES + banned_files).errors:
+        utils.print_warning(f"Ignoring broken banned_files pattern '{pattern}': {error}")
+
+    # Diff mode scans only added lines (--diff-only, or "scan_mode": "diff" in .grid)
+    diff_only = diff_only or (cfg or {}).get("scan_mode") == "diff"
+    detector = git_police.build_entropy(cfg)
+    for regex, error in detector.errors if detector else []:
+        utils.print_warning(f"Ignoring broken entropy allow pattern '{regex}': {error}")
+
+    # Verdicts for unchanged blobs come from .grid_cache/secrets.db
+    store = cache.open_store("secrets")
+    try:
+        with phase(profiler, "secret scan"):
+            findings = git_police.scan_worktree(changes, custom_patterns=banned_files, cfg=cfg, diff_only=diff_only,
+                                                detector=detector, store=store, root=repo.current().toplevel())
+            leaked = {f.path for f in findings}
+
+        # 3. STAGE the clean files in one call (leaks never enter the index)
+        with phase(profiler, "stage"):
+            try:
+                git_police.stage([change.path for change in changes if change.path not in leaked])
+            except subprocess.CalledProcessError as e:
+                utils.print_error("Staging failed, nothing was committed:")
+                utils.console.print(escape(e.stderr.strip()), highlight=False)
+                return
+
+        # Files staged before this push are checked in the index
+        with phase(profiler, "index scan"):
+            staged_findings = git_police.scan_staged(custom_patterns=banned_files, cfg=cfg, diff_only=diff_only,
+                                                     detector=detector, store=store,
+                                                     exclude={change.path for change in changes})
+    finally:
+        if store:
+            store.close()
+    if store and store.hits:
+        utils.print_info(f"Secret scan: {store.hits} cached verdicts reused for unchanged files")
+    if detector and detector.truncated:
+        utils.print_warning(f"Entropy check ran out of time on {detector.truncated} files (.grid entropy.budget_ms_per_mb)")
+    findings += staged_findings
+    leaks = list(dict.fromkeys(f.path for f in findings))
     
     if leaks:
         roast = scraper.get_random_roast("secrets")
         utils.print_error(f"PUSH BLOCKED. {roast}")
         utils.print_warning(f"Restricted files detected: {leaks}")
-        subprocess.run(["git", "restore", "--staged"] + leaks)
+        for finding in findings:
+            where = f":{finding.line}" if finding.line is not None else ""
+            utils.print_warning(escape(f"  {finding.path}{where} [{finding.pattern_id}]"))
+
+        # Only files staged before this push can be in the index; take those back out
+        previously_staged = {f.path for f in staged_findings}
+        previously_staged |= {change.path for change in changes if change.staged and change.path in leaked}
+        with phase(profiler, "unstage"):
+            git_police.unstage(sorted(previously_staged))
         return
 
-    # 3. COWBOY PROTOCOL
-    current_branch = git_police.get_current_branch()
-    dev_name = config.get_global_identity()
-    is_cowboy = False
-    safe_branch = current_branch
-
-    # Protected branches trigger Cowboy Mode
-    if current_branch in ["main", "master", "dev", "production"]:
-        is_cowboy = True
-        roast = scraper.get_random_roast("cowboy_shame")
-        utils.print_warning(f"COWBOY DETECTED. {roast}")
-        
-        try:
-            full_roast = scraper.get_random_roast("roasts")
-            slug_words = full_roast.split()[:4]
-            slug = "-".join(slug_words).lower().replace(".", "").replace("!", "")
-        except:
-            slug = "reckless-behavior"
-
-        clean_msg = "".join(c if c.isalnum() else "-" for c in (message or "update")[:15]).lower()
-        safe_branch = f"cowboy/{dev_name}/{clean_msg}/{slug}"
-        
-        utils.print_header(f"Taking the wheel... Moving to {safe_branch}")
-        try:
-            subprocess.run(["git", "checkout", "-b", safe_branch], check=True)
-            utils.print_success(f"Branch Switched.")
-        except:
-            utils.print_error("Emergency branching failed.")
-            return
+    # 4. COWBOY PROTOCOL
+    with phase(profiler, "branch"):
+        current_branch = repo.current().current_branch()
+        dev_name = config.get_global_identity()
+        is_cowboy = False
+        safe_branch = current_branch
+
+        # Protected branches trigger Cowboy Mode
+        if current_branch in ["main", "master", "dev", "production"]:
+            is_cowboy = True
+            roast = scraper.get_random_roast("cowboy_shame")
+            utils.print_warning(f"COWBOY DETECTED. {roast}")
+            
+            try:
+                full_roast = scraper.get_random_roast("roasts")
+                slug_words = full_roast.split()[:4]
+                slug = "-".join(slug_words).lower().replace(".", "").replace("!", "")
+            except:
+                slug = "reckless-behavior"
 
-    # 4. COMMIT & PUSH
+            clean_msg = "".join(c if c.isalnum() else "-" for c in (message or "update")[:15]).lower()
+            safe_branch = f"cowboy/{dev_name}/{clean_msg}/{slug}"
+            
+            utils.print_header(f"Taking the wheel... Moving to {safe_branch}")
+            try:
+                subprocess.run(["git", "checkout", "-b", safe_branch], check=True)
+                utils.print_success(f"Branch Switched.")
+            except:
+                utils.print_error("Emergency branching failed.")
+                return
+
+    # 5. COMMIT & PUSH
     if not message: message = "grid auto-push"
-    subprocess.run(["git", "commit", "-m", message])
+    with phase(profiler, "commit"):
+        subprocess.run(["git", "commit", "-m", message])
     
-    utils.spin_action("Pushing to Origin...", 
-        lambda: subprocess.run(["git", "push", "--set-upstream", "origin", safe_branch]))
-
-    # 5. THE VERDICT (Compliment vs Boredom vs Magic Link)
-    if is_cowboy:
-        # User messed up -> Magic Link
-        pr_link = generate_pr_link(safe_branch, message)
-        if pr_link:
-            print("\n" + "="*60)
-            utils.print_success("⚠️  Code pushed to safety branch.")
-            print(f"\n[bold white]👉 CLICK TO OPEN PR (Pre-filled):[/]\n[underline cyan]{pr_link}[/]\n")
-            print("="*60 + "\n")
-    else:
-        # User did good -> Check for Boredom
-        # 30% chance Grid gets annoyed at your perfection
-        if random.random() < 0.3:
-            sassy_complaint = scraper.get_random_roast("roast_immune")
-            utils.print_warning(f"Code is live. {sassy_complaint}")
+    with phase(profiler, "push"):
+        utils.spin_action("Pushing to Origin...", 
+            lambda: subprocess.run(["git", "push", "--set-upstream", "origin", safe_branch]))
+
+    # 6. THE VERDICT (Compliment vs Boredom vs Magic Link)
+    with phase(profiler, "verdict"):
+        if is_cowboy:
+            # User messed up -> Magic Link
+            pr_link = generate_pr_link(safe_branch, message)
+            if pr_link:
+                print("\n" + "="*60)
+                utils.print_success("⚠️  Code pushed to safety branch.")
+                print(f"\n[bold white]👉 CLICK TO OPEN PR (Pre-filled):[/]\n[underline cyan]{pr_link}[/]\n")
+                print("="*60 + "\n")
         else:
-            compliment = scraper.get_random_roast("compliments")
-            utils.print_success(f"Code is live. {compliment}")
+            # User did good -> Check for Boredom
+            # 30% chance Grid gets annoyed at your perfection
+            if random.random() < 0.3:
+                sassy_complaint = scraper.get_random_roast("roast_immune")
+                utils.print_warning(f"Code is live. {sassy_complaint}")
+            else:
+                compliment = scraper.get_random_roast("compliments")
+                utils.print_success(f"Code is live. {compliment}")
 
-    scraper.trigger_background_update()
\ No newline at end of file
+    with phase(profiler, "scraper"):
+        scraper.trigger_background_update()
@@ -1,33 +1,52 @@
 import subprocess
 from rich.table import Table
-from grid.core import utils
+from grid.core import utils, config, leaderboard, repo
 
-def run():
+def _age(seconds):
+    if seconds < 90:
+        return "just now"
+    if seconds < 90 * 60:
+        return f"{seconds / 60:.0f} min ago"
+    if seconds < 36 * 3600:
+        return f"{seconds / 3600:.0f} h ago"
+    return f"{seconds / 86400:.0f} days ago"
+
+def run(refresh=False, offline=False, history=False):
     utils.print_header("GRID LEADERBOARD (HALL OF SHAME)")
-    
-    # 1. Fetch all remote branches
+    git = repo.current()
+    if not git.is_repo:
+        utils.print_error("Not a git repository.")
+        return
+
+    # 1. Remote refs: fetched only when asked, never fetched before, or stale (then in the background)
+    cfg = config.load_project_config() or {}
+    ttl = cfg.get("rank_ttl", leaderboard.DEFAULT_TTL)
+    age = leaderboard.fetch_age(git.git_dir)
+    if not offline:
+        if refresh or age is None:
+            if utils.spin_action("Fetching origin", leaderboard.refresh):
+                age = 0
+            else:
+                utils.print_warning("Could not reach origin (offline?). Using the last known branches.")
+        elif age > ttl:
+            leaderboard.refresh(background=True)
+
+    # 2. Count Cowboy Incidents (local refs only: instant, works offline)
     try:
-        # git ls-remote returns list of refs
-        raw = subprocess.check_output(["git", "ls-remote", "--heads", "origin"], stderr=subprocess.DEVNULL).decode()
-    except:
-        utils.print_error("Could not fetch remote stats (Are you online?).")
+        active = leaderboard.remote_cowboys()
+    except (OSError, subprocess.CalledProcessError):
+        utils.print_error("Could not read remote branches.")
         return
+    snapshot = leaderboard.record(leaderboard.load_snapshot(), active)
+    leaderboard.save_snapshot(snapshot)
 
-    # 2. Count Cowboy Incidents
-    # Format of line: "hash\trefs/heads/cowboy/tanishq/fix-bug"
-    scores = {}
-    
-    for line in raw.splitlines():
-        if "cowboy/" in line:
-            parts = line.split("/")
-            # refs/heads/cowboy/{user}/{msg}/{slug}
-            # Index: 0/1/2/3/4/5
-            try:
-                # part[3] is the user name (e.g., tanishq)
-                user = parts[3].capitalize()
-                scores[user] = scores.get(user, 0) + 1
-            except:
-                continue
+    counted = set(active)
+    if history:
+        # Branches since merged or deleted: remembered ones + those named in merge commits
+        counted |= set(snapshot["branches"])
+        home = git.remote_home()
+        counted |= leaderboard.merged_cowboys(home or "HEAD")
+    scores = leaderboard.scores(counted)
 
     if not scores:
         utils.print_success("No cowboy branches detected. This team is... surprisingly professional.")
@@ -53,4 +72,6 @@ def run():
         table.add_row(f"#{i}", user, str(count), title)
 
     utils.console.print(table)
-    utils.print_warning("Stats are based on active 'cowboy/' branches on origin.")
\ No newline at end of file
+    scope = "every 'cowboy/' branch ever seen" if history else "active 'cowboy/' branches"
+    fetched = f"origin as of {_age(age)}" if age is not None else "origin (never fetched)"
+    utils.print_warning(f"Stats are based on {scope} on {fetched}.")
\ No newline at end of file
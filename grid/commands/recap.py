@@ -1,5 +1,7 @@
-import subprocess
+import os
+import time
 from grid.core import utils, config
+from grid.core import workspace as workspace_tools
 
 def corporate_translator(message):
     """Translates dev-speak to manager-speak."""
@@ -14,34 +16,37 @@ def corporate_translator(message):
         return "Conducted ongoing research and development."
     return f"Progressed on task: {message}"
 
-def run():
+def run(workspace=None, jobs=None):
     utils.print_header("GENERATING DAILY REPORT")
     
     identity = config.get_global_identity()
     
     # Get commits from last 24h by this author
     # We try to match git config name roughly if identity fails
-    cmd = [
-        "git", "log", 
-        f"--author={identity}", 
-        "--since=24.hours", 
-        "--pretty=format:%s"
-    ]
-    
-    try:
-        logs = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode().splitlines()
-    except:
-        logs = []
+    if workspace:
+        # Every repo under the folder, queried in parallel and merged by time
+        repos = workspace_tools.discover(workspace)
+        if not repos:
+            utils.print_warning(f"No git repositories found under '{workspace}'.")
+            return
+        utils.print_info(f"Scanning {len(repos)} repositories...")
+        commits = workspace_tools.collect(repos, author=identity, jobs=jobs, root=os.path.abspath(workspace))
+    else:
+        commits = workspace_tools.recent_commits(".", author=identity)
 
-    if not logs:
+    if not commits:
         utils.print_warning(f"No activity detected for '{identity}' in the last 24 hours.")
         utils.print_warning("(Try 'grid auth <git_name>' if the name doesn't match)")
         return
 
     print(f"\n[bold underline]Daily Standup for {identity}:[/]\n")
     
-    for log in logs:
-        translated = corporate_translator(log)
-        print(f"• {translated} (Ref: '{log}')")
+    for commit in commits:
+        translated = corporate_translator(commit.subject)
+        if workspace:
+            when = time.strftime("%H:%M", time.localtime(commit.timestamp))
+            print(f"• {when} [{commit.repo}] {translated} (Ref: '{commit.subject}')")
+        else:
+            print(f"• {translated} (Ref: '{commit.subject}')")
         
-    utils.print_success("\nCopy-paste this to your manager.")
\ No newline at end of file
+    utils.print_success("\nCopy-paste this to your manager.")
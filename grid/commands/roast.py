@@ -1,9 +1,17 @@
+import heapq
 import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from rich.console import Group
+from rich.live import Live
+from rich.markup import escape
+from rich.panel import Panel
 from rich.table import Table
 from rich import box
-from grid.core import utils, analyzer, scraper, config, broadcaster, git_police
+from grid.core import utils, analyzer, scanner, cache, history, scraper, config, broadcaster, git_police
 
-def roast_file(target):
+def roast_file(target, max_kb=None):
     """Analyzes a single file and roasts it."""
     if not os.path.exists(target):
         utils.print_error(f"File not found: {target}")
@@ -12,7 +20,10 @@ def roast_file(target):
     utils.print_header(f"ANALYZING: {target}")
     
     # 1. Get Complexity Stats
-    stats = analyzer.analyze_file(target)
+    stats = analyzer.analyze_file(target, max_bytes=_max_file_bytes(max_kb))
+    if stats.get('skipped'):
+        utils.print_warning(f"Skipped: {stats['skipped']}. Grid only roasts source code it can read.")
+        return
     
     # 2. Determine Verdict
     if stats['score'] < 5:
@@ -29,67 +40,184 @@ def roast_file(target):
         title=f"Roast Report: {target}"
     )
 
-def roast_project():
+# How many worst files the live mode keeps for the final table (unless --top is given)
+LIVE_TOP = 25
+
+# Live view repaint interval (seconds)
+LIVE_REFRESH = 0.1
+
+def _status_for(score):
+    """Assigns a Status Icon based on score."""
+    if score < 5:
+        return "toxic", "[bold red]🔥 Toxic[/]"
+    elif score < 8:
+        return "messy", "[yellow]⚠️  Messy[/]"
+    return "clean", "[bold green]✅ Clean[/]"
+
+def _max_file_bytes(max_kb=None):
+    """Size limit for analysis: --max-size, else .grid "analysis.max_file_kb", else the default."""
+    if max_kb is None:
+        cfg = config.load_project_config() or {}
+        max_kb = (cfg.get("analysis") or {}).get("max_file_kb")
+    return max_kb * 1024 if max_kb else analyzer.MAX_FILE_BYTES
+
+def _clean_path(path):
+    """Cleans up path for display (removes ./ and win style slashes)."""
+    return path.replace(".\\", "").replace("./", "")
+
+class Scoreboard:
+    """
+    Running aggregates for a project scan.
+    With `top` set, only the worst `top` files are retained, so memory stays
+    flat no matter how many files stream through.
+    """
+
+    def __init__(self, top=None):
+        self.top = top
+        self.rows = []  # a heap of (-score, -seq, path, status) when top is set
+        self.recent = deque(maxlen=8)
+        self.skipped = []
+        self.skipped_count = 0
+        self.counts = {"toxic": 0, "messy": 0, "clean": 0}
+        self.total_score = 0
+        self.file_count = 0
+
+    def add(self, path, score):
+        tier, status = _status_for(score)
+        self.counts[tier] += 1
+        self.total_score += score
+        self.file_count += 1
+        self.recent.append((path, score, status))
+
+        row = (-score, -self.file_count, path, status)
+        if self.top is None:
+            self.rows.append(row)
+        elif len(self.rows) < self.top:
+            heapq.heappush(self.rows, row)
+        else:
+            # Evicts the best file kept so far if this one is worse
+            heapq.heappushpop(self.rows, row)
+
+    def skip(self, path, reason):
+        """Records a file that was not analyzed (too large, binary). Not scored."""
+        self.skipped_count += 1
+        if self.top is None or len(self.skipped) < self.top:
+            self.skipped.append((path, reason))
+
+    def worst(self):
+        """Kept files, worst first (ties keep scan order)."""
+        ordered = sorted(self.rows, key=lambda r: (-r[0], -r[1]))
+        return [(path, -neg_score, status) for neg_score, _, path, status in ordered]
+
+    @property
+    def average(self):
+        return self.total_score / self.file_count if self.file_count else 0
+
+def _live_view(board, total, elapsed):
+    """Renders the in-progress panel: running aggregates + the latest files."""
+    rate = board.file_count / elapsed if elapsed > 0 else 0
+    summary = (
+        f"[bold]{board.file_count}/{total}[/] files  "
+        f"[bold]avg[/] {board.average:.1f}/10  "
+        f"[bold red]🔥 {board.counts['toxic']}[/]  "
+        f"[yellow]⚠️  {board.counts['messy']}[/]  "
+        f"[bold green]✅ {board.counts['clean']}[/]  "
+        f"[dim]⏭️  {board.skipped_count}[/]  "
+        f"[dim]{rate:.0f} files/s[/]"
+    )
+
+    recent = Table(box=box.SIMPLE, show_header=False, expand=True)
+    recent.add_column("File Name", style="cyan")
+    recent.add_column("Integrity", justify="right")
+    recent.add_column("Status", justify="center")
+    for path, score, status in board.recent:
+        recent.add_row(_clean_path(path), f"{score}/10", status)
+
+    return Panel(Group(summary, recent), title="Scanning...", border_style="cyan")
+
+def roast_project(jobs=None, use_cache=True, since=None, staged=False, live=False, top=None, max_kb=None):
     """Analyzes the entire directory and lists files in a table."""
     utils.print_header("SCANNING PROJECT SECTOR")
-    utils.spin_action("Reading file structure...", lambda: None) # Fake spin for effect
-
-    results = []
-    total_score = 0
-    file_count = 0
-
-    # 1. Walk the directory
-    for root, _, files in os.walk("."):
-        # Skip garbage folders
-        if any(x in root for x in [".git", "__pycache__", "venv", "node_modules", ".grid", "dist", "build"]):
-            continue
-            
-        for file in files:
-            if file.endswith(".py"):
-                path = os.path.join(root, file)
-                
-                # Analyze individual file
-                try:
-                    stats = analyzer.analyze_file(path)
-                    score = stats['score']
-                    
-                    # Assign Status Icon based on score
-                    if score < 5:
-                        status = "[bold red]🔥 Toxic[/]"
-                    elif score < 8:
-                        status = "[yellow]⚠️  Messy[/]"
-                    else:
-                        status = "[bold green]✅ Clean[/]"
-                    
-                    results.append((path, score, status))
-                    total_score += score
-                    file_count += 1
-                except:
-                    # Skip unreadable files
+    paths = utils.spin_action("Reading file structure...",
+        lambda: scanner.collect_files(since=since, staged=staged))
+
+    if paths is None:
+        utils.print_error("Could not list changed files. (Bad ref or not a git repository?)")
+        return
+
+    if live and top is None:
+        top = LIVE_TOP
+    board = Scoreboard(top=top)
+    max_bytes = _max_file_bytes(max_kb)
+
+    # Unchanged files are served from .grid_cache/analysis.db
+    store = cache.open_store("analysis") if use_cache else None
+
+    # 1. Analyze every file (fans out to worker processes on big repos)
+    # Results stream in as they finish; in live mode they are painted as they land.
+    started = time.perf_counter()
+    display = Live(console=utils.console, transient=True, auto_refresh=False) if live else nullcontext()
+    try:
+        with display:
+            painted = 0.0
+            for path, stats in scanner.scan_files(paths, jobs=jobs, store=store, max_bytes=max_bytes):
+                # Skip unreadable files
+                if stats is None:
                     continue
+                if stats.get('skipped'):
+                    board.skip(path, stats['skipped'])
+                else:
+                    board.add(path, stats['score'])
 
-    if file_count == 0:
-        utils.print_warning("No Python files found. Is this a real project?")
+                now = time.perf_counter()
+                if live and now - painted >= LIVE_REFRESH:
+                    display.update(_live_view(board, len(paths), now - started), refresh=True)
+                    painted = now
+    finally:
+        if store:
+            store.close()
+    elapsed = time.perf_counter() - started
+
+    if board.file_count == 0 and board.skipped_count == 0:
+        if since or staged:
+            utils.print_success("No changed source files. Nothing to roast.")
+        else:
+            utils.print_warning("No source files found. Is this a real project?")
         return
 
     # 2. Sort by Score (Worst files at the top so they are visible)
-    results.sort(key=lambda x: x[1])
+    results = board.worst()
 
     # 3. Create & Print Table
-    table = Table(title="Artifact Analysis Report", box=box.ROUNDED, show_lines=True)
+    title = "Artifact Analysis Report"
+    if top is not None and board.file_count > len(results):
+        title += f" (worst {len(results)} of {board.file_count})"
+    table = Table(title=title, box=box.ROUNDED, show_lines=True)
     table.add_column("File Name", style="cyan")
     table.add_column("Integrity", justify="right")
     table.add_column("Status", justify="center")
 
     for path, score, status in results:
-        # Clean up path for display (remove ./ and win style slashes)
-        clean_path = path.replace(".\\", "").replace("./", "")
-        table.add_row(clean_path, f"{score}/10", status)
+        table.add_row(_clean_path(path), f"{score}/10", status)
+    for path, reason in board.skipped:
+        table.add_row(_clean_path(path), "-", f"[dim]⏭️  skipped: {reason}[/]")
 
     utils.console.print(table)
 
+    if board.skipped_count:
+        utils.print_warning(f"{board.skipped_count} files skipped (too large or binary). "
+                            f"Limit: {max_bytes // 1024} KB (--max-size or .grid analysis.max_file_kb)")
+    if board.file_count == 0:
+        return
+
+    file_count = board.file_count
+    rate = file_count / elapsed if elapsed > 0 else float(file_count)
+    utils.print_info(f"Scanned {file_count} files in {elapsed:.2f}s ({rate:.0f} files/s)")
+    if store:
+        utils.print_info(f"Analysis cache: {store.hits} hits, {store.misses} misses")
+
     # 4. Final Verdict
-    avg = total_score / file_count
+    avg = board.average
     utils.print_header(f"AGGREGATE SCORE: {avg:.1f}/10")
     
     if avg < 5:
@@ -101,6 +229,75 @@ def roast_project():
 
     utils.print_panel(f"[{color}]\"{verdict}\"[/]", title="Final Verdict")
 
+def _delta(value):
+    """Colors a score change: green up, red down."""
+    if value > 0:
+        return f"[green]+{value:.1f}[/]"
+    if value < 0:
+        return f"[red]{value:.1f}[/]"
+    return "[dim]0.0[/]"
+
+def roast_history(count, jobs=None, max_kb=None):
+    """Shows how code health moved over the last `count` commits."""
+    utils.print_header(f"REWINDING THE LAST {count} COMMITS")
+
+    db = history.HistoryDB()
+    try:
+        # 1. Record anything new (each unique blob is analyzed once, ever)
+        commits = utils.spin_action("Analyzing history...",
+            lambda: history.record(db, count, jobs=jobs, max_bytes=_max_file_bytes(max_kb)))
+        if not commits:
+            utils.print_error("No commits found. (Is this a git repository?)")
+            return
+
+        snapshots = [(sha, ts, subject, db.file_scores(sha)) for sha, ts, subject in commits]
+    finally:
+        db.close()
+
+    # 2. Project trend (oldest at the top so it reads like a timeline)
+    table = Table(title="Code Health Timeline", box=box.ROUNDED)
+    table.add_column("Commit", style="magenta", no_wrap=True, min_width=8)
+    table.add_column("Date", no_wrap=True, min_width=10)
+    table.add_column("Message", style="cyan", no_wrap=True, overflow="ellipsis", max_width=30)
+    table.add_column("Files", justify="right", min_width=5)
+    table.add_column("Avg", justify="right", min_width=4)
+    table.add_column("Δ", justify="right", min_width=4)
+
+    previous = None
+    for sha, ts, subject, scores in reversed(snapshots):
+        avg = sum(scores.values()) / len(scores) if scores else 0
+        change = _delta(avg - previous) if previous is not None else ""
+        date = time.strftime("%Y-%m-%d", time.localtime(ts))
+        table.add_row(sha[:8], date, escape(subject), str(len(scores)), f"{avg:.1f}", change)
+        previous = avg
+
+    utils.console.print(table)
+
+    # 3. Per-file deltas between the oldest and newest commit in the window
+    oldest, newest = snapshots[-1][3], snapshots[0][3]
+    changes = []
+    for path, score in newest.items():
+        if path in oldest and oldest[path] != score:
+            changes.append((score - oldest[path], path, oldest[path], score))
+    added = len(set(newest) - set(oldest))
+    removed = len(set(oldest) - set(newest))
+
+    if changes:
+        changes.sort()
+        files = Table(title="Biggest Movers", box=box.ROUNDED)
+        files.add_column("File Name", style="cyan")
+        files.add_column("Then", justify="right")
+        files.add_column("Now", justify="right")
+        files.add_column("Δ", justify="right")
+
+        # Worst regressions first, then the best improvements
+        movers = changes[:10] + [c for c in changes[-5:] if c[0] > 0 and c not in changes[:10]]
+        for change, path, then, now in movers:
+            files.add_row(path, f"{then}/10", f"{now}/10", _delta(change))
+        utils.console.print(files)
+
+    utils.print_info(f"{len(changes)} files changed score, {added} added, {removed} removed.")
+
 def roast_developer(target_name, recent, share):
     """Roasts a specific person based on their git history."""
     utils.print_header(f"TARGET ACQUIRED: {target_name}")
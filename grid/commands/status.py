@@ -1,4 +1,4 @@
-from grid.core import utils, config, git_police, cloud
+from grid.core import utils, config, cloud, repo
 import os
 
 def run():
@@ -17,7 +17,7 @@ def run():
     
     
     # 2. Target Assimilation
-    branch = git_police.get_current_branch()
+    branch = repo.current().current_branch()
     project_name = project_cfg.get("name", os.path.basename(os.getcwd())) if project_cfg else "Unknown"
     
     # Construct Sections
@@ -1,13 +1,18 @@
 import ast
+import mmap
 import os
 import random
+from grid.core import registry
 
-# Try importing tree-sitter for C++ support (Graceful degradation if missing)
-try:
-    from tree_sitter import Language, Parser
-    TREE_SITTER_READY = True
-except ImportError:
-    TREE_SITTER_READY = False
+# Bump whenever metrics or scoring change, so cached results get invalidated
+ANALYZER_VERSION = "5"
+
+# Files bigger than this are skipped instead of parsed.
+# A 200 MB generated file would otherwise turn into gigabytes of AST.
+MAX_FILE_BYTES = 1024 * 1024
+
+# Leading bytes sniffed for NULs to spot binaries
+SNIFF_BYTES = 8192
 
 # --- THE DIAGNOSIS ENGINE ---
 def calculate_score(stats):
@@ -23,45 +28,111 @@ def calculate_score(stats):
     score -= (stats.get("max_args", 0) - 3) * 1 if stats.get("max_args", 0) > 3 else 0
     score -= stats.get("globals", 0) * 2
     score -= stats.get("print_statements", 0) * 0.5
+    score -= (stats.get("max_complexity", 0) - 10) * 0.5 if stats.get("max_complexity", 0) > 10 else 0
     
     return max(1, min(10, int(score)))
 
 # --- PYTHON ANALYZER (Built-in AST) ---
-class PythonSentinel(ast.NodeVisitor):
+
+# Statements that open a new block (count towards nesting depth)
+BLOCK_NODES = tuple(
+    getattr(ast, name) for name in
+    ["For", "AsyncFor", "While", "If", "With", "AsyncWith", "Try", "TryStar", "Match"]
+    if hasattr(ast, name)
+)
+
+# Each of these adds one independent path through a function
+BRANCH_NODES = tuple(
+    getattr(ast, name) for name in
+    ["If", "IfExp", "For", "AsyncFor", "While", "ExceptHandler", "match_case"]
+    if hasattr(ast, name)
+)
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Functions longer than this (in lines) count as 'long'
+LONG_FUNCTION_LINES = 40
+
+class PythonSentinel:
+    """
+    Collects every metric in one iterative pass over the AST.
+    Uses an explicit stack instead of recursion, so deeply nested
+    generated code (protobufs, giant dict literals) can't blow the stack.
+    """
+
     def __init__(self):
         self.stats = {
             "max_nesting": 0,
             "long_functions": 0,
+            "max_function_length": 0,
             "max_args": 0,
+            "max_complexity": 0,
             "globals": 0,
             "print_statements": 0
         }
 
-    def visit_FunctionDef(self, node):
-        # Check Length
-        if (node.end_lineno - node.lineno) > 40:
-            self.stats["long_functions"] += 1
-        
-        # Check Args
-        if len(node.args.args) > 5:
-            self.stats["max_args"] = max(self.stats["max_args"], len(node.args.args))
-            
-        self.generic_visit(node)
-
-    def visit_Global(self, node):
-        self.stats["globals"] += 1
-        self.generic_visit(node)
-
-    def visit_Call(self, node):
-        # Check for print()
-        if isinstance(node.func, ast.Name) and node.func.id == "print":
-            self.stats["print_statements"] += 1
-        self.generic_visit(node)
-
-    def visit_For(self, node):
-        # Simple nesting check (approximate)
-        self.stats["max_nesting"] += 1
-        self.generic_visit(node)
+    def visit(self, tree):
+        stats = self.stats
+
+        # Every scope (module + each function) keeps its own complexity counter
+        module_scope = [1]
+        scopes = [module_scope]
+
+        # (node, block depth inside the current function, scope counter)
+        stack = [(tree, 0, module_scope)]
+
+        while stack:
+            node, depth, scope = stack.pop()
+
+            # 1. Functions: length, args, and a fresh scope
+            if isinstance(node, FUNCTION_NODES):
+                length = (node.end_lineno or node.lineno) - node.lineno
+                if length > LONG_FUNCTION_LINES:
+                    stats["long_functions"] += 1
+                stats["max_function_length"] = max(stats["max_function_length"], length)
+
+                args = node.args
+                positional = args.posonlyargs + args.args
+                arg_count = len(positional) + len(args.kwonlyargs)
+                if positional and positional[0].arg in ("self", "cls"):
+                    arg_count -= 1  # bound by Python, not passed by the caller
+                stats["max_args"] = max(stats["max_args"], arg_count)
+
+                scope = [1]
+                scopes.append(scope)
+                depth = 0
+
+            # 2. Branches: cyclomatic complexity
+            if isinstance(node, BRANCH_NODES):
+                scope[0] += 1
+            elif isinstance(node, ast.BoolOp):
+                scope[0] += len(node.values) - 1
+            elif isinstance(node, ast.comprehension):
+                scope[0] += 1 + len(node.ifs)
+
+            # 3. Globals & prints
+            elif isinstance(node, ast.Global):
+                stats["globals"] += 1
+            elif isinstance(node, ast.Call):
+                if isinstance(node.func, ast.Name) and node.func.id == "print":
+                    stats["print_statements"] += 1
+
+            # 4. Nesting: blocks push their children one level deeper
+            inner = depth
+            if isinstance(node, BLOCK_NODES):
+                inner = depth + 1
+                stats["max_nesting"] = max(stats["max_nesting"], inner)
+
+            # An 'elif' is a sibling branch, not a deeper block
+            elif_node = None
+            if isinstance(node, ast.If) and len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+                elif_node = node.orelse[0]
+
+            for child in ast.iter_child_nodes(node):
+                stack.append((child, depth if child is elif_node else inner, scope))
+
+        stats["max_complexity"] = max(s[0] for s in scopes)
+        return stats
 
 def analyze_python(file_path):
     try:
@@ -76,35 +147,61 @@ def analyze_python(file_path):
             "score": score,
             "metrics": sentinel.stats
         }
+    except RecursionError:
+        # ast.parse itself recurses; absurdly nested files can still trip it
+        return {
+            "score": 1,
+            "error": "File is nested too deeply to parse"
+        }
     except Exception as e:
         return {
             "score": 1,
             "error": str(e)
         }
 
-# --- C++ ANALYZER (Tree-sitter Placeholder) ---
-def analyze_cpp(file_path):
-    if not TREE_SITTER_READY:
-        return "C++ detected, but 'tree-sitter' is missing. I can't analyze this yet."
-    
-    # (Full Tree-sitter logic goes here later if needed)
-    return "C++ Analysis: Structurally valid, but manually managing memory is risky."
+def supported_extensions():
+    """Extensions that get a real analysis (used to pick files for project scans)."""
+    return registry.available_extensions()
+
+def precheck(file_path, max_bytes=MAX_FILE_BYTES):
+    """
+    Cheap gate that runs before any file is read or parsed.
+    Returns a skip reason ("too large", "binary") or None if the file is fair game.
+    The binary sniff maps the file instead of reading it into memory.
+    """
+    size = os.path.getsize(file_path)
+    if max_bytes and size > max_bytes:
+        return "too large"
+    if size == 0:
+        return None
+
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"\0", 0, SNIFF_BYTES) != -1:
+                return "binary"
+    return None
 
 # --- MAIN ENTRY POINT ---
-def analyze_file(file_path):
+def analyze_file(file_path, max_bytes=MAX_FILE_BYTES):
     """
     Determines language and runs the appropriate sentinel.
+    Backends are looked up (and imported) lazily through the registry.
+    Oversized and binary files come back as {"score": None, "skipped": reason}.
     """
     if not os.path.exists(file_path):
         return {"score": 0, "error": "File not found"}
 
-    ext = os.path.splitext(file_path)[1]
+    ext = os.path.splitext(file_path)[1].lower()
+    backend = registry.get_analyzer(ext)
 
-    if ext == ".py":
-        return analyze_python(file_path)
-    elif ext in [".cpp", ".c", ".h", ".hpp"]:
-        # Placeholder for C++
-        return {"score": 7, "info": "C++ analysis limited"}
-    else:
+    if backend is None:
+        if registry.handles(ext):
+            # e.g. tree-sitter is installed but this grammar won't load
+            return {"score": None, "skipped": f"no parser for {ext}"}
         # Default for unknown
-        return {"score": 5, "info": "Language not supported for full analysis"}
\ No newline at end of file
+        return {"score": 5, "info": "Language not supported for full analysis"}
+
+    reason = precheck(file_path, max_bytes)
+    if reason:
+        return {"score": None, "skipped": reason}
+    return backend(file_path)
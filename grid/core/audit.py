@@ -0,0 +1,277 @@
+import hashlib
+import os
+import sqlite3
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from grid.core import blobs, cache, git_police, matcher, policy
+
+# Blobs per worker round-trip (also the checkpoint granularity)
+CHUNK = 256
+
+# Blobs bigger than this are recorded as skipped instead of read (think videos, dumps)
+MAX_BLOB_BYTES = 20 * 1024 * 1024
+
+# Below this many pending blobs, worker start-up costs more than it saves
+SERIAL_THRESHOLD = 2 * CHUNK
+
+def fingerprint(secrets, banned_files):
+    """Checkpoint identity: the compiled pattern set plus the banned_files rules."""
+    rules = hashlib.sha1("\n".join(banned_files).encode()).hexdigest()[:16]
+    return f"{secrets.fingerprint}:{rules}"
+
+class AuditLog:
+    """
+    Checkpoint for 'grid audit', stored in .grid_cache/audit.db.
+    Every finished chunk is committed, so an interrupted audit resumes where it stopped.
+    Results are tied to the pattern set and banned_files rules (see fingerprint):
+    change either and the audit starts over.
+    """
+
+    def __init__(self, fingerprint, restart=False, root=cache.CACHE_DIR):
+        cache.ensure_dir(root)
+        self.db = sqlite3.connect(os.path.join(root, "audit.db"), timeout=5)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS scanned (sha TEXT PRIMARY KEY, skipped TEXT);
+            CREATE TABLE IF NOT EXISTS findings (
+                sha TEXT, path TEXT, pattern_id TEXT, offset INTEGER, line INTEGER);
+        """)
+
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        self.resumed = bool(row) and row[0] == fingerprint and not restart
+        if not self.resumed:
+            self.db.execute("DELETE FROM scanned")
+            self.db.execute("DELETE FROM findings")
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+            self.db.commit()
+
+    def scanned(self):
+        """Blob SHAs finished in earlier runs."""
+        return {row[0] for row in self.db.execute("SELECT sha FROM scanned")}
+
+    def record(self, shas, findings, skipped=None):
+        """Marks a chunk done. findings: [(sha, path, pattern_id, offset, line)]"""
+        skipped = skipped or {}
+        self.db.executemany(
+            "INSERT OR REPLACE INTO scanned VALUES (?, ?)",
+            [(sha, skipped.get(sha)) for sha in shas]
+        )
+        self.db.executemany("INSERT INTO findings VALUES (?, ?, ?, ?, ?)", findings)
+        self.db.commit()
+
+    def replace_named(self, findings):
+        """Swaps in this run's banned-file findings (names are rechecked every run)."""
+        self.db.execute("DELETE FROM findings WHERE pattern_id = ?", (git_police.BANNED_FILE,))
+        self.db.executemany("INSERT INTO findings VALUES (?, ?, ?, ?, ?)", findings)
+        self.db.commit()
+
+    def findings(self):
+        rows = self.db.execute(
+            "SELECT path, pattern_id, offset, line, sha FROM findings ORDER BY path, line"
+        )
+        return rows.fetchall()
+
+    def skipped_count(self):
+        return self.db.execute("SELECT COUNT(*) FROM scanned WHERE skipped IS NOT NULL").fetchone()[0]
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+def reachable_blobs(revs=("--all",)):
+    """
+    Yields (blob_sha, size, path) for every blob reachable from `revs` (default: any ref).
+    'git rev-list --objects --all' is piped straight into 'git cat-file --batch-check',
+    so object types and sizes come back without reading a single blob.
+    rev-list lists each object once, so blobs are already deduplicated by SHA.
+    """
+    rev_list = subprocess.Popen(
+        ["git", "rev-list", "--objects", *revs],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    check = subprocess.Popen(
+        ["git", "cat-file", "--batch-check=%(objectname) %(objecttype) %(objectsize) %(rest)"],
+        stdin=rev_list.stdout, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    rev_list.stdout.close()
+
+    try:
+        for line in check.stdout:
+            # "<sha> blob <size> <path>" (the path may contain spaces)
+            parts = line.rstrip(b"\n").split(b" ", 3)
+            if len(parts) < 3 or parts[1] != b"blob":
+                continue
+            path = parts[3].decode("utf-8", errors="replace") if len(parts) > 3 else ""
+            yield parts[0].decode(), int(parts[2]), path
+    finally:
+        check.stdout.close()
+        check.wait()
+        rev_list.wait()
+
+    if rev_list.returncode != 0:
+        raise OSError("git rev-list failed (is this a git repository?)")
+
+def history_paths(revs=("--all",)):
+    """
+    Yields (blob_sha, path) for every file version the commits in `revs` add or change,
+    from one streamed 'git log --raw'. Unlike reachable_blobs, a blob stored under several
+    names comes back once per name, so an empty '.env' isn't hidden behind an empty
+    '__init__.py' with the same SHA. Use it for name checks; reachable_blobs for content.
+    """
+    proc = subprocess.Popen(
+        ["git", "log", *revs, "--format=", "--raw", "-z", "--no-abbrev", "--no-renames", "--diff-filter=AMT"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+
+    # Records are ":<old mode> <new mode> <old sha> <new sha> <status>\0<path>\0"
+    meta = None
+    pending = b""
+    try:
+        while True:
+            data = proc.stdout.read(65536)
+            if not data:
+                break
+            *tokens, pending = (pending + data).split(b"\0")
+            for token in tokens:
+                if token.startswith(b":"):
+                    meta = token.split()
+                elif meta is not None:
+                    # Regular files and symlinks only (160000 is a submodule commit)
+                    if meta[1][:3] in (b"100", b"120"):
+                        yield meta[3].decode(), token.decode("utf-8", errors="replace")
+                    meta = None
+        if meta is not None and pending and meta[1][:3] in (b"100", b"120"):
+            yield meta[3].decode(), pending.decode("utf-8", errors="replace")
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+# Per-worker state: each process keeps its own cat-file pipe and compiled matcher
+_reader = None
+_matcher = None
+
+def _init_worker(rules):
+    global _matcher
+    _matcher = matcher.SecretMatcher(rules)
+
+def _scan_chunk(chunk, reader=None):
+    """Worker entry point. chunk: [(sha, path)]. Returns (shas, findings)."""
+    global _reader
+    if reader is None:
+        if _reader is None:
+            _reader = blobs.BlobReader()
+        reader = _reader
+
+    paths = dict(chunk)
+    findings = []
+    for sha, data in reader.iter_blobs(paths):
+        if data is None:
+            continue
+        for hit in _matcher.scan(data):
+            findings.append((sha, paths[sha], hit.pattern_id, hit.offset, git_police.line_of(data, hit.offset)))
+    return list(paths), findings
+
+def run(log, rules, banned_files, jobs=None, max_bytes=MAX_BLOB_BYTES, progress=None):
+    """
+    Audits every reachable blob not already in `log`.
+    rules: secret rules as given to matcher.SecretMatcher (rebuilt inside each worker).
+    progress(done, total) is called after each finished chunk.
+    Returns (total blobs, blobs scanned this run).
+    """
+    done = log.scanned()
+
+    # 1. Enumerate history
+    entries = []
+    total = 0
+    for sha, size, path in reachable_blobs():
+        total += 1
+        if sha not in done:
+            entries.append((sha, size, path))
+
+    # Banned names are judged by path alone, against every name each blob ever had
+    # (rev-list prints just one name per blob). That's cheap, so it's redone every run:
+    # a checkpointed blob can still turn up later under a banned name.
+    versions = {}
+    for sha, path in history_paths():
+        versions.setdefault(path, set()).add(sha)
+    log.replace_named([
+        (sha, path, git_police.BANNED_FILE, None, None)
+        for path in sorted(policy.compile_policy(banned_files).banned(versions))
+        for sha in sorted(versions[path])
+    ])
+
+    pending = [(sha, path) for sha, size, path in entries if size <= max_bytes]
+    oversized = [sha for sha, size, _ in entries if size > max_bytes]
+
+    if oversized:
+        log.record(oversized, [], skipped={sha: "too large" for sha in oversized})
+
+    # 2. Scan contents, checkpointing every chunk
+    chunks = [pending[i:i + CHUNK] for i in range(0, len(pending), CHUNK)]
+    finished = total - len(pending)
+    if progress:
+        progress(finished, total)
+
+    workers = jobs or os.cpu_count() or 1
+    if workers == 1 or len(pending) < SERIAL_THRESHOLD:
+        _init_worker(rules)
+        with blobs.BlobReader() as reader:
+            for chunk in chunks:
+                shas, findings = _scan_chunk(chunk, reader)
+                log.record(shas, findings)
+                finished += len(shas)
+                if progress:
+                    progress(finished, total)
+        return total, len(pending)
+
+    # Results land out of order; each chunk is checkpointed as soon as it's back
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                               initializer=_init_worker, initargs=(rules,))
+    try:
+        futures = [pool.submit(_scan_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            shas, findings = future.result()
+            log.record(shas, findings)
+            finished += len(shas)
+            if progress:
+                progress(finished, total)
+    finally:
+        # On Ctrl+C, drop queued chunks instead of finishing the whole history
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    return total, len(pending)
+
+def first_commits(shas):
+    """
+    {blob sha: '<short sha> <date> <author>'} of the oldest commit that adds each blob,
+    from one 'git log --raw' walk over all refs (stops once every blob is placed).
+    """
+    wanted = set(shas)
+    found = {}
+    if not wanted:
+        return found
+    proc = subprocess.Popen(
+        ["git", "log", "--all", "--reverse", "--format=%x01%H %ad %an", "--date=short",
+         "--raw", "--no-abbrev", "--no-renames"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+
+    commit = None
+    try:
+        for raw in proc.stdout:
+            line = raw.decode("utf-8", errors="replace").rstrip("\n")
+            if line.startswith("\x01"):
+                # --no-abbrev (for the blob SHAs) spells out %h too; shorten it by hand
+                sha, _, rest = line[1:].partition(" ")
+                commit = f"{sha[:7]} {rest}"
+            elif line.startswith(":"):
+                # ":<old mode> <new mode> <old sha> <new sha> <status>\t<path>"
+                sha = line.split(None, 4)[3]
+                if sha in wanted and sha not in found:
+                    found[sha] = commit
+                    if len(found) == len(wanted):
+                        break
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    return found
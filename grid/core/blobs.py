@@ -0,0 +1,82 @@
+import subprocess
+import threading
+
+class BlobReader:
+    """
+    One long-lived 'git cat-file --batch' process.
+    Every object is streamed through its pipes instead of forking 'git show' per file.
+    Object names can be SHAs or any rev syntax git understands (':path', 'HEAD:path').
+    """
+
+    def __init__(self, cwd=None):
+        self.proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd,
+        )
+
+    def _read_response(self):
+        """Reads one '<sha> <type> <size>\\n<data>\\n' record. Returns bytes, or None if missing."""
+        header = self.proc.stdout.readline()
+        if not header:
+            raise OSError("git cat-file exited unexpectedly")
+
+        parts = header.split()
+        if len(parts) < 3 or parts[1] == b"missing":
+            return None
+
+        size = int(parts[2])
+        data = self.proc.stdout.read(size)
+        self.proc.stdout.read(1)  # trailing newline
+        return data
+
+    def read(self, name):
+        """Returns the raw contents of one object (None if it doesn't exist)."""
+        self.proc.stdin.write(name.encode() + b"\n")
+        self.proc.stdin.flush()
+        return self._read_response()
+
+    def iter_blobs(self, names):
+        """
+        Yields (name, data) for many objects, in order.
+        Requests are written from a helper thread so git never waits on us
+        between objects (and we never deadlock on a full pipe).
+        """
+        names = list(names)
+
+        def feed():
+            try:
+                for name in names:
+                    self.proc.stdin.write(name.encode() + b"\n")
+                self.proc.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                pass
+
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        done = 0
+        try:
+            for name in names:
+                data = self._read_response()
+                done += 1
+                yield name, data
+        finally:
+            # Consumer stopped early: drain the rest so the pipe stays in sync
+            for _ in range(len(names) - done):
+                self._read_response()
+            writer.join()
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
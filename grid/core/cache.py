@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+# Local cache folder (lives in repo root, next to .grid)
+CACHE_DIR = ".grid_cache"
+
+# Default size bound per store. Oldest entries are evicted past this.
+MAX_ENTRIES = 50000
+
+# SQLite caps bound parameters per query; stay well under it
+_CHUNK = 500
+
+def blob_sha(data):
+    """Returns the git blob SHA-1 for raw bytes (same as 'git hash-object')."""
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data).hexdigest()
+
+def ensure_dir(root=CACHE_DIR):
+    """Creates the cache folder with its own .gitignore, so 'git add .' never picks it up."""
+    os.makedirs(root, exist_ok=True)
+    marker = os.path.join(root, ".gitignore")
+    if not os.path.exists(marker):
+        with open(marker, "w") as f:
+            f.write("# Created by Grid\n*\n")
+
+class Store:
+    """
+    Tiny SQLite key/value store with size-bounded LRU eviction.
+    Values are JSON-serializable dicts.
+    """
+
+    def __init__(self, name, max_entries=MAX_ENTRIES, root=CACHE_DIR):
+        ensure_dir(root)
+        self.path = os.path.join(root, f"{name}.db")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.db = sqlite3.connect(self.path, timeout=5)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON entries(last_used)")
+
+    def get_many(self, keys):
+        """Looks up many keys at once. Returns {key: value} for the hits only."""
+        found = {}
+        requested = list(keys)
+        unique = list(dict.fromkeys(requested))
+        for i in range(0, len(unique), _CHUNK):
+            chunk = unique[i:i + _CHUNK]
+            marks = ",".join("?" * len(chunk))
+            rows = self.db.execute(
+                f"SELECT key, value FROM entries WHERE key IN ({marks})", chunk
+            ).fetchall()
+            for key, value in rows:
+                found[key] = json.loads(value)
+
+        # Touch hits so eviction keeps the working set
+        now = time.time()
+        self.db.executemany(
+            "UPDATE entries SET last_used = ? WHERE key = ?",
+            [(now, key) for key in found]
+        )
+        hits = sum(1 for key in requested if key in found)
+        self.hits += hits
+        self.misses += len(requested) - hits
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items):
+        """Stores {key: value} pairs."""
+        now = time.time()
+        self.db.executemany(
+            "INSERT OR REPLACE INTO entries (key, value, last_used) VALUES (?, ?, ?)",
+            [(key, json.dumps(value), now) for key, value in items.items()]
+        )
+
+    def put(self, key, value):
+        self.put_many({key: value})
+
+    def evict(self):
+        """Drops least-recently-used entries beyond max_entries."""
+        self.db.execute(
+            "DELETE FROM entries WHERE key NOT IN "
+            "(SELECT key FROM entries ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+
+    def close(self):
+        """Evicts, commits and closes the store."""
+        try:
+            self.evict()
+            self.db.commit()
+        finally:
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_store(name, max_entries=MAX_ENTRIES):
+    """Opens a store, or returns None if the cache folder is not writable."""
+    try:
+        return Store(name, max_entries=max_entries)
+    except (OSError, sqlite3.Error):
+        return None
@@ -1,6 +1,5 @@
 import requests
-import subprocess
-from grid.core import utils
+from grid.core import utils, repo
 
 # YOUR LIVE BRAIN
 BRAIN_URL = "https://grid-cli.vercel.app/api" 
@@ -8,13 +7,7 @@ BRAIN_URL = "https://grid-cli.vercel.app/api"
 def get_git_remote():
     """Extracts the unique GitHub URL to use as Project ID."""
     try:
-        url = subprocess.check_output(["git", "remote", "get-url", "origin"], stderr=subprocess.DEVNULL).decode().strip()
-        # Clean URL: git@github.com:User/Repo.git -> https://github.com/User/Repo
-        if url.startswith("git@"):
-            url = url.replace(":", "/").replace("git@", "https://")
-        if url.endswith(".git"):
-            url = url[:-4]
-        return url
+        return repo.current().web_url()
     except:
         return None
 
@@ -0,0 +1,210 @@
+import os
+from grid.core.analyzer import calculate_score, LONG_FUNCTION_LINES
+
+# Try importing tree-sitter for C/C++ support (Graceful degradation if missing)
+try:
+    from tree_sitter import Language, Parser
+    TREE_SITTER_READY = True
+except ImportError:
+    TREE_SITTER_READY = False
+
+# Grammar module per extension. C headers are parsed as C++ (a superset in practice).
+CPP_GRAMMARS = {
+    ".c": "tree_sitter_c",
+    ".h": "tree_sitter_cpp",
+    ".cpp": "tree_sitter_cpp",
+    ".cc": "tree_sitter_cpp",
+    ".cxx": "tree_sitter_cpp",
+    ".hpp": "tree_sitter_cpp",
+    ".hh": "tree_sitter_cpp",
+}
+
+CPP_BLOCK_NODES = {
+    "if_statement", "for_statement", "for_range_loop", "while_statement",
+    "do_statement", "switch_statement", "try_statement",
+}
+
+CPP_BRANCH_NODES = {
+    "if_statement", "for_statement", "for_range_loop", "while_statement",
+    "do_statement", "catch_clause", "conditional_expression",
+}
+
+CPP_PARAM_NODES = {
+    "parameter_declaration", "optional_parameter_declaration",
+    "variadic_parameter_declaration",
+}
+
+# Where file-scope (global) variables live
+CPP_SCOPE_NODES = {"translation_unit", "declaration_list", "linkage_specification"}
+
+CPP_PRINT_CALLS = {b"printf", b"puts", b"putchar", b"std::printf", b"std::puts"}
+CPP_STREAMS = {b"cout", b"cerr", b"std::cout", b"std::cerr"}
+
+# Parsers are expensive to build: one per grammar per process, reused for every file
+_PARSERS = {}
+
+def get_cpp_parser(ext):
+    """Returns the pooled tree-sitter parser for this extension (None if unavailable)."""
+    module_name = CPP_GRAMMARS.get(ext)
+    if not TREE_SITTER_READY or not module_name:
+        return None
+
+    if module_name not in _PARSERS:
+        try:
+            grammar = __import__(module_name)
+            _PARSERS[module_name] = Parser(Language(grammar.language()))
+        except (ImportError, ValueError, TypeError):
+            _PARSERS[module_name] = None
+    return _PARSERS[module_name]
+
+def _inner_declarator(declarator):
+    """The declarator one level down ('*f(int)' -> 'f(int)'). reference_declarator has no field for it."""
+    inner = declarator.child_by_field_name("declarator")
+    if inner is None and declarator.type == "reference_declarator" and declarator.named_children:
+        inner = declarator.named_children[-1]
+    return inner
+
+def _function_declarator(declarator):
+    """The function_declarator under pointer/reference declarators ('*make(int)', '&get()'), or None."""
+    while declarator is not None and declarator.type in ("pointer_declarator", "reference_declarator"):
+        declarator = _inner_declarator(declarator)
+    if declarator is None or declarator.type != "function_declarator":
+        return None
+    return declarator
+
+def _cpp_parameters(node):
+    """Finds the parameter_list of a function_definition (through pointer/reference declarators)."""
+    declarator = _function_declarator(node.child_by_field_name("declarator"))
+    if declarator is None:
+        return None
+    return declarator.child_by_field_name("parameters")
+
+def _declares_function(declarator):
+    """True for a prototype's declarator; '(*fp)(int)' is a function pointer variable."""
+    function = _function_declarator(declarator)
+    if function is None:
+        return False
+    inner = function.child_by_field_name("declarator")
+    return inner is None or inner.type != "parenthesized_declarator"
+
+def _is_mutable_global(node):
+    """A file-scope variable definition that isn't const/constexpr/extern or a prototype."""
+    for child in node.children:
+        if child.type == "type_qualifier" and child.text in (b"const", b"constexpr"):
+            return False
+        if child.type == "storage_class_specifier" and child.text == b"extern":
+            return False
+    declarators = node.children_by_field_name("declarator")
+    return not declarators or not all(_declares_function(d) for d in declarators)
+
+class CppSentinel:
+    """
+    The C/C++ twin of PythonSentinel: one iterative pass over a tree-sitter tree,
+    producing the same metric keys so calculate_score treats both alike.
+    """
+
+    def __init__(self):
+        self.stats = {
+            "max_nesting": 0,
+            "long_functions": 0,
+            "max_function_length": 0,
+            "max_args": 0,
+            "max_complexity": 0,
+            "globals": 0,
+            "print_statements": 0
+        }
+
+    def visit(self, root):
+        stats = self.stats
+        file_scope = [1]
+        scopes = [file_scope]
+        stack = [(root, 0, file_scope)]
+
+        while stack:
+            node, depth, scope = stack.pop()
+            kind = node.type
+
+            # 1. Functions: length, args, and a fresh scope
+            if kind == "function_definition":
+                length = node.end_point[0] - node.start_point[0]
+                if length > LONG_FUNCTION_LINES:
+                    stats["long_functions"] += 1
+                stats["max_function_length"] = max(stats["max_function_length"], length)
+
+                params = _cpp_parameters(node)
+                if params is not None:
+                    arg_count = sum(1 for c in params.named_children if c.type in CPP_PARAM_NODES)
+                    stats["max_args"] = max(stats["max_args"], arg_count)
+
+                scope = [1]
+                scopes.append(scope)
+                depth = 0
+
+            # 2. Branches: cyclomatic complexity
+            if kind in CPP_BRANCH_NODES:
+                scope[0] += 1
+            elif kind == "case_statement":
+                # 'default:' has no value and adds no path
+                if node.child_by_field_name("value") is not None:
+                    scope[0] += 1
+            elif kind == "binary_expression":
+                operator = node.child_by_field_name("operator")
+                if operator is not None and operator.type in ("&&", "||", "and", "or"):
+                    scope[0] += 1
+                elif operator is not None and operator.type == "<<":
+                    left = node.child_by_field_name("left")
+                    if left is not None and left.text in CPP_STREAMS:
+                        stats["print_statements"] += 1
+
+            # 3. Globals & prints
+            elif kind == "declaration":
+                if node.parent is not None and node.parent.type in CPP_SCOPE_NODES:
+                    if _is_mutable_global(node):
+                        stats["globals"] += 1
+            elif kind == "call_expression":
+                function = node.child_by_field_name("function")
+                if function is not None and function.text in CPP_PRINT_CALLS:
+                    stats["print_statements"] += 1
+
+            # 4. Nesting ('else if' is a sibling branch, not a deeper block)
+            inner = depth
+            if kind in CPP_BLOCK_NODES:
+                is_else_if = kind == "if_statement" and node.parent is not None and node.parent.type == "else_clause"
+                if not is_else_if:
+                    inner = depth + 1
+                    stats["max_nesting"] = max(stats["max_nesting"], inner)
+
+            for child in node.children:
+                if child.is_named:
+                    stack.append((child, inner, scope))
+
+        stats["max_complexity"] = max(s[0] for s in scopes)
+        return stats
+
+def analyze_cpp(file_path):
+    ext = os.path.splitext(file_path)[1].lower()
+    parser = get_cpp_parser(ext)
+    if parser is None:
+        # Graceful degradation: no tree-sitter (or grammar) installed
+        return {"score": 7, "info": "C++ analysis limited (pip install grid-cli[cpp])"}
+
+    try:
+        with open(file_path, "rb") as f:
+            tree = parser.parse(f.read())
+
+        sentinel = CppSentinel()
+        sentinel.visit(tree.root_node)
+
+        return {
+            "score": calculate_score(sentinel.stats),
+            "metrics": sentinel.stats
+        }
+    except Exception as e:
+        return {
+            "score": 1,
+            "error": str(e)
+        }
+
+def is_available(ext):
+    """Registry hook: only claim extensions whose grammar actually loads."""
+    return get_cpp_parser(ext) is not None
@@ -0,0 +1,151 @@
+import math
+import re
+import time
+from collections import Counter
+from grid.core import matcher
+
+# numpy is optional; without it entropies are computed per token in plain Python
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Pattern id reported for tokens that look random rather than matching a known format
+HIGH_ENTROPY = "high-entropy"
+
+# Defaults, overridable via the .grid "entropy" key.
+# Random base64 scores ~4.6-5.0 bits/char; identifiers, paths and hex SHAs stay under ~4.4.
+# An n-character token scores at most log2(n) bits, and random base64 only passes 4.5
+# from ~30 characters on, so shorter tokens aren't worth scoring.
+# "allow": regexes for tokens that are known to be fine (matched against the whole token).
+DEFAULTS = {
+    "enabled": True,
+    "threshold": 4.5,
+    "min_length": 32,
+    "budget_ms_per_mb": 100,
+    "allow": [],
+}
+
+# Lines carrying this marker (in any comment syntax) are never flagged
+ALLOW_MARKER = b"grid: allow"
+
+# Every input gets at least this much time, however small it is
+MIN_BUDGET_MS = 5
+
+# Tokens scored per vectorized pass (bounds the per-batch count matrix to ~2 MB)
+BATCH = 1024
+
+# Files full of legitimate random-looking strings (integrity hashes, minified code)
+SKIP_SUFFIXES = (
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "Pipfile.lock",
+    "Cargo.lock", "go.sum", ".min.js", ".min.css", ".map", ".svg",
+)
+
+_LETTER = re.compile(rb"[A-Za-z]")
+_DIGIT = re.compile(rb"[0-9]")
+
+def entropies(tokens):
+    """Shannon entropy (bits per byte) of each token, computed in one array pass."""
+    if not tokens:
+        return []
+    if not NUMPY_AVAILABLE:
+        return [_entropy(token) for token in tokens]
+
+    # 1. Flatten all tokens into one byte array, tagging each byte with its token index
+    lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+    data = np.frombuffer(b"".join(tokens), dtype=np.uint8)
+    owner = np.repeat(np.arange(len(tokens)), lengths)
+
+    # 2. Byte histogram per token: one bincount over (token, byte) pairs
+    counts = np.bincount(owner * 256 + data, minlength=len(tokens) * 256).reshape(len(tokens), 256)
+    counts = counts.astype(np.float64)
+
+    # 3. H = log2(n) - sum(c * log2(c)) / n
+    plogp = counts * np.log2(counts, out=np.zeros_like(counts), where=counts > 0)
+    return (np.log2(lengths) - plogp.sum(axis=1) / lengths).tolist()
+
+def _entropy(token):
+    length = len(token)
+    return -sum(c / length * math.log2(c / length) for c in Counter(token).values())
+
+def skips(path):
+    """True for files whose random-looking strings are expected (lockfiles, minified assets)."""
+    return bool(path) and path.endswith(SKIP_SUFFIXES)
+
+def settings(cfg):
+    """Entropy settings from the .grid "entropy" key, filled in with defaults."""
+    raw = (cfg or {}).get("entropy")
+    if raw is False:
+        return dict(DEFAULTS, enabled=False)
+    return dict(DEFAULTS, **(raw if isinstance(raw, dict) else {}))
+
+class EntropyDetector:
+    """
+    Flags long tokens that look random (API keys, passwords, private blobs of base64)
+    even when they match no known vendor format.
+    Candidates are found with one regex pass, then scored in batches.
+    Each scan stops once it has used its time budget (budget_ms_per_mb per MB of input),
+    so a huge generated file can't stall a push; `truncated` counts those cut-offs.
+    """
+
+    def __init__(self, threshold=DEFAULTS["threshold"], min_length=DEFAULTS["min_length"],
+                 budget_ms_per_mb=DEFAULTS["budget_ms_per_mb"], allow=()):
+        self.threshold = float(threshold)
+        # Tokens shorter than 2 ** threshold can never reach it
+        self.min_length = max(int(min_length), math.ceil(2 ** self.threshold))
+        self.budget_ms_per_mb = float(budget_ms_per_mb)
+        self.token = re.compile(rb"[A-Za-z0-9+/=_-]{%d,}" % self.min_length)
+        self.allow = []
+        self.errors = []
+        for regex in allow:
+            try:
+                self.allow.append(re.compile(regex.encode()))
+            except re.error as e:
+                self.errors.append((regex, str(e)))
+        self.truncated = 0
+        # Settings that change results (the time budget only decides when to give up)
+        self.fingerprint = f"{self.threshold}:{self.min_length}:{sorted(allow)}"
+
+    def _allowed(self, data, offset, token):
+        """True for allow-listed tokens and tokens on a line marked with ALLOW_MARKER."""
+        if any(regex.fullmatch(token) for regex in self.allow):
+            return True
+        start = data.rfind(b"\n", 0, offset) + 1
+        end = data.find(b"\n", offset)
+        return ALLOW_MARKER in data[start:end if end >= 0 else len(data)]
+
+    def _candidates(self, data):
+        """(offset, token) for tokens long enough and mixing letters with digits."""
+        for m in self.token.finditer(data):
+            token = m.group()
+            if _DIGIT.search(token) and _LETTER.search(token):
+                yield m.start(), token
+
+    def scan(self, data, path=None):
+        """Returns [Finding] for each high-entropy token in `data` (bytes), in offset order."""
+        if skips(path):
+            return []
+        if b"\0" in data[:8192]:
+            return []  # binary
+
+        budget = max(MIN_BUDGET_MS, self.budget_ms_per_mb * len(data) / (1024 * 1024)) / 1000
+        deadline = time.perf_counter() + budget
+
+        findings = []
+        candidates = self._candidates(data)
+        while True:
+            batch = [c for _, c in zip(range(BATCH), candidates)]
+            if not batch:
+                break
+            scores = entropies([token for _, token in batch])
+            findings += [
+                matcher.Finding(path, HIGH_ENTROPY, offset)
+                for (offset, token), score in zip(batch, scores)
+                if score >= self.threshold and not self._allowed(data, offset, token)
+            ]
+            if time.perf_counter() > deadline:
+                self.truncated += 1
+                break
+        return findings
@@ -1,42 +1,542 @@
-import subprocess
+import bisect
+import hashlib
+import os
 import re
+import subprocess
+from collections import namedtuple
+from grid.core import blobs, cache, entropy, matcher, policy, repo
 
 # Default Banned Files
 SENSITIVE_FILES = [".env", ".pem", ".key", "id_rsa", "credentials.json", ".grid"]
 
-# Regex Patterns for Keys
-SECRET_PATTERNS = [
-    r"sk_live_[0-9a-zA-Z]{24}",        # Stripe
-    r"ghp_[0-9a-zA-Z]{36}",             # GitHub
-    r"xox[baprs]-([0-9a-zA-Z]{10,48})", # Slack
-    r"AIza[0-9A-Za-z-_]{35}",           # Google
+# Regex Patterns for Keys: (pattern id, literal anchor, regex)
+SECRET_RULES = [
+    ("stripe-live-key", "sk_live_", r"sk_live_[0-9a-zA-Z]{24}"),
+    ("github-token", "ghp_", r"ghp_[0-9a-zA-Z]{36}"),
+    ("slack-token", "xox", r"xox[baprs]-([0-9a-zA-Z]{10,48})"),
+    ("google-api-key", "AIza", r"AIza[0-9A-Za-z-_]{35}"),
 ]
+SECRET_PATTERNS = [regex for _, _, regex in SECRET_RULES]
+
+# Pattern id reported for files blocked by name rather than content
+BANNED_FILE = "banned-file"
+
+# "@@ -12,3 +40,5 @@" -> new-file start line 40
+HUNK_HEADER = re.compile(rb"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+
+# Blob SHA meaning "nothing there" (new file, no HEAD yet)
+ZERO_SHA = "0" * 40
+
+# A working-tree path 'git add' would pick up.
+# head_sha: its blob in HEAD (ZERO_SHA when new); staged: the index already differs from HEAD;
+# deleted: the change is a removal; submodule: a gitlink (staged as-is, never read)
+WorkingChange = namedtuple("WorkingChange", "path head_sha staged deleted submodule")
+
+# Compiled matchers, one per distinct pattern set
+_MATCHERS = {}
 
 def get_current_branch():
-    """Returns the active git branch name."""
+    """Returns the active git branch name (kept for callers; see repo.Repository)."""
+    return repo.current().current_branch()
+
+def staged_changes():
+    """
+    [(path, old_blob_sha, new_blob_sha)] for every staged addition/modification.
+    One 'git diff --cached --raw' call gives us the blob SHAs directly
+    (old is all zeros for new files).
+    """
+    raw = subprocess.check_output(
+        ["git", "diff", "--cached", "--raw", "-z", "--no-abbrev", "--diff-filter=ACMR"],
+        stderr=subprocess.DEVNULL
+    ).decode("utf-8", errors="replace")
+
+    # Records look like ":100644 100644 <old> <new> M\0path\0"
+    # (renames/copies carry two paths: "R100\0old\0new\0")
+    staged = []
+    tokens = raw.split("\0")
+    i = 0
+    while i < len(tokens) - 1:
+        meta = tokens[i].split()
+        if not meta:
+            break
+        old_sha, new_sha, status = meta[2], meta[3], meta[4]
+        if status[0] in "RC":
+            path = tokens[i + 2]
+            i += 3
+        else:
+            path = tokens[i + 1]
+            i += 2
+        staged.append((path, old_sha, new_sha))
+    return staged
+
+def working_changes(pathspec="."):
+    """
+    [WorkingChange] for every path whose working-tree version differs from the index
+    (edits, deletions, untracked files), under `pathspec` like 'git add .'.
+    One 'git status --porcelain=v2' call: git compares stat info, so unchanged files are
+    never read or hashed. Paths are relative to the repository root.
+    """
+    raw = subprocess.check_output(
+        ["git", "status", "--porcelain=v2", "-z", "--untracked-files=all", "--no-renames", "--", pathspec],
+        stderr=subprocess.DEVNULL
+    )
+
+    changes = []
+    for record in raw.split(b"\0"):
+        # Ordinary: "1 XY sub mH mI mW hH hI path"; unmerged: "u XY sub m1 m2 m3 mW h1 h2 h3 path"
+        if record.startswith(b"? "):
+            changes.append(WorkingChange(os.fsdecode(record[2:]), ZERO_SHA, False, False, False))
+        elif record.startswith(b"1 "):
+            fields = record.split(b" ", 8)
+            xy, sub = fields[1].decode(), fields[2]
+            if xy[1] == ".":
+                continue  # working tree matches the index: nothing to add
+            changes.append(WorkingChange(os.fsdecode(fields[8]), fields[6].decode(), xy[0] != ".",
+                                         xy[1] == "D", sub.startswith(b"S")))
+        elif record.startswith(b"u "):
+            fields = record.split(b" ", 10)
+            changes.append(WorkingChange(os.fsdecode(fields[10]), ZERO_SHA, True, False, False))
+    return changes
+
+def stage(paths):
+    """
+    Stages exactly `paths` (edits, new files and deletions) with one 'git add'.
+    Raises CalledProcessError (git's message in .stderr) if git refuses, e.g. a stale index.lock.
+    """
+    if not paths:
+        return
+    spec = b"".join(os.fsencode(f":(top,literal){path}") + b"\0" for path in paths)
+    result = subprocess.run(
+        ["git", "add", "--all", "--pathspec-from-file=-", "--pathspec-file-nul"],
+        input=spec, stderr=subprocess.PIPE
+    )
+    if result.returncode:
+        raise subprocess.CalledProcessError(result.returncode, result.args,
+                                            stderr=result.stderr.decode("utf-8", errors="replace"))
+
+def unstage(paths):
+    """Takes `paths` back out of the index (their working-tree files are untouched)."""
+    if not paths:
+        return
+    spec = b"".join(os.fsencode(f":(top,literal){path}") + b"\0" for path in paths)
+    subprocess.run(["git", "restore", "--staged", "--pathspec-from-file=-", "--pathspec-file-nul"], input=spec)
+
+def staged_blobs():
+    """[(path, blob_sha)] for every staged addition/modification."""
+    return [(path, new_sha) for path, _, new_sha in staged_changes()]
+
+def project_rules(cfg):
+    """
+    Extra patterns from the .grid "secret_patterns" key. Accepts either
+    {"id": "regex"}, ["regex", ...] or [{"id": ..., "regex": ..., "literal": ...}].
+    """
+    raw = (cfg or {}).get("secret_patterns") or []
+    if isinstance(raw, dict):
+        return [(pattern_id, None, regex) for pattern_id, regex in raw.items()]
+
+    rules = []
+    for i, item in enumerate(raw, 1):
+        if isinstance(item, str):
+            rules.append((f"custom-{i}", None, item))
+        elif isinstance(item, dict) and item.get("regex"):
+            rules.append((item.get("id", f"custom-{i}"), item.get("literal"), item["regex"]))
+    return rules
+
+def secret_rules(cfg=None):
+    """Built-in + project rules as one hashable tuple."""
+    return tuple(SECRET_RULES + project_rules(cfg))
+
+def build_matcher(cfg=None):
+    """Compiles built-in + project patterns once per distinct pattern set."""
+    rules = secret_rules(cfg)
+    if rules not in _MATCHERS:
+        _MATCHERS[rules] = matcher.SecretMatcher(rules)
+    return _MATCHERS[rules]
+
+def build_entropy(cfg=None):
+    """EntropyDetector from the .grid "entropy" settings, or None when disabled."""
+    options = entropy.settings(cfg)
+    if not options["enabled"]:
+        return None
+    return entropy.EntropyDetector(options["threshold"], options["min_length"], options["budget_ms_per_mb"],
+                                   options["allow"])
+
+def with_entropy(findings, extra):
+    """Adds entropy hits, except on lines a named pattern already flagged."""
+    flagged = {(f.path, f.line) for f in findings}
+    return findings + [f for f in extra if (f.path, f.line) not in flagged]
+
+def _unquote(path):
+    """Strips git's "a/" / "b/" prefix and C-style quoting from a diff header path."""
+    if path.startswith(b'"') and path.endswith(b'"'):
+        path = path[1:-1].decode("unicode_escape").encode("latin-1")
+    return path[2:].decode("utf-8", errors="replace")
+
+def iter_added_lines(paths=None, cached=True, revs=None):
+    """
+    Streams 'git diff --cached -U0' and yields (path, [(line_no, line_bytes)]) per file,
+    covering only the lines the commit adds. Binary files yield (path, None).
+    paths limits the diff to those files; cached=False diffs the working tree against HEAD.
+    revs (rev-list arguments) streams 'git log -p' instead: every commit's added lines,
+    so a path can come up once per commit that touches it.
+    """
+    pathspec = ["--"] + [f":(top,literal){path}" for path in paths] if paths else []
+    if revs:
+        command = ["log", "-p", "--format=", "--no-renames"] + list(revs)
+    else:
+        command = ["diff", "--cached" if cached else "HEAD"]
+    # Pin everything user config could change about the paths and lines we parse
+    proc = subprocess.Popen(
+        ["git", "-c", "core.quotePath=false"] + command +
+        ["-U0", "--no-color", "--no-ext-diff", "--no-textconv", "--no-relative",
+         "--src-prefix=a/", "--dst-prefix=b/", "--diff-filter=ACMR"] + pathspec,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+
+    path = None
+    lines = []
+    line_no = 0
+    in_hunk = False
     try:
-        return subprocess.check_output(
-            ["git", "branch", "--show-current"], 
-            stderr=subprocess.DEVNULL
-        ).decode().strip()
-    except:
-        return "unknown"
+        for raw in proc.stdout:
+            if raw.startswith(b"diff --git "):
+                if path is not None:
+                    yield path, lines
+                path, lines = None, []
+                in_hunk = False
+            elif raw.startswith(b"+++ ") and not in_hunk:
+                # Inside a hunk this is an added line that starts with "++ "
+                # Paths with spaces get a trailing tab ("+++ b/my file.py\t")
+                target = raw[4:].rstrip(b"\n").rstrip(b"\t")
+                path = _unquote(target) if target != b"/dev/null" else None
+            elif raw.startswith(b"Binary files ") and not in_hunk:
+                # "Binary files /dev/null and b/x differ"
+                target = raw.rsplit(b" and ", 1)[-1][:-len(b" differ\n")]
+                yield _unquote(target), None
+                path = None
+            elif raw.startswith(b"@@"):
+                match = HUNK_HEADER.match(raw)
+                line_no = int(match.group(1)) if match else 0
+                in_hunk = True
+            elif raw.startswith(b"+") and path is not None:
+                lines.append((line_no, raw[1:].rstrip(b"\r\n")))
+                line_no += 1
+
+        if path is not None:
+            yield path, lines
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+def scan_lines(secrets, path, lines):
+    """
+    Matches added lines in one pass: they are joined into a single buffer and
+    each hit's offset is mapped back to its line number.
+    """
+    buffer = b"\n".join(text for _, text in lines)
+    starts = []
+    offset = 0
+    for _, text in lines:
+        starts.append(offset)
+        offset += len(text) + 1
+
+    findings = []
+    for hit in secrets.scan(buffer, path=path):
+        index = bisect.bisect_right(starts, hit.offset) - 1
+        findings.append(hit._replace(offset=hit.offset - starts[index], line=lines[index][0]))
+    return findings
+
+def line_of(data, offset):
+    """1-based line number of a byte offset."""
+    return data.count(b"\n", 0, offset) + 1
+
+def verdict_prefix(secrets, detector):
+    """Cache key prefix for one pattern set + entropy settings (verdicts never cross sets)."""
+    signature = f"{secrets.fingerprint}:{detector.fingerprint if detector else 'off'}"
+    return hashlib.sha1(signature.encode()).hexdigest()[:16]
+
+def _verdict(secrets, detector, data=None, lines=None):
+    """
+    Path-independent hits for one blob (or its added lines): ([[pattern_id, offset, line]], complete).
+    complete is False when the entropy check ran out of time (such verdicts aren't cached).
+    """
+    cut = detector.truncated if detector else 0
+    if lines is not None:
+        hits = scan_lines(secrets, None, lines)
+        if detector:
+            hits = with_entropy(hits, scan_lines(detector, None, lines))
+    else:
+        hits = [hit._replace(line=line_of(data, hit.offset)) for hit in secrets.scan(data)]
+        if detector:
+            extra = detector.scan(data)
+            hits = with_entropy(hits, [hit._replace(line=line_of(data, hit.offset)) for hit in extra])
+    complete = not detector or detector.truncated == cut
+    return [[hit.pattern_id, hit.offset, hit.line] for hit in hits], complete
+
+def entropy_prefix(detector):
+    """Cache key prefix for entropy verdicts on added lines (see _entropy_verdicts)."""
+    return hashlib.sha1(f"entropy:{detector.fingerprint}".encode()).hexdigest()[:16]
+
+def _lines_of(data):
+    """Every line of a new file, numbered the way iter_added_lines reports them."""
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    return [(i, line.rstrip(b"\r")) for i, line in enumerate(lines, 1)]
+
+def _entropy_verdicts(detector, pairs, store=None, fresh=None, cached=True, contents=None):
+    """
+    High-entropy hits on just the lines each path adds ({path: (old_sha, new_sha)}), so
+    tokens committed earlier are never reported again: {path: verdict}.
+    Cached per old..new blob pair. New files found in `contents` are split into lines
+    instead of diffed; everything else takes one iter_added_lines pass.
+    """
+    prefix = entropy_prefix(detector)
+    keys = {path: f"{prefix}:{old}..{new}" for path, (old, new) in pairs.items()}
+    known = store.get_many(set(keys.values())) if store and keys else {}
+    verdicts = {path: known[key]["hits"] for path, key in keys.items() if key in known}
+
+    def run(path, lines):
+        cut = detector.truncated
+        verdict = [[hit.pattern_id, hit.offset, hit.line] for hit in scan_lines(detector, None, lines)]
+        if fresh is not None and detector.truncated == cut:
+            fresh[keys[path]] = {"hits": verdict}
+        verdicts[path] = verdict
+
+    diffed = []
+    for path in keys:
+        if path in verdicts:
+            continue
+        if contents is not None and pairs[path][0] == ZERO_SHA:
+            run(path, _lines_of(contents[path]))
+        else:
+            diffed.append(path)
+    try:
+        if diffed:
+            for path, lines in iter_added_lines(diffed, cached=cached):
+                if path in keys and path not in verdicts and lines is not None:
+                    run(path, lines)
+    except OSError:
+        pass
+    return verdicts
 
-def scan_for_secrets(custom_patterns=None):
+def _findings(path, verdict):
+    """Turns a cached/fresh verdict into Findings for one path."""
+    skip_entropy = entropy.skips(path)
+    return [
+        matcher.Finding(path, pattern_id, offset, line)
+        for pattern_id, offset, line in verdict
+        if not (skip_entropy and pattern_id == entropy.HIGH_ENTROPY)
+    ]
+
+def scan_staged(custom_patterns=None, cfg=None, diff_only=False, detector=None, store=None, exclude=None):
     """
-    Scans staged files for banned filenames or regex patterns.
+    Scans staged files for banned filenames, secret patterns and (unless disabled in
+    .grid) high-entropy tokens on the lines the commit adds. Pass `detector` to reuse
+    one EntropyDetector.
+    Returns [Finding(path, pattern_id, offset, line)]; banned files have no offset/line.
+
+    Full mode streams every staged blob through one 'git cat-file --batch'.
+    diff_only scans just the lines the commit adds ('git diff --cached -U0'),
+    so a one-line edit to a huge file costs one line (offset is then column-based).
+    Contents are matched as raw bytes (never decoded).
+
+    With a `store` (cache.Store), verdicts are remembered per blob SHA (per old..new
+    blob pair in diff mode) and pattern set, so unchanged files are never rescanned.
+    `exclude` skips paths already checked elsewhere (see scan_worktree).
     """
     # Combine default bans with project-specific bans
     banned_files = SENSITIVE_FILES + (custom_patterns or [])
-    
+    secrets = build_matcher(cfg)
+    if detector is None:
+        detector = build_entropy(cfg)
+    prefix = verdict_prefix(secrets, detector)
+
     try:
-        # Get list of staged files
-        files = subprocess.check_output(
-            ["git", "diff", "--name-only", "--cached"], 
-            stderr=subprocess.DEVNULL
-        ).decode().splitlines()
+        # Get list of staged files (+ their blob SHAs)
+        staged = staged_changes()
     except:
         return []
+    if exclude:
+        staged = [change for change in staged if change[0] not in exclude]
+
+    findings = []
+    to_read = {}
+    fresh = {}
+
+    # 1. Check Filenames (every staged path against every rule in one regex pass)
+    banned = set(policy.compile_policy(banned_files).banned(path for path, _, _ in staged))
+    for file_path, _, sha in staged:
+        if file_path in banned:
+            findings.append(matcher.Finding(file_path, BANNED_FILE, None))
+            continue
+        to_read.setdefault(sha, []).append(file_path)
+
+    if not to_read:
+        return findings
+
+    # 2a. Diff mode: only added lines (binary files fall back to a full read below)
+    if diff_only:
+        keys = {path: f"{prefix}:{old}..{new}" for path, old, new in staged if path not in banned}
+        known = store.get_many(keys.values()) if store else {}
+        todo = {path: key for path, key in keys.items() if key not in known}
+        for path, key in keys.items():
+            if key in known:
+                findings += _findings(path, known[key]["hits"])
+
+        shas = {path: new for path, _, new in staged}
+        full = {}
+        diffed = set()
+        try:
+            if todo:
+                for file_path, lines in iter_added_lines(list(todo) if len(todo) < len(keys) else None):
+                    if file_path not in todo or lines is None:
+                        continue
+                    diffed.add(file_path)
+                    verdict, complete = _verdict(secrets, detector, lines=lines)
+                    if complete:
+                        fresh[todo[file_path]] = {"hits": verdict}
+                    findings += _findings(file_path, verdict)
+        except OSError:
+            pass
+        # Binary files, pure renames and anything the diff didn't show are read in full
+        for file_path in todo:
+            if file_path not in diffed:
+                full.setdefault(shas[file_path], []).append(file_path)
+        to_read = full
+
+    # 2b. Check Content - each unique blob is read once (and only if its verdict isn't cached).
+    # Entropy is left to step 3 in full mode: it only ever looks at added lines.
+    full_prefix = verdict_prefix(secrets, None)
+    keys = {sha: f"{full_prefix}:{sha}" for sha in to_read}
+    known = store.get_many(keys.values()) if store and keys else {}
+    for sha, key in keys.items():
+        if key in known:
+            for file_path in to_read[sha]:
+                findings += _findings(file_path, known[key]["hits"])
+
+    todo = [sha for sha in to_read if keys[sha] not in known]
+    try:
+        if todo:
+            with blobs.BlobReader() as reader:
+                for sha, data in reader.iter_blobs(todo):
+                    if data is None:
+                        continue
+                    verdict, _ = _verdict(secrets, None, data=data)
+                    fresh[keys[sha]] = {"hits": verdict}
+                    for file_path in to_read[sha]:
+                        findings += _findings(file_path, verdict)
+    except OSError:
+        pass
+
+    # 3. Full mode: entropy on the lines the commit adds, not on tokens committed long ago
+    if detector and not diff_only:
+        pairs = {path: (old, new) for path, old, new in staged if path not in banned}
+        for path, verdict in _entropy_verdicts(detector, pairs, store, fresh).items():
+            findings = with_entropy(findings, _findings(path, verdict))
+
+    if store and fresh:
+        store.put_many(fresh)
+    return findings
+
+def _read_worktree(root, path):
+    """Bytes git would stage for `path` (a symlink's target), or None if it's gone."""
+    full = os.path.join(root, path)
+    try:
+        if os.path.islink(full):
+            return os.fsencode(os.readlink(full))
+        with open(full, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def scan_worktree(changes, custom_patterns=None, cfg=None, diff_only=False, detector=None, store=None, root="."):
+    """
+    scan_staged for files that are not staged yet: checks `changes` (from working_changes)
+    straight from disk, so leaked files can be left out of 'git add' instead of unstaged later.
+    Verdicts use the same cache keys as scan_staged (blob SHA, or HEAD..new blob pair in
+    diff mode and for entropy), so the index scan after staging is a cache hit.
+    Deletions and submodules have no content to check. `root` is the repository top level.
+    """
+    banned_files = SENSITIVE_FILES + (custom_patterns or [])
+    secrets = build_matcher(cfg)
+    if detector is None:
+        detector = build_entropy(cfg)
+    prefix = verdict_prefix(secrets, detector)
+    full_prefix = verdict_prefix(secrets, None)
+
+    findings = []
+    readable = [change for change in changes if not change.deleted and not change.submodule]
+
+    # 1. Check Filenames
+    banned = set(policy.compile_policy(banned_files).banned(change.path for change in readable))
+    findings += [matcher.Finding(path, BANNED_FILE, None) for path in sorted(banned)]
+
+    # 2. Read each candidate once and key its verdict by content
+    contents = {}
+    keys = {}
+    heads = {}
+    for change in readable:
+        if change.path in banned:
+            continue
+        data = _read_worktree(root, change.path)
+        if data is None:
+            continue
+        contents[change.path] = data
+        sha = cache.blob_sha(data)
+        heads[change.path] = (change.head_sha, sha)
+        diffable = diff_only and change.head_sha != ZERO_SHA
+        keys[change.path] = f"{prefix}:{change.head_sha}..{sha}" if diffable else f"{full_prefix}:{sha}"
+
+    known = store.get_many(set(keys.values())) if store and keys else {}
+    todo = []
+    for path, key in keys.items():
+        if key in known:
+            findings += _findings(path, known[key]["hits"])
+        else:
+            todo.append(path)
+
+    # 3a. Diff mode: only lines added since HEAD (new and binary files fall back to a full scan)
+    fresh = {}
+    full = [path for path in todo if ".." not in keys[path]]
+    changed = [path for path in todo if ".." in keys[path]]
+    diffed = set()
+    if changed:
+        try:
+            for path, lines in iter_added_lines(changed, cached=False):
+                if path not in contents or lines is None:
+                    continue
+                diffed.add(path)
+                verdict, complete = _verdict(secrets, detector, lines=lines)
+                if complete:
+                    fresh[keys[path]] = {"hits": verdict}
+                findings += _findings(path, verdict)
+        except OSError:
+            pass
+        full += [path for path in changed if path not in diffed]
+
+    # 3b. Check Content (named patterns; entropy follows on added lines only)
+    for path in full:
+        verdict, _ = _verdict(secrets, None, data=contents[path])
+        fresh[f"{full_prefix}:{heads[path][1]}"] = {"hits": verdict}
+        findings += _findings(path, verdict)
+
+    # 4. Entropy for everything whose verdict didn't already cover it
+    if detector:
+        covered = diffed | {path for path in keys if ".." in keys[path] and keys[path] in known}
+        pairs = {path: pair for path, pair in heads.items() if path not in covered}
+        for path, verdict in _entropy_verdicts(detector, pairs, store, fresh, cached=False,
+                                               contents=contents).items():
+            findings = with_entropy(findings, _findings(path, verdict))
+
+    if store and fresh:
+        store.put_many(fresh)
+    return findings
+
+def scan_for_secrets(custom_patterns=None, cfg=None, diff_only=False):
+    """Scans staged files. Returns the unique list of leaking paths."""
+    findings = scan_staged(custom_patterns, cfg, diff_only)
+    return list(dict.fromkeys(f.path for f in findings))
 
 def get_last_commit_message(author_name):
     """Fetches the last commit message for a specific author."""
@@ -47,29 +547,3 @@ def get_last_commit_message(author_name):
         return msg if msg else "No recent activity."
     except:
         return "Unknown Commit"
-
-    leaking_files = []
-
-    for file_path in files:
-        # 1. Check Filenames
-        if any(file_path.endswith(s) for s in banned_files):
-            leaking_files.append(file_path)
-            continue
-        
-        # 2. Check Content (Regex)
-        try:
-            content = subprocess.check_output(
-                ["git", "show", f":{file_path}"], 
-                stderr=subprocess.DEVNULL
-            ).decode(errors='ignore')
-            
-            for pattern in SECRET_PATTERNS:
-                if re.search(pattern, content):
-                    leaking_files.append(file_path)
-                    break
-        except:
-            continue
-
-    return leaking_files
-
-    
\ No newline at end of file
@@ -0,0 +1,175 @@
+import json
+import os
+import sqlite3
+import subprocess
+import tempfile
+from grid.core import analyzer, blobs, cache, scanner
+
+# Blobs analyzed per round (bounds temp disk usage on big histories)
+CHUNK = 512
+
+def _too_large_version(max_bytes):
+    """Version stored for size-skipped blobs: a larger --max-size has to look at them again."""
+    return f"{analyzer.ANALYZER_VERSION}:too-large@{max_bytes or 0}"
+
+class HistoryDB:
+    """
+    Per-commit code health, stored in .grid_cache/history.db.
+    Scores live on blobs, not commits: a file that doesn't change across
+    hundreds of commits is one blob, analyzed exactly once.
+    """
+
+    def __init__(self, root=cache.CACHE_DIR):
+        cache.ensure_dir(root)
+        self.db = sqlite3.connect(os.path.join(root, "history.db"), timeout=5)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS commits (
+                sha TEXT PRIMARY KEY, committed_at INTEGER, subject TEXT);
+            CREATE TABLE IF NOT EXISTS entries (
+                commit_sha TEXT, path TEXT, blob_sha TEXT, ext TEXT,
+                PRIMARY KEY (commit_sha, path));
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha TEXT, ext TEXT, version TEXT, score INTEGER, skipped TEXT, metrics TEXT,
+                PRIMARY KEY (sha, ext, version));
+        """)
+
+    def known_commits(self, shas):
+        marks = ",".join("?" * len(shas))
+        rows = self.db.execute(f"SELECT sha FROM commits WHERE sha IN ({marks})", shas)
+        return {row[0] for row in rows}
+
+    def add_commit(self, sha, committed_at, subject, entries):
+        """entries: [(path, blob_sha, ext)]"""
+        self.db.execute("INSERT OR REPLACE INTO commits VALUES (?, ?, ?)", (sha, committed_at, subject))
+        self.db.executemany(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+            [(sha, path, blob, ext) for path, blob, ext in entries]
+        )
+
+    def missing_blobs(self, max_bytes=analyzer.MAX_FILE_BYTES):
+        """
+        (blob_sha, ext) pairs referenced by some commit but not analyzed by this analyzer version
+        (blobs skipped as too large only count as done for the same size limit).
+        """
+        rows = self.db.execute("""
+            SELECT DISTINCT e.blob_sha, e.ext FROM entries e
+            LEFT JOIN blobs b ON b.sha = e.blob_sha AND b.ext = e.ext AND b.version IN (?, ?)
+            WHERE b.sha IS NULL
+        """, (analyzer.ANALYZER_VERSION, _too_large_version(max_bytes)))
+        return rows.fetchall()
+
+    def add_blob(self, sha, ext, stats, max_bytes=analyzer.MAX_FILE_BYTES):
+        version = analyzer.ANALYZER_VERSION
+        if stats.get("skipped") == "too large":
+            version = _too_large_version(max_bytes)
+        self.db.execute(
+            "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+            (sha, ext, version, stats.get("score"), stats.get("skipped"),
+             json.dumps(stats.get("metrics") or {}))
+        )
+
+    def file_scores(self, commit_sha):
+        """{path: score} for every analyzed file in a commit (skipped files excluded)."""
+        rows = self.db.execute("""
+            SELECT e.path, b.score FROM entries e
+            JOIN blobs b ON b.sha = e.blob_sha AND b.ext = e.ext AND b.version = ?
+            WHERE e.commit_sha = ? AND b.score IS NOT NULL
+        """, (analyzer.ANALYZER_VERSION, commit_sha))
+        return dict(rows.fetchall())
+
+    def flush(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+def recent_commits(count):
+    """[(sha, committed_at, subject)] for the last `count` mainline commits, newest first."""
+    try:
+        raw = subprocess.check_output(
+            ["git", "log", f"-n{count}", "--first-parent", "--format=%H%x1f%ct%x1f%s"],
+            stderr=subprocess.DEVNULL
+        ).decode("utf-8", errors="replace")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    commits = []
+    for line in raw.splitlines():
+        sha, committed_at, subject = line.split("\x1f", 2)
+        commits.append((sha, int(committed_at), subject))
+    return commits
+
+def tree_entries(commit_sha, extensions):
+    """[(path, blob_sha, ext, size)] for supported files in a commit ('git ls-tree -r -l')."""
+    raw = subprocess.check_output(
+        ["git", "ls-tree", "-r", "-l", "-z", "--full-tree", commit_sha],
+        stderr=subprocess.DEVNULL
+    )
+
+    entries = []
+    for record in raw.split(b"\0"):
+        if not record:
+            continue
+        meta, path = record.split(b"\t", 1)
+        _, kind, sha, size = meta.split()
+        path = path.decode("utf-8", errors="replace")
+        ext = os.path.splitext(path)[1].lower()
+        if kind == b"blob" and ext in extensions:
+            entries.append((path, sha.decode(), ext, int(size)))
+    return entries
+
+def _analyze_blobs(db, pending, jobs, max_bytes):
+    """Streams blobs out of git into a temp folder and runs the normal scan engine on them."""
+    with tempfile.TemporaryDirectory(prefix="grid-history-") as tmp, blobs.BlobReader() as reader:
+        for i in range(0, len(pending), CHUNK):
+            chunk = pending[i:i + CHUNK]
+            paths = {}
+            for (sha, ext), (_, data) in zip(chunk, reader.iter_blobs(sha for sha, _ in chunk)):
+                if data is None:
+                    continue
+                path = os.path.join(tmp, sha + ext)
+                with open(path, "wb") as f:
+                    f.write(data)
+                paths[path] = (sha, ext)
+
+            for path, stats in scanner.scan_files(list(paths), jobs=jobs, max_bytes=max_bytes):
+                sha, ext = paths[path]
+                db.add_blob(sha, ext, stats or {"score": None, "skipped": "unreadable"}, max_bytes)
+                os.remove(path)
+
+def record(db, count, jobs=None, max_bytes=analyzer.MAX_FILE_BYTES):
+    """
+    Makes sure the last `count` commits are in the history DB.
+    Only commits not seen before are listed, and only blobs never analyzed are read.
+    Returns the commits (newest first), or None outside a git repo.
+    """
+    commits = recent_commits(count)
+    if commits is None:
+        return None
+
+    extensions = analyzer.supported_extensions()
+    known = db.known_commits([sha for sha, _, _ in commits]) if commits else set()
+    oversized = {}
+
+    # 1. Record tree snapshots for new commits
+    for sha, committed_at, subject in commits:
+        if sha in known:
+            continue
+        entries = tree_entries(sha, extensions)
+        db.add_commit(sha, committed_at, subject, [(p, b, e) for p, b, e, _ in entries])
+        for _, blob, ext, size in entries:
+            if max_bytes and size > max_bytes:
+                oversized[(blob, ext)] = True
+
+    # 2. Analyze each never-seen blob once (oversized ones are never even read)
+    pending = []
+    for blob, ext in db.missing_blobs(max_bytes):
+        if (blob, ext) in oversized:
+            db.add_blob(blob, ext, {"score": None, "skipped": "too large"}, max_bytes)
+        else:
+            pending.append((blob, ext))
+
+    _analyze_blobs(db, pending, jobs, max_bytes)
+    db.flush()
+    return commits
@@ -0,0 +1,305 @@
+import hashlib
+import json
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from grid.core import audit, blobs, cache, config, git_police, policy
+
+# Hooks Grid manages
+HOOKS = ("pre-commit", "pre-push")
+
+# Marks hook files written by Grid (anything else is left alone)
+MARKER = "# grid-hook"
+
+# Resident worker exits after this long without a request
+IDLE_TIMEOUT = 30 * 60
+
+# Unix socket paths are capped at ~100 bytes; deeper repos get one in the temp dir
+MAX_SOCKET_PATH = 100
+
+# Set by git for hooks and needed to see what it sees: 'git commit -a' / 'git commit <paths>'
+# stage into a temporary index named by GIT_INDEX_FILE
+HOOK_ENV = ("GIT_INDEX_FILE", "GIT_DIR", "GIT_WORK_TREE")
+
+# "0000..." in pre-push input means "nothing on that side" (new or deleted ref)
+ZERO_SHA = "0" * 40
+
+# Written to .git/hooks/<hook>. Stdlib only: no rich/requests import on the fast path.
+HOOK_SCRIPT = '''#!{python}
+{marker} (installed by 'grid hooks install', remove with 'grid hooks uninstall')
+import json, os, socket, sys
+
+PYTHON = {python!r}
+SOCKET = {socket!r}
+HOOK = {hook!r}
+HOOK_ENV = {hook_env!r}
+
+def ask_worker(payload):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(120)
+    client.connect(SOCKET)
+    client.sendall(json.dumps(payload).encode() + b"\\n")
+    reply = b""
+    while not reply.endswith(b"\\n"):
+        chunk = client.recv(65536)
+        if not chunk:
+            break
+        reply += chunk
+    client.close()
+    return json.loads(reply)
+
+payload = {{"hook": HOOK, "cwd": os.getcwd(), "stdin": sys.stdin.read() if HOOK == "pre-push" else "",
+           "env": {{key: os.environ[key] for key in HOOK_ENV if key in os.environ}}}}
+try:
+    result = ask_worker(payload)
+    if "error" in result:
+        raise OSError(result["error"])
+except (OSError, ValueError, AttributeError):
+    # No warm worker: scan in this process, and start one for next time
+    try:
+        from grid.core import hookd
+    except ImportError:
+        print("grid: {{}} can't import grid with {{}}.".format(HOOK, PYTHON))
+        print("Reinstall grid and run 'grid hooks install', or bypass with --no-verify.")
+        sys.exit(1)
+    result = hookd.handle(payload)
+    hookd.start_worker()
+
+if "error" in result:
+    print("grid: {{}} scan failed ({{}}), not blocking.".format(HOOK, result["error"]))
+
+findings = result.get("findings", [])
+if findings:
+    print("grid: {{}} blocked. Secrets or banned files found:".format(HOOK))
+    for path, pattern_id, line in findings:
+        print("  {{}}{{}} [{{}}]".format(path, ":{{}}".format(line) if line else "", pattern_id))
+    fix = "Unstage them" if HOOK == "pre-commit" else "Rewrite those commits"
+    print("{{}}, or bypass with --no-verify if you are sure.".format(fix))
+    sys.exit(1)
+'''
+
+# Frozen (PyInstaller) builds have no Python to run the script above: the hook calls grid itself
+FROZEN_HOOK_SCRIPT = '''#!/bin/sh
+{marker} (installed by 'grid hooks install', remove with 'grid hooks uninstall')
+exec {grid} hooks run {hook}
+'''
+
+def git_path(name):
+    """Absolute path of something inside the git dir (respects core.hooksPath for 'hooks')."""
+    raw = subprocess.check_output(
+        ["git", "rev-parse", "--path-format=absolute", "--git-path", name],
+        stderr=subprocess.DEVNULL
+    )
+    return raw.decode().strip()
+
+def socket_path():
+    """.git/grid.sock, or a per-repo path in the temp dir when that would be too long."""
+    path = git_path("grid.sock")
+    if len(path) <= MAX_SOCKET_PATH:
+        return path
+    digest = hashlib.sha1(path.encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"grid-{digest}.sock")
+
+def hook_script(hook, sock):
+    if getattr(sys, "frozen", False):
+        # Forward slashes: Git for Windows runs hooks with its own sh
+        grid = shlex.quote(sys.executable.replace(os.sep, "/"))
+        return FROZEN_HOOK_SCRIPT.format(marker=MARKER, grid=grid, hook=hook)
+    return HOOK_SCRIPT.format(python=sys.executable, marker=MARKER, socket=sock, hook=hook, hook_env=HOOK_ENV)
+
+def hook_payload(hook, stdin=""):
+    """What a hook sends the worker: the hook, where git ran it, and git's GIT_* variables."""
+    return {"hook": hook, "cwd": os.getcwd(), "stdin": stdin,
+            "env": {key: os.environ[key] for key in HOOK_ENV if key in os.environ}}
+
+def start_worker():
+    """Starts a detached worker for the current repository (no-op without Unix sockets)."""
+    if not hasattr(socket, "AF_UNIX"):
+        return
+    if getattr(sys, "frozen", False):
+        cmd = [sys.executable, "hooks", "serve"]
+    else:
+        cmd = [sys.executable, "-c", "from grid.commands import hooks; hooks.serve()"]
+    subprocess.Popen(cmd, start_new_session=True, stdin=subprocess.DEVNULL,
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def pushed_revs(stdin):
+    """rev-list arguments per pushed ref, from the lines git feeds pre-push."""
+    ranges = []
+    for line in stdin.splitlines():
+        parts = line.split()
+        if len(parts) != 4 or parts[1] == ZERO_SHA:
+            continue  # malformed, or a branch deletion
+        local_sha, remote_sha = parts[1], parts[3]
+        if remote_sha == ZERO_SHA:
+            # New branch: everything not already on some remote
+            ranges.append([local_sha, "--not", "--remotes"])
+        else:
+            ranges.append([local_sha, f"^{remote_sha}"])
+    return ranges
+
+def scan_push(stdin, banned_files, cfg):
+    """
+    Findings for every blob the push would publish (each blob read once), plus
+    high-entropy tokens on the lines its commits add.
+    """
+    secrets = git_police.build_matcher(cfg)
+    detector = git_police.build_entropy(cfg)
+    # Every version of every file: a secret added and then removed within the push is still published
+    pushed = []
+    names = set()
+    for revs in pushed_revs(stdin):
+        pushed += [(sha, path) for sha, _, path in audit.reachable_blobs(revs)]
+        # Names come from the commits themselves (rev-list shows one name per blob)
+        names.update(path for _, path in audit.history_paths(revs))
+
+    banned = policy.compile_policy(banned_files).banned(names)
+    findings = [git_police.matcher.Finding(path, git_police.BANNED_FILE, None) for path in banned]
+    to_read = {}
+    for sha, path in pushed:
+        if path not in banned:
+            to_read.setdefault(sha, path)
+
+    with blobs.BlobReader() as reader:
+        for sha, data in reader.iter_blobs(to_read):
+            if data is None:
+                continue
+            path = to_read[sha]
+            findings += [hit._replace(line=git_police.line_of(data, hit.offset))
+                         for hit in secrets.scan(data, path=path)]
+
+    # Entropy only on lines the pushed commits add (tokens already on the remote were accepted)
+    if detector:
+        for revs in pushed_revs(stdin):
+            for path, lines in git_police.iter_added_lines(revs=revs):
+                if lines and path not in banned:
+                    findings = git_police.with_entropy(findings, git_police.scan_lines(detector, path, lines))
+    return findings
+
+def check(hook, stdin=""):
+    """Runs the scan a hook asks for, in the current directory. Returns [Finding]."""
+    cfg = config.load_project_config()
+    banned_files = git_police.SENSITIVE_FILES + (cfg.get("banned_files", []) if cfg else [])
+    if hook == "pre-push":
+        return scan_push(stdin, banned_files, cfg)
+    diff_only = (cfg or {}).get("scan_mode") == "diff"
+    store = cache.open_store("secrets")
+    try:
+        return git_police.scan_staged(custom_patterns=banned_files, cfg=cfg, diff_only=diff_only, store=store)
+    finally:
+        if store:
+            store.close()
+
+@contextmanager
+def hook_env(env):
+    """
+    Runs the block (and every git it spawns) with the hook's GIT_* variables,
+    restoring the worker's own afterwards. None leaves the environment alone.
+    """
+    if env is None:
+        yield
+        return
+    saved = {key: os.environ.get(key) for key in HOOK_ENV}
+    for key in HOOK_ENV:
+        if key in env:
+            os.environ[key] = env[key]
+        else:
+            os.environ.pop(key, None)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+def handle(payload):
+    """One hook request -> JSON-able reply. Shared by the worker and the in-process fallback."""
+    if payload.get("hook") == "ping":
+        return {"pid": os.getpid()}
+    try:
+        os.chdir(payload.get("cwd") or ".")
+        with hook_env(payload.get("env")):
+            findings = check(payload.get("hook"), payload.get("stdin", ""))
+    except Exception as e:
+        # Never let one bad request take the resident worker down
+        return {"error": str(e)}
+    return {"findings": [[f.path, f.pattern_id, f.line] for f in findings]}
+
+def request(sock, payload, timeout=5):
+    """Sends one request to a running worker. Returns the reply, or None if nobody answers."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(sock)
+            client.sendall(json.dumps(payload).encode() + b"\n")
+            return json.loads(_read_line(client))
+    except (OSError, ValueError):
+        return None
+
+def _read_line(conn):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+def serve(sock, idle_timeout=IDLE_TIMEOUT):
+    """
+    Resident worker: answers hook requests on a Unix socket until idle for `idle_timeout`
+    or sent {"hook": "stop"}. Patterns stay compiled between requests.
+    Returns False if another worker already owns the socket.
+    """
+    if os.path.exists(sock):
+        if request(sock, {"hook": "ping"}) is not None:
+            return False
+        os.unlink(sock)  # left over from a crash
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(sock)
+    except OSError:
+        server.close()
+        return False  # lost a start-up race with another worker
+    server.listen(8)
+    server.settimeout(idle_timeout)
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            with conn:
+                conn.settimeout(60)
+                try:
+                    payload = json.loads(_read_line(conn))
+                except (OSError, ValueError):
+                    continue
+                stopping = payload.get("hook") == "stop"
+                if stopping:
+                    reply = {"stopped": True}
+                elif payload.get("hook") in HOOKS and "env" not in payload:
+                    # Hook written before GIT_* forwarding: its index may not be ours to read
+                    reply = {"error": "outdated hook (run 'grid hooks install')"}
+                else:
+                    reply = handle(payload)
+                try:
+                    conn.sendall(json.dumps(reply).encode() + b"\n")
+                except OSError:
+                    pass
+                if stopping:
+                    break
+    finally:
+        server.close()
+        if os.path.exists(sock):
+            os.unlink(sock)
+    return True
@@ -0,0 +1,106 @@
+import json
+import os
+import re
+import subprocess
+import time
+from grid.core import cache
+
+# Remote whose cowboy/ branches are ranked
+REMOTE = "origin"
+
+# Remote refs older than this are refreshed in the background (.grid "rank_ttl", seconds)
+DEFAULT_TTL = 15 * 60
+
+# Every cowboy branch ever seen, so history mode still counts merged/deleted ones
+SNAPSHOT = "rank.json"
+
+# "Merge branch 'cowboy/neo/fix/...'" / "Merge pull request #12 from acme/cowboy/neo/fix"
+MERGED_COWBOY = re.compile(r"(?:^|[\s/'\"])(cowboy/[^/\s'\"]+/[^\s'\"]*)")
+
+def owner(branch):
+    """'cowboy/neo/fix-login/slug' -> 'Neo' (None for anything else)."""
+    parts = branch.split("/")
+    if len(parts) < 3 or parts[0] != "cowboy" or not parts[1]:
+        return None
+    return parts[1].capitalize()
+
+def fetch_age(git_dir):
+    """Seconds since the last fetch of any kind (FETCH_HEAD's mtime), or None if never."""
+    try:
+        return time.time() - os.path.getmtime(os.path.join(git_dir, "FETCH_HEAD"))
+    except (OSError, TypeError):
+        return None
+
+def refresh(remote=REMOTE, background=False):
+    """
+    Updates remote-tracking refs with 'git fetch --prune'. Returns True on success.
+    background=True detaches the fetch and returns at once (the next run sees its result).
+    """
+    cmd = ["git", "fetch", "--prune", "--quiet", remote]
+    if background:
+        subprocess.Popen(cmd, start_new_session=True, stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return True
+    return subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.DEVNULL).returncode == 0
+
+def remote_cowboys(remote=REMOTE):
+    """{branch: sha} for the remote's cowboy/ branches, from local refs (no network)."""
+    prefix = f"refs/remotes/{remote}/"
+    raw = subprocess.check_output(
+        ["git", "for-each-ref", "--format=%(refname)%00%(objectname)", prefix + "cowboy/"],
+        stderr=subprocess.DEVNULL
+    ).decode("utf-8", errors="replace")
+    branches = {}
+    for line in raw.splitlines():
+        name, _, sha = line.partition("\0")
+        branches[name[len(prefix):]] = sha
+    return branches
+
+def merged_cowboys(target):
+    """Cowboy branches named in merge commits on `target` (found even after the branch is deleted)."""
+    try:
+        raw = subprocess.check_output(["git", "log", "--merges", "--format=%s", target],
+                                      stderr=subprocess.DEVNULL).decode("utf-8", errors="replace")
+    except (OSError, subprocess.CalledProcessError):
+        return set()
+    return {match.group(1).rstrip(".") for match in MERGED_COWBOY.finditer(raw)}
+
+def load_snapshot(root=cache.CACHE_DIR):
+    try:
+        with open(os.path.join(root, SNAPSHOT)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"branches": {}}
+
+def save_snapshot(snapshot, root=cache.CACHE_DIR):
+    try:
+        cache.ensure_dir(root)
+        path = os.path.join(root, SNAPSHOT)
+        with open(path + ".tmp", "w") as f:
+            json.dump(snapshot, f)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass  # read-only checkout: ranking still works, history just isn't remembered
+
+def record(snapshot, branches, now=None):
+    """Adds the branches seen now to the snapshot's ledger and marks the missing ones as gone."""
+    now = now or time.time()
+    ledger = snapshot.setdefault("branches", {})
+    for name, sha in branches.items():
+        entry = ledger.setdefault(name, {"first_seen": now})
+        entry.update(sha=sha, last_seen=now, gone=None)
+    for name, entry in ledger.items():
+        if name not in branches and not entry.get("gone"):
+            entry["gone"] = now
+    snapshot["updated"] = now
+    return snapshot
+
+def scores(branches):
+    """{developer: incidents} for an iterable of branch names."""
+    counts = {}
+    for branch in branches:
+        user = owner(branch)
+        if user:
+            counts[user] = counts.get(user, 0) + 1
+    return counts
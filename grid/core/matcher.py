@@ -0,0 +1,130 @@
+import hashlib
+import re
+from collections import namedtuple
+
+# One hit. offset is a byte offset into the scanned blob, line is 1-based.
+Finding = namedtuple("Finding", ["path", "pattern_id", "offset", "line"], defaults=(None,))
+
+# Characters that end the literal prefix of a regex
+_META = set(".^$*+?{}[]\\|()")
+
+# Shorter prefixes match too often to be worth checking first
+MIN_ANCHOR = 3
+
+def _has_top_level_alternation(regex):
+    """True for 'abc|xyz' (either side can match), False for 'abc(x|y)'."""
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in regex:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+def literal_prefix(regex):
+    """Leading plain-text characters of a regex ('sk_live_[0-9]' -> 'sk_live_')."""
+    if _has_top_level_alternation(regex):
+        return ""
+
+    prefix = []
+    for char in regex:
+        if char in _META:
+            break
+        prefix.append(char)
+
+    # A trailing quantifier applies to the last literal char, so it isn't guaranteed
+    rest = regex[len(prefix):]
+    if prefix and rest[:1] in ("*", "?", "{"):
+        prefix.pop()
+    return "".join(prefix)
+
+class SecretMatcher:
+    """
+    All secret patterns compiled once into a single alternation over raw bytes.
+
+    Patterns with a literal anchor ('sk_live_', 'ghp_', ...) are only tried on
+    blobs that contain that anchor (a C-speed bytes search), so most files are
+    rejected without ever running the regex or decoding anything.
+    """
+
+    def __init__(self, rules):
+        """rules: [(pattern_id, anchor or None, regex)]. Anchors are derived when None."""
+        self.rules = []
+        self.errors = []
+
+        for pattern_id, anchor, regex in rules:
+            try:
+                compiled = re.compile(regex.encode())
+            except re.error as e:
+                self.errors.append((pattern_id, str(e)))
+                continue
+            if anchor is None:
+                anchor = literal_prefix(regex)
+            anchor = anchor.encode() if len(anchor) >= MIN_ANCHOR else None
+            self.rules.append((pattern_id, anchor, regex, compiled))
+
+        self.anchorless = [i for i, rule in enumerate(self.rules) if rule[1] is None]
+        self._combined = {}
+
+        # Identifies this exact pattern set (verdicts from another set can't be reused)
+        signature = "\n".join(f"{pattern_id}\t{regex}" for pattern_id, _, regex, _ in self.rules)
+        self.fingerprint = hashlib.sha1(signature.encode()).hexdigest()
+
+    def _combine(self, indexes):
+        """Single compiled alternation for a set of rules (memoized)."""
+        key = tuple(indexes)
+        if key not in self._combined:
+            parts = [f"(?P<r{i}>{self.rules[i][2]})" for i in indexes]
+            try:
+                self._combined[key] = re.compile("|".join(parts).encode())
+            except re.error:
+                # e.g. a project pattern with inline global flags; scan those one by one
+                self._combined[key] = None
+        return self._combined[key]
+
+    def scan(self, data, path=None):
+        """Returns [Finding] for every match in `data` (bytes), in offset order."""
+        # 1. Literal prefilter
+        candidates = [i for i, rule in enumerate(self.rules) if rule[1] is not None and rule[1] in data]
+        candidates += self.anchorless
+        if not candidates:
+            return []
+        candidates.sort()
+
+        # 2. One pass of the combined regex
+        combined = self._combine(candidates)
+        if combined is not None:
+            return [
+                Finding(path, self.rules[int(m.lastgroup[1:])][0], m.start())
+                for m in combined.finditer(data)
+            ]
+
+        findings = []
+        for i in candidates:
+            pattern_id, _, _, compiled = self.rules[i]
+            findings += [Finding(path, pattern_id, m.start()) for m in compiled.finditer(data)]
+        return sorted(findings, key=lambda f: f.offset)
+
+    def search(self, data):
+        """True if `data` contains any secret (stops at the first hit)."""
+        candidates = [i for i, rule in enumerate(self.rules) if rule[1] is not None and rule[1] in data]
+        candidates += self.anchorless
+        if not candidates:
+            return False
+
+        combined = self._combine(sorted(candidates))
+        if combined is not None:
+            return combined.search(data) is not None
+        return any(self.rules[i][3].search(data) for i in candidates)
@@ -0,0 +1,108 @@
+import re
+import subprocess
+
+# "<sha> <orig line> <final line> <line count>" opens each group in 'git blame --incremental'
+GROUP_HEADER = re.compile(rb"^([0-9a-f]{40,64}) \d+ (\d+) (\d+)$")
+
+# Bumped when the cached report layout changes
+REPORT_VERSION = 1
+
+def parse_range(spec):
+    """'42' -> (42, 42), '10-80' / '10,80' / '10:80' -> (10, 80), None -> (None, None)."""
+    if spec is None:
+        return None, None
+    parts = re.split(r"[-,:]", str(spec).strip(), maxsplit=1)
+    start = int(parts[0])
+    end = int(parts[1]) if len(parts) > 1 and parts[1] else start
+    if start < 1 or end < start:
+        raise ValueError(f"Bad line range '{spec}'")
+    return start, end
+
+def blob_of(path, rev="HEAD"):
+    """(blob SHA, path from the repo root) of `path` at `rev`, or None if it isn't committed."""
+    raw = subprocess.check_output(["git", "ls-tree", "--full-name", "-z", rev, "--", path],
+                                  stderr=subprocess.DEVNULL).decode("utf-8", errors="replace")
+    # "100644 blob <sha>\t<path>\0"
+    meta, _, full_path = raw.rstrip("\0").partition("\t")
+    parts = meta.split()
+    if len(parts) != 3 or parts[1] != "blob":
+        return None
+    return parts[2], full_path
+
+def stream_blame(path, start=None, end=None, rev="HEAD"):
+    """
+    Yields (commit, author, author_time, lines) for each group of lines as
+    'git blame --incremental' finds it, so callers can aggregate while git still works.
+    Commit details only follow a commit's first group; later ones reuse them.
+    """
+    cmd = ["git", "blame", "--incremental", "--porcelain"]
+    if start is not None:
+        cmd += ["-L", f"{start},{end}"]
+    proc = subprocess.Popen(cmd + [rev, "--", path], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    commits = {}
+    sha, count = None, 0
+    try:
+        for raw in proc.stdout:
+            header = GROUP_HEADER.match(raw.rstrip(b"\n"))
+            if header:
+                sha, count = header.group(1).decode(), int(header.group(3))
+                commits.setdefault(sha, {"author": "Unknown", "time": 0})
+            elif sha is None:
+                continue
+            elif raw.startswith(b"author "):
+                commits[sha]["author"] = raw[7:].rstrip(b"\n").decode("utf-8", errors="replace")
+            elif raw.startswith(b"author-time "):
+                commits[sha]["time"] = int(raw[12:])
+            elif raw.startswith(b"filename "):
+                # Each group ends with its filename
+                yield sha, commits[sha]["author"], commits[sha]["time"], count
+                sha = None
+    finally:
+        proc.stdout.close()
+        if proc.wait():
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+def aggregate(groups, progress=None):
+    """
+    Folds blame groups into {"lines": total, "authors": {name: {"lines", "commits", "latest"}}}.
+    progress(lines_so_far) is called as groups arrive.
+    """
+    authors = {}
+    seen = set()
+    total = 0
+    for sha, author, when, count in groups:
+        entry = authors.setdefault(author, {"lines": 0, "commits": 0, "latest": 0})
+        entry["lines"] += count
+        entry["latest"] = max(entry["latest"], when)
+        if (author, sha) not in seen:
+            seen.add((author, sha))
+            entry["commits"] += 1
+        total += count
+        if progress:
+            progress(total)
+    return {"version": REPORT_VERSION, "lines": total, "authors": authors}
+
+def who_owns(path, start=None, end=None, store=None, progress=None):
+    """
+    Per-author ownership of `path` (or lines start..end) at HEAD.
+    With a `store` (cache.Store), reports are kept per blob SHA + path + range,
+    so asking again about an unchanged file costs one 'git ls-tree'.
+    """
+    key = None
+    if store:
+        blob = blob_of(path)
+        if blob:
+            key = f"{blob[0]}:{blob[1]}:{start or ''}-{end or ''}"
+            cached = store.get(key)
+            if cached and cached.get("version") == REPORT_VERSION:
+                return cached
+
+    report = aggregate(stream_blame(path, start, end), progress)
+    if key and report["lines"]:
+        store.put(key, report)
+    return report
+
+def ranked(report):
+    """[(author, entry)] by lines owned, biggest first."""
+    return sorted(report["authors"].items(), key=lambda item: (-item[1]["lines"], item[0]))
@@ -0,0 +1,149 @@
+import bisect
+import re
+
+# Characters that make a banned_files entry a glob rather than a plain name
+_GLOB_CHARS = set("*?[")
+
+# Multi-character regex pieces and their mirror images (everything else is one char wide)
+_MIRROR = {"(?:.*/)?": "(?:/.*)?", "/.*": ".*/"}
+
+def _tokens(pattern):
+    """
+    One gitignore-style pattern -> regex pieces that, in order, match a whole path.
+    - 'id_rsa', '.env'      legacy plain names: any path ending with them (old behaviour)
+    - '*.p12'               no slash: matches the file name at any depth
+    - '/config/*.json'      a slash anywhere but the end anchors it to the repo root
+    - 'secrets/'            trailing slash: everything under such a folder
+    - '**'                  any number of folders
+    """
+    directory = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+
+    if not _GLOB_CHARS & set(pattern) and not directory and not pattern.startswith("/"):
+        return [".*"] + [re.escape(char) for char in pattern]
+
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    out = [] if anchored else ["(?:.*/)?"]
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            out.append("[^/\\n]*")
+        elif char == "?":
+            out.append("[^/\\n]")
+        elif char == "[" and pattern.find("]", i + 2) != -1:
+            end = pattern.find("]", i + 2)
+            body = pattern[i + 1:end]
+            body = body.replace("\\", "\\\\")
+            if body.startswith("!"):
+                # Like '*' and '?', never across a folder (or into the next path of a batch)
+                out.append("[^" + body[1:] + "\\n/]")
+            else:
+                out.append("[" + body + "]")
+            i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(char))
+        i += 1
+
+    if directory:
+        out.append("/.*")
+    return out
+
+def translate(pattern):
+    """
+    Regex for a pattern, written backwards to match reversed paths.
+    Rules mostly pin down the end of a path ('*.pem', '.env'), so backwards each one
+    starts with literal characters and fails on the first mismatch instead of
+    backtracking through every folder of every path.
+    """
+    return "".join(_MIRROR.get(token, token) for token in reversed(_tokens(pattern)))
+
+class PathPolicy:
+    """
+    banned_files compiled once into a single regex (run over reversed paths, see translate).
+    Rules are tried last-to-first (alternation order), so like .gitignore the last
+    matching rule wins and '!pattern' re-allows paths an earlier rule banned.
+    """
+
+    def __init__(self, patterns):
+        self.rules = []
+        self.errors = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            allow = pattern.startswith("!")
+            if allow:
+                pattern = pattern[1:]
+            elif pattern.startswith("\\!") or pattern.startswith("\\#"):
+                pattern = pattern[1:]
+            if not pattern:
+                continue
+            # Checked one by one so a bad glob ('[z-a]') is skipped instead of breaking every scan
+            regex = translate(pattern)
+            try:
+                re.compile(regex)
+            except re.error as e:
+                self.errors.append((pattern, str(e)))
+                continue
+            self.rules.append((pattern, allow, regex))
+
+        groups = [f"(?P<r{i}>{regex})" for i, (_, _, regex) in reversed(list(enumerate(self.rules)))]
+        self.regex = re.compile("^(?:" + "|".join(groups) + ")$", re.M) if groups else None
+
+    def _verdict(self, match):
+        """The banning pattern for a match, or None if the winning rule is a negation."""
+        pattern, allow, _ = self.rules[int(match.lastgroup[1:])]
+        return None if allow else pattern
+
+    def match(self, path):
+        """The pattern that bans `path`, or None."""
+        if self.regex is None:
+            return None
+        m = self.regex.fullmatch(path[::-1])
+        return self._verdict(m) if m else None
+
+    def banned(self, paths):
+        """{path: pattern} for every banned path, in one regex pass over all of them."""
+        paths = list(paths)
+        if self.regex is None or not paths:
+            return {}
+        if any("\n" in path for path in paths):
+            # Can't join on newlines; evaluate one by one
+            return {path: rule for path in paths for rule in [self.match(path)] if rule}
+
+        starts = []
+        offset = 0
+        for path in paths:
+            starts.append(offset)
+            offset += len(path) + 1
+
+        found = {}
+        for m in self.regex.finditer("\n".join(path[::-1] for path in paths)):
+            rule = self._verdict(m)
+            if rule:
+                found[paths[bisect.bisect_right(starts, m.start()) - 1]] = rule
+        return found
+
+# Compiled policies, one per distinct rule list
+_POLICIES = {}
+
+def compile_policy(patterns):
+    """PathPolicy for a list of patterns, built once per distinct list."""
+    key = tuple(patterns)
+    if key not in _POLICIES:
+        _POLICIES[key] = PathPolicy(key)
+    return _POLICIES[key]
@@ -0,0 +1,193 @@
+import sys
+from importlib import import_module
+from importlib.util import find_spec
+
+# Built-in backends: extension -> "module:function".
+# Nothing is imported until a file with that extension is actually analyzed,
+# so pure-Python repos (and commands that never analyze) never load tree-sitter.
+BUILTIN_ANALYZERS = {
+    ".py": "grid.core.analyzer:analyze_python",
+    ".c": "grid.core.cpp_analyzer:analyze_cpp",
+    ".h": "grid.core.cpp_analyzer:analyze_cpp",
+    ".cpp": "grid.core.cpp_analyzer:analyze_cpp",
+    ".cc": "grid.core.cpp_analyzer:analyze_cpp",
+    ".cxx": "grid.core.cpp_analyzer:analyze_cpp",
+    ".hpp": "grid.core.cpp_analyzer:analyze_cpp",
+    ".hh": "grid.core.cpp_analyzer:analyze_cpp",
+}
+
+# Modules a built-in backend needs besides its own, checked with find_spec (never imported)
+BUILTIN_REQUIREMENTS = {
+    ".c": ("tree_sitter", "tree_sitter_c"),
+    ".h": ("tree_sitter", "tree_sitter_cpp"),
+    ".cpp": ("tree_sitter", "tree_sitter_cpp"),
+    ".cc": ("tree_sitter", "tree_sitter_cpp"),
+    ".cxx": ("tree_sitter", "tree_sitter_cpp"),
+    ".hpp": ("tree_sitter", "tree_sitter_cpp"),
+    ".hh": ("tree_sitter", "tree_sitter_cpp"),
+}
+
+# Third-party packages register more languages under this entry point group:
+#   [project.entry-points."grid.analyzers"]
+#   ".rs" = "grid_rust.analyzer:analyze_rust"
+# The function takes a file path and returns {"score": 1-10, "metrics": {...}}.
+# If its module defines is_available(ext), it is asked once the backend is loaded; until
+# then a plugin counts as available when its package is installed.
+ENTRY_POINT_GROUP = "grid.analyzers"
+
+_specs = dict(BUILTIN_ANALYZERS)
+_loaded = {}
+_identities = {}
+_plugins_loaded = False
+
+# register() calls, replayed in worker processes (spawn-mode workers start from a fresh import)
+_registered = {}
+
+def register(ext, backend):
+    """Registers a backend for an extension: a callable or a 'module:function' string."""
+    ext = ext.lower()
+    _specs[ext] = backend
+    _registered[ext] = backend
+    _loaded.pop(ext, None)
+    _identities.pop(ext, None)
+
+def registered():
+    """{ext: backend} for everything added with register(), to hand to restore() elsewhere."""
+    return dict(_registered)
+
+def restore(backends):
+    """Process pool initializer: replays another process's register() calls."""
+    for ext, backend in backends.items():
+        register(ext, backend)
+
+def handles(ext):
+    """True if some backend is registered for the extension (available or not)."""
+    ext = ext.lower()
+    if ext not in _specs:
+        _load_plugins()
+    return ext in _specs
+
+def _load_plugins():
+    """Reads the entry point group once per process. Plugins never override built-ins."""
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+
+    try:
+        from importlib.metadata import entry_points
+        try:
+            found = entry_points(group=ENTRY_POINT_GROUP)
+        except TypeError:
+            # Python < 3.10
+            found = entry_points().get(ENTRY_POINT_GROUP, [])
+    except Exception:
+        return
+
+    for ep in found:
+        _specs.setdefault(ep.name.lower(), ep)
+
+def _resolve(spec):
+    """Turns a registry spec (callable, 'module:function' or entry point) into a callable."""
+    if callable(spec):
+        return spec
+    if isinstance(spec, str):
+        module_name, _, attr = spec.partition(":")
+        return getattr(import_module(module_name), attr)
+    return spec.load()
+
+def _module_of(spec):
+    """Top-level package a spec lives in ('grid_rust.analyzer:analyze' -> 'grid_rust')."""
+    if isinstance(spec, str):
+        return spec.partition(":")[0].split(".")[0]
+    return spec.value.partition(":")[0].split(".")[0]
+
+def _installed(name):
+    try:
+        return find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def _version(spec, backend_module):
+    """A plugin's version: its distribution's (no import needed), else its module's __version__."""
+    dist = getattr(spec, "dist", None)
+    if dist is not None:
+        return dist.version
+    try:
+        return str(getattr(import_module(backend_module), "__version__", ""))
+    except Exception:
+        return ""
+
+def identity(ext):
+    """
+    Which backend produces an extension's results, for cache keys: '' for the built-ins
+    (ANALYZER_VERSION covers them), else 'module:function@version', so registering,
+    swapping or upgrading a plugin never serves results from the previous backend.
+    """
+    ext = ext.lower()
+    if ext in _identities:
+        return _identities[ext]
+    if ext not in _specs:
+        _load_plugins()
+    spec = _specs.get(ext)
+
+    if spec is None or spec == BUILTIN_ANALYZERS.get(ext):
+        name = ""
+    elif callable(spec):
+        module = getattr(spec, "__module__", None) or ""
+        version = getattr(sys.modules.get(module), "__version__", "")
+        name = f"{module}:{getattr(spec, '__qualname__', type(spec).__name__)}@{version}"
+    else:
+        target = spec if isinstance(spec, str) else spec.value
+        name = f"{target}@{_version(spec, target.partition(':')[0])}"
+    _identities[ext] = name
+    return name
+
+def get_analyzer(ext):
+    """
+    Returns the analyzer function for an extension, importing it on first use.
+    None if nothing handles the extension, or its module's is_available(ext) says no.
+    """
+    ext = ext.lower()
+    if ext in _loaded:
+        return _loaded[ext]
+
+    if ext not in _specs:
+        _load_plugins()
+    spec = _specs.get(ext)
+    if spec is None:
+        return None
+
+    try:
+        backend = _resolve(spec)
+        check = getattr(sys.modules.get(getattr(backend, "__module__", None)), "is_available", None)
+        if check and not check(ext):
+            backend = None
+    except Exception:
+        # A broken plugin shouldn't take the whole scan down
+        backend = None
+    _loaded[ext] = backend
+    return backend
+
+def is_available(ext):
+    """
+    True if the extension has a backend that can analyze it. Backends that aren't loaded
+    yet are judged by whether their modules are installed (find_spec, no import).
+    """
+    ext = ext.lower()
+    if ext in _loaded:
+        return _loaded[ext] is not None
+    if ext not in _specs:
+        _load_plugins()
+    spec = _specs.get(ext)
+    if spec is None:
+        return False
+    if callable(spec):
+        return True
+    modules = BUILTIN_REQUIREMENTS.get(ext, ()) + (_module_of(spec),)
+    return all(_installed(name) for name in modules)
+
+def available_extensions():
+    """All extensions with a usable backend (without importing any backend)."""
+    _load_plugins()
+    return tuple(ext for ext in list(_specs) if is_available(ext))
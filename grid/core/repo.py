@@ -0,0 +1,280 @@
+import os
+import subprocess
+from grid.core import config
+
+# Protected branch names, in order of preference for "home"
+HOME_BRANCHES = ("main", "master")
+
+# Which backend answers ref/config queries: "subprocess" (default), "pygit2", "dulwich" or "auto".
+# Picked from $GRID_GIT_BACKEND, then the .grid "git_backend" key.
+BACKEND_ENV = "GRID_GIT_BACKEND"
+
+def _git(args, cwd=None):
+    return subprocess.check_output(["git", *args], cwd=cwd, stderr=subprocess.DEVNULL).decode("utf-8", errors="replace")
+
+class SubprocessBackend:
+    """Answers queries by running git. Config is read once with a single 'git config --list'."""
+
+    name = "subprocess"
+
+    def __init__(self, path):
+        self.path = path
+        self._config = None
+
+    def head(self):
+        try:
+            return _git(["symbolic-ref", "-q", "HEAD"], self.path).strip()
+        except subprocess.CalledProcessError:
+            return _git(["rev-parse", "HEAD"], self.path).strip()
+
+    def refs(self, prefix):
+        raw = _git(["for-each-ref", "--format=%(refname)%00%(objectname)", prefix], self.path)
+        return dict(line.split("\0", 1) for line in raw.splitlines() if "\0" in line)
+
+    def config(self, key):
+        if self._config is None:
+            raw = _git(["config", "-z", "--list"], self.path)
+            # Records are "key\nvalue\0"; keys are case-insensitive except the middle part
+            self._config = {}
+            for record in raw.split("\0"):
+                if record:
+                    name, _, value = record.partition("\n")
+                    self._config[name] = value
+        return self._config.get(key)
+
+class Pygit2Backend:
+    """In-process via libgit2 (pip install pygit2)."""
+
+    name = "pygit2"
+
+    def __init__(self, path):
+        import pygit2
+        self.repo = pygit2.Repository(pygit2.discover_repository(os.path.abspath(path)))
+
+    def head(self):
+        target = self.repo.lookup_reference("HEAD").target
+        return target if isinstance(target, str) else str(target)
+
+    def refs(self, prefix):
+        found = {}
+        for name in self.repo.references:
+            if name.startswith(prefix):
+                found[name] = str(self.repo.references[name].resolve().target)
+        return found
+
+    def config(self, key):
+        try:
+            return self.repo.config[key]
+        except KeyError:
+            return None
+
+class DulwichBackend:
+    """In-process, pure Python (pip install dulwich)."""
+
+    name = "dulwich"
+
+    def __init__(self, path):
+        from dulwich.repo import Repo
+        self.repo = Repo.discover(path)
+        self._config = self.repo.get_config_stack()
+
+    def head(self):
+        value = self.repo.refs.read_ref(b"HEAD")
+        if value.startswith(b"ref: "):
+            return value[5:].strip().decode()
+        return value.strip().decode()
+
+    def refs(self, prefix):
+        wanted = prefix.encode()
+        return {
+            name.decode(): self.repo.refs[name].decode()
+            for name in self.repo.refs.allkeys() if name.startswith(wanted)
+        }
+
+    def config(self, key):
+        # "remote.origin.url" -> section (b"remote", b"origin"), name b"url"
+        parts = key.split(".")
+        section = tuple(part.encode() for part in parts[:-1])
+        if len(section) > 2:
+            section = (section[0], b".".join(section[1:]))
+        try:
+            return self._config.get(section, parts[-1].encode()).decode()
+        except KeyError:
+            return None
+
+BACKENDS = {"subprocess": SubprocessBackend, "pygit2": Pygit2Backend, "dulwich": DulwichBackend}
+
+def make_backend(path, name=None):
+    """Builds the requested backend; falls back to subprocess if it isn't installed."""
+    if name is None:
+        cfg = config.load_project_config() or {}
+        name = os.environ.get(BACKEND_ENV) or cfg.get("git_backend") or "subprocess"
+
+    candidates = ["pygit2", "dulwich"] if name == "auto" else [name]
+    for candidate in candidates:
+        if candidate in BACKENDS and candidate != "subprocess":
+            try:
+                return BACKENDS[candidate](path)
+            except Exception:
+                continue  # not installed, or can't open this repo
+    return SubprocessBackend(path)
+
+def find_git_dir(path="."):
+    """The repository's git dir, found by walking up (no git process). None outside a repo."""
+    current = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules: ".git" is a file saying "gitdir: <path>"
+            with open(dot_git) as f:
+                line = f.readline().strip()
+            if line.startswith("gitdir:"):
+                return os.path.normpath(os.path.join(current, line[7:].strip()))
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+class Repository:
+    """
+    One place for git queries. Answers are memoized for the life of the object
+    (one command invocation); call invalidate() after changing refs (checkout, branch -d).
+    HEAD is read straight from the git dir; everything else goes through the backend.
+    """
+
+    def __init__(self, path=".", backend=None):
+        self.path = path
+        self._backend = backend
+        self._memo = {}
+
+    def _cached(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = make_backend(self.path)
+        return self._backend
+
+    def invalidate(self):
+        self._memo.clear()
+
+    @property
+    def git_dir(self):
+        return self._cached("git_dir", lambda: find_git_dir(self.path))
+
+    @property
+    def is_repo(self):
+        return self.git_dir is not None
+
+    def toplevel(self):
+        """Root of the working tree (None outside a repo)."""
+        def compute():
+            try:
+                return _git(["rev-parse", "--show-toplevel"], self.path).strip()
+            except (OSError, subprocess.CalledProcessError):
+                return None
+        return self._cached("toplevel", compute)
+
+    def head(self):
+        """'refs/heads/<branch>', or a commit SHA when detached. None outside a repo."""
+        return self._cached("head", self._read_head)
+
+    def _read_head(self):
+        if not self.is_repo:
+            return None
+        try:
+            with open(os.path.join(self.git_dir, "HEAD")) as f:
+                value = f.read().strip()
+        except OSError:
+            value = ""
+
+        if value.startswith("ref: "):
+            ref = value[5:]
+            # reftable repos keep a placeholder here; ask git instead
+            if ref != "refs/heads/.invalid":
+                return ref
+        elif len(value) in (40, 64):
+            return value
+
+        try:
+            return self.backend.head()
+        except Exception:
+            return None
+
+    def current_branch(self):
+        """Active branch name ('' when detached, 'unknown' outside a repo)."""
+        head = self.head()
+        if head is None:
+            return "unknown"
+        return head[len("refs/heads/"):] if head.startswith("refs/heads/") else ""
+
+    def branches(self):
+        """Local branch names."""
+        def compute():
+            refs = self.backend.refs("refs/heads/") if self.is_repo else {}
+            return sorted(name[len("refs/heads/"):] for name in refs)
+        return self._cached("branches", compute)
+
+    def home_branch(self):
+        """'main' if it exists, else 'master'."""
+        branches = self.branches()
+        return next((name for name in HOME_BRANCHES if name in branches), HOME_BRANCHES[-1])
+
+    def merged_branches(self, target="HEAD", remote=None):
+        """
+        Branches fully merged into `target`, from one 'git for-each-ref --merged':
+        local ones, or with `remote` that remote's (names without the 'origin/' part).
+        """
+        prefix = f"refs/remotes/{remote}/" if remote else "refs/heads/"
+        def compute():
+            raw = _git(["for-each-ref", f"--merged={target}", "--format=%(refname)", prefix], self.path)
+            names = [line[len(prefix):] for line in raw.splitlines() if line.startswith(prefix)]
+            return [name for name in names if name != "HEAD"]
+        return self._cached(("merged", target, remote), compute)
+
+    def remote_home(self, remote="origin"):
+        """The remote's default branch as 'origin/main' (its HEAD, else main/master), or None."""
+        def compute():
+            try:
+                return _git(["symbolic-ref", "-q", "--short", f"refs/remotes/{remote}/HEAD"], self.path).strip()
+            except subprocess.CalledProcessError:
+                pass
+            refs = self.backend.refs(f"refs/remotes/{remote}/") if self.is_repo else {}
+            for name in HOME_BRANCHES:
+                if f"refs/remotes/{remote}/{name}" in refs:
+                    return f"{remote}/{name}"
+            return None
+        return self._cached(("remote_home", remote), compute)
+
+    def config(self, key):
+        """A git config value, or None."""
+        return self._cached(("config", key), lambda: self.backend.config(key) if self.is_repo else None)
+
+    def remote_url(self, name="origin"):
+        return self.config(f"remote.{name}.url")
+
+    def web_url(self, name="origin"):
+        """Remote URL as a browsable https link (git@github.com:User/Repo.git -> https://github.com/User/Repo)."""
+        url = self.remote_url(name)
+        if not url:
+            return None
+        if url.startswith("git@"):
+            url = url.replace(":", "/").replace("git@", "https://")
+        if url.endswith(".git"):
+            url = url[:-4]
+        return url
+
+# Shared per working directory, so every command in this process sees one cache
+_REPOS = {}
+
+def current():
+    """The Repository for the current directory."""
+    cwd = os.getcwd()
+    if cwd not in _REPOS:
+        _REPOS[cwd] = Repository(cwd)
+    return _REPOS[cwd]
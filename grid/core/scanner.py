@@ -0,0 +1,183 @@
+import os
+import pickle
+import subprocess
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from grid.core import analyzer, cache, registry
+
+# Folders that never contain code worth analyzing
+SKIP_DIRS = [".git", "__pycache__", "venv", "node_modules", ".grid", ".grid_cache", "dist", "build"]
+
+# Below this many files, spinning up worker processes costs more than it saves
+SERIAL_THRESHOLD = 64
+
+# Files shipped to a worker per round-trip (amortizes pickling + IPC)
+BATCH_SIZE = 32
+
+def _git_paths(args):
+    """Runs a NUL-separated git listing and returns the paths, or None if git failed."""
+    try:
+        raw = subprocess.check_output(["git", args[0], "-z"] + args[1:], stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [p for p in raw.decode("utf-8", errors="replace").split("\0") if p]
+
+def _changed_since(ref):
+    """Files changed between the merge-base with `ref` and the working tree."""
+    try:
+        base = subprocess.check_output(
+            ["git", "merge-base", ref, "HEAD"], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        base = ref
+    return _git_paths(["diff", "--relative", "--name-only", "--diff-filter=ACMR", base, "--"])
+
+def _walk(root):
+    """Fallback for folders that aren't git repos."""
+    paths = []
+    for current, dirs, files in os.walk(root):
+        # Prune garbage folders so we never descend into them
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for file in files:
+            paths.append(os.path.join(current, file))
+    return paths
+
+def collect_files(root=".", extensions=None, since=None, staged=False):
+    """
+    Returns the source files worth analyzing (any extension the analyzer supports).
+    - since:  only files changed since the merge-base with this git ref
+    - staged: only files in the index
+    Otherwise every tracked + untracked-but-not-ignored file ('git ls-files'),
+    falling back to a directory walk outside git repos.
+    Returns None if a git selection was requested but git failed (bad ref, no repo).
+    """
+    if since:
+        paths = _changed_since(since)
+    elif staged:
+        paths = _git_paths(["diff", "--cached", "--relative", "--name-only", "--diff-filter=ACMR"])
+    else:
+        paths = _git_paths(["ls-files", "--cached", "--others", "--exclude-standard"])
+        if paths is None:
+            paths = _walk(root)
+
+    if paths is None:
+        return None
+
+    extensions = tuple(extensions or analyzer.supported_extensions())
+
+    # ls-files still lists tracked files that were deleted from disk
+    return [
+        p for p in paths
+        if p.endswith(extensions) and os.path.isfile(p)
+    ]
+
+def resolve_jobs(jobs, file_count):
+    """
+    Decides how many worker processes a scan deserves.
+    None means 'one per CPU'. Tiny projects always run serially.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or file_count < SERIAL_THRESHOLD:
+        return 1
+
+    # No point starting workers that would never receive a batch
+    batches = -(-file_count // BATCH_SIZE)
+    return min(jobs, batches)
+
+def _analyze_one(path, max_bytes=analyzer.MAX_FILE_BYTES):
+    """Analyzes a single file. Returns None if the file could not be read."""
+    try:
+        return analyzer.analyze_file(path, max_bytes=max_bytes)
+    except Exception:
+        return None
+
+def _analyze_batch(paths, max_bytes=analyzer.MAX_FILE_BYTES):
+    """Worker entry point: analyzes a whole batch in one round-trip."""
+    return [_analyze_one(path, max_bytes) for path in paths]
+
+def cache_key(path):
+    """Content-addressed cache key: analyzer version + extension + backend + git blob SHA."""
+    with open(path, "rb") as f:
+        data = f.read()
+    ext = os.path.splitext(path)[1]
+    return f"{analyzer.ANALYZER_VERSION}:{ext}:{registry.identity(ext)}:{cache.blob_sha(data)}"
+
+def _picklable(value):
+    try:
+        pickle.dumps(value)
+        return True
+    except Exception:
+        return False
+
+def _analyze_all(paths, jobs, max_bytes):
+    """Analyzes files, fanning out to a process pool when it pays off."""
+    workers = resolve_jobs(jobs, len(paths))
+    registered = registry.registered()
+    if workers > 1 and not _picklable(registered):
+        workers = 1  # e.g. a lambda passed to register(): only this process can run it
+
+    # 1. Serial Mode (small repos or --jobs 1)
+    if workers == 1:
+        for path in paths:
+            yield path, _analyze_one(path, max_bytes)
+        return
+
+    # 2. Parallel Mode
+    # executor.map preserves submission order, so batches come back in order
+    batches = [paths[i:i + BATCH_SIZE] for i in range(0, len(paths), BATCH_SIZE)]
+    # Workers don't inherit register() calls under spawn (Windows, macOS): replay them
+    with ProcessPoolExecutor(max_workers=workers, initializer=registry.restore,
+                             initargs=(registered,)) as pool:
+        for batch, results in zip(batches, pool.map(partial(_analyze_batch, max_bytes=max_bytes), batches)):
+            yield from zip(batch, results)
+
+def scan_files(paths, jobs=None, store=None, max_bytes=analyzer.MAX_FILE_BYTES):
+    """
+    Analyzes files, serving unchanged ones from `store` (a cache.Store) if given.
+    Yields (path, stats) tuples in the same order as `paths`.
+    stats is None for files that could not be analyzed, and
+    {"score": None, "skipped": reason} for oversized or binary files.
+    """
+    if store is None:
+        yield from _analyze_all(paths, jobs, max_bytes)
+        return
+
+    # 1. Gate oversized/binary files before hashing reads them into memory
+    skipped = {}
+    keys = {}
+    for path in paths:
+        try:
+            reason = analyzer.precheck(path, max_bytes)
+            if reason:
+                skipped[path] = {"score": None, "skipped": reason}
+                continue
+            keys[path] = cache_key(path)
+        except (OSError, ValueError):
+            keys[path] = None
+
+    # 2. Fingerprint everything and pull known results in one query
+    known = store.get_many(k for k in keys.values() if k)
+
+    # 3. Only the misses go to the analyzers
+    misses = [p for p in paths if p in keys and keys[p] not in known]
+    fresh = _analyze_all(misses, jobs, max_bytes)
+    computed = {}
+
+    try:
+        for path in paths:
+            if path in skipped:
+                yield path, skipped[path]
+                continue
+
+            key = keys[path]
+            if key in known:
+                yield path, known[key]
+                continue
+
+            _, stats = next(fresh)
+            if key and stats is not None and not stats.get("skipped"):
+                computed[key] = stats
+            yield path, stats
+    finally:
+        store.put_many(computed)
@@ -137,7 +137,7 @@ def launch():
             # --- GRID SHORTCUTS ---
             grid_keywords = [
                 "auth", "init", "dev", "status", "branch", "push", "home", 
-                "purge", "roast", "rank", "blame", "docker", "tree", "recap"
+                "purge", "roast", "rank", "blame", "docker", "tree", "recap", "audit", "hooks"
             ]
             
             if cmd in grid_keywords:
@@ -0,0 +1,122 @@
+import json
+import subprocess
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Slowest individual calls kept for the report
+TOP_CALLS = 10
+
+# Entry points timed as "subprocess" (only the outermost one counts: run() calls Popen + communicate)
+_SUBPROCESS_FUNCS = ("run", "call", "check_call", "check_output")
+_POPEN_METHODS = ("__init__", "communicate", "wait")
+
+def _describe(args):
+    """Short label for a command line or URL."""
+    if isinstance(args, (list, tuple)):
+        return " ".join(str(a) for a in args[:3])
+    return str(args)[:60]
+
+class Profiler:
+    """
+    Splits a command into named phases and, within each phase, measures time spent
+    waiting on child processes and on HTTP (requests) separately from Python time.
+    Only calls made on the profiling thread are counted (background threads are ignored).
+    Streaming pipes (e.g. 'git cat-file --batch') count as subprocess only while spawning
+    and waiting, so their read time shows up as Python time.
+    """
+
+    def __init__(self):
+        self.phases = []
+        self.calls = []
+        self.started = time.perf_counter()
+        self._current = None
+        self._thread = threading.current_thread()
+        self._depth = 0
+
+    @contextmanager
+    def phase(self, name):
+        record = {"name": name, "seconds": 0.0, "subprocess": 0.0, "network": 0.0, "calls": 0}
+        previous, self._current = self._current, record
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - started
+            self.phases.append(record)
+            self._current = previous
+
+    def _wrap(self, func, kind):
+        profiler = self
+
+        def timed(*args, **kwargs):
+            # Nested calls (check_output -> run -> Popen) and other threads pass straight through
+            if profiler._depth or threading.current_thread() is not profiler._thread:
+                return func(*args, **kwargs)
+            profiler._depth += 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                profiler._depth -= 1
+                profiler._record(kind, elapsed, args, kwargs)
+        return timed
+
+    def _record(self, kind, elapsed, args, kwargs):
+        target = kwargs.get("args") or kwargs.get("url") or (args[0] if args else "")
+        if kind == "network" and len(args) >= 3:
+            target = args[2]  # Session.request(self, method, url)
+        elif kind == "subprocess" and hasattr(target, "args"):
+            target = target.args  # Popen.wait(self) / communicate(self)
+        if self._current is not None:
+            self._current[kind] += elapsed
+            self._current["calls"] += 1
+        self.calls.append({
+            "kind": kind,
+            "phase": self._current["name"] if self._current else None,
+            "target": _describe(target),
+            "seconds": elapsed,
+        })
+
+    @contextmanager
+    def installed(self):
+        """Patches subprocess and requests for the duration of the block."""
+        patches = [(subprocess, name, "subprocess") for name in _SUBPROCESS_FUNCS]
+        patches += [(subprocess.Popen, name, "subprocess") for name in _POPEN_METHODS]
+        try:
+            import requests
+            patches.append((requests.Session, "request", "network"))
+        except ImportError:
+            pass
+
+        originals = [(owner, name, getattr(owner, name)) for owner, name, _ in patches]
+        for owner, name, kind in patches:
+            setattr(owner, name, self._wrap(getattr(owner, name), kind))
+        try:
+            yield self
+        finally:
+            for owner, name, original in originals:
+                setattr(owner, name, original)
+
+    def report(self):
+        """JSON-able summary."""
+        total = time.perf_counter() - self.started
+        return {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_seconds": total,
+            "phases": [
+                dict(record, python=max(record["seconds"] - record["subprocess"] - record["network"], 0.0))
+                for record in self.phases
+            ],
+            "slowest_calls": sorted(self.calls, key=lambda c: c["seconds"], reverse=True)[:TOP_CALLS],
+        }
+
+    def append_json(self, path, **extra):
+        """Appends the report as one JSON line (one line per run, easy to chart over time)."""
+        with open(path, "a") as f:
+            f.write(json.dumps(dict(self.report(), **extra)) + "\n")
+
+def phase(profiler, name):
+    """profiler.phase(name), or a no-op when profiling is off."""
+    return profiler.phase(name) if profiler else nullcontext()
@@ -1,5 +1,6 @@
 from rich.console import Console
 from rich.panel import Panel
+from rich.prompt import Confirm
 from rich.text import Text
 
 console = Console()
@@ -44,3 +45,9 @@ def print_panel(content, title=None, style="cyan"):
     """Prints content inside a stylized box."""
     console.print(Panel(content, title=title, border_style=style, padding=(1, 2)))
 
+def confirm(question, default=False):
+    """Yes/no prompt. Without a terminal to ask (EOF), the answer is `default`."""
+    try:
+        return Confirm.ask(f"[bold yellow]❓ {question}[/]", default=default, console=console)
+    except EOFError:
+        return default
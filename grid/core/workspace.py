@@ -0,0 +1,78 @@
+import os
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# How deep to look for repositories under a workspace folder
+MAX_DEPTH = 3
+
+# Concurrent 'git log' processes (they are I/O bound, so threads are enough)
+DEFAULT_JOBS = 8
+
+# Folders never worth descending into
+SKIP_DIRS = {"node_modules", "venv", ".venv", "__pycache__", "build", "dist", "target"}
+
+# One field per commit, NUL-separated; commits end with a record separator
+LOG_FORMAT = "%H%x00%ct%x00%an%x00%s%x1e"
+
+Commit = namedtuple("Commit", "repo sha timestamp author subject")
+
+def discover(root, max_depth=MAX_DEPTH):
+    """Git repositories under `root` (not descending into a repo once found), sorted by path."""
+    found = []
+
+    def walk(path, depth):
+        if os.path.exists(os.path.join(path, ".git")):
+            found.append(path)
+            return
+        if depth >= max_depth:
+            return
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(".") and entry.name not in SKIP_DIRS:
+                walk(entry.path, depth + 1)
+
+    walk(os.path.abspath(root), 0)
+    return sorted(found)
+
+def parse_log(raw, repo_name):
+    """Commits from 'git log --format=LOG_FORMAT' output."""
+    commits = []
+    for record in raw.split("\x1e"):
+        fields = record.strip("\n").split("\0")
+        if len(fields) != 4:
+            continue
+        sha, timestamp, author, subject = fields
+        commits.append(Commit(repo_name, sha, int(timestamp), author, subject))
+    return commits
+
+def recent_commits(path, author=None, since="24.hours", name=None):
+    """Commits on one repository's current branch, or [] if git fails."""
+    cmd = ["git", "-C", path, "log", f"--since={since}", f"--format={LOG_FORMAT}"]
+    if author:
+        cmd.insert(4, f"--author={author}")
+    try:
+        raw = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode("utf-8", errors="replace")
+    except (OSError, subprocess.CalledProcessError):
+        return []
+    return parse_log(raw, name or os.path.basename(os.path.abspath(path)))
+
+def collect(repos, author=None, since="24.hours", jobs=None, root=None):
+    """
+    Runs recent_commits over many repositories on a bounded thread pool and merges
+    the results into one list, oldest first. Repos are named by their path under `root`.
+    """
+    if not repos:
+        return []
+
+    def query(path):
+        name = os.path.relpath(path, root) if root else None
+        return recent_commits(path, author, since, name=name)
+
+    with ThreadPoolExecutor(max_workers=min(jobs or DEFAULT_JOBS, len(repos))) as pool:
+        # git log lists newest first; flip each repo so equal timestamps keep commit order
+        commits = [commit for batch in pool.map(query, repos) for commit in reversed(batch)]
+    return sorted(commits, key=lambda c: c.timestamp)
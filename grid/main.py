@@ -16,6 +16,8 @@ from grid.commands import branch as cmd_branch
 from grid.commands import tree as cmd_tree
 from grid.commands import rank as cmd_rank
 from grid.commands import update as cmd_update
+from grid.commands import audit as cmd_audit
+from grid.commands import hooks as cmd_hooks
 
 console = Console()
 
@@ -42,22 +44,66 @@ def dev(repo_url, dev_name):
 
 @main.command()
 @click.argument('message', required=False)
-def push(message):
+@click.option('--diff-only', is_flag=True, help='Only scan the lines this commit adds')
+@click.option('--timings', is_flag=True, help='Print how long each phase took (git, network, Python)')
+@click.option('--timings-json', metavar='PATH', help='Append the phase timings to PATH as a JSON line')
+def push(message, diff_only, timings, timings_json):
     """Safe Push. Auto-stages, Checks Secrets, Handles Cowboy Mode."""
-    cmd_push.run(message)
+    cmd_push.run(message, diff_only=diff_only, timings=timings, timings_json=timings_json)
 
 @main.command()
 @click.argument('target', required=False)
 @click.option('--share', '-s', is_flag=True, help='Broadcast to Team')
 @click.option('-dev', '--developer', help='Roast a colleague')
-def roast(target, share, developer):
+@click.option('--jobs', '-j', type=click.IntRange(min=1), help='Worker processes for project scans (default: all CPUs)')
+@click.option('--no-cache', is_flag=True, help='Re-analyze every file, ignoring .grid_cache')
+@click.option('--since', metavar='REF', help='Only files changed since this git ref (e.g. origin/main)')
+@click.option('--staged', is_flag=True, help='Only files currently staged')
+@click.option('--live', is_flag=True, help='Stream results and running totals while scanning')
+@click.option('--top', type=click.IntRange(min=1), help='Only keep the N worst files for the report')
+@click.option('--max-size', type=click.IntRange(min=1), metavar='KB', help='Skip files larger than this (default: 1024 KB)')
+@click.option('--history', type=click.IntRange(min=1), is_flag=False, flag_value=20, metavar='[N]',
+              help='Score trend over the last N commits (default: 20)')
+def roast(target, share, developer, jobs, no_cache, since, staged, live, top, max_size, history):
     """Analyzes code or roasts a colleague."""
     if developer:
         cmd_roast.roast_developer(developer, recent=True, share=share)
+    elif history:
+        cmd_roast.roast_history(history, jobs=jobs, max_kb=max_size)
     elif target:
-        cmd_roast.roast_file(target)
+        cmd_roast.roast_file(target, max_kb=max_size)
     else:
-        cmd_roast.roast_project()
+        cmd_roast.roast_project(jobs=jobs, use_cache=not no_cache, since=since, staged=staged,
+                                live=live, top=top, max_kb=max_size)
+
+@main.command()
+@click.option('--jobs', '-j', type=click.IntRange(min=1), help='Worker processes (default: all CPUs)')
+@click.option('--restart', is_flag=True, help='Discard the saved checkpoint and scan everything again')
+def audit(jobs, restart):
+    """Scans the entire git history for secrets. Resumes if interrupted."""
+    cmd_audit.run(jobs=jobs, restart=restart)
+
+@main.command()
+@click.argument('action', type=click.Choice(['install', 'uninstall', 'status', 'serve', 'stop', 'run']))
+@click.argument('hook', required=False, type=click.Choice(['pre-commit', 'pre-push']))
+@click.option('--force', is_flag=True, help='Replace existing hooks that Grid did not write')
+def hooks(action, hook, force):
+    """
+    Git hooks that block secrets on commit and push.
+    Actions: install, uninstall, status, serve (warm worker), stop, run <hook>
+    """
+    if action == 'install':
+        cmd_hooks.install(force)
+    elif action == 'uninstall':
+        cmd_hooks.uninstall()
+    elif action == 'status':
+        cmd_hooks.status()
+    elif action == 'serve':
+        cmd_hooks.serve()
+    elif action == 'stop':
+        cmd_hooks.stop()
+    elif action == 'run':
+        cmd_hooks.run(hook or 'pre-commit')
 
 @main.command()
 def init():
@@ -89,21 +135,27 @@ def status():
 
 @main.command()
 @click.argument('target')
-@click.argument('line')
+@click.argument('line', required=False)
 @click.option('--share', '-s', is_flag=True)
 def blame(target, line, share):
-    """Finds out who wrote a specific line."""
+    """Finds out who wrote a line, a range (10-80) or a whole file."""
     cmd_blame.run(target, line, share)
 
 @main.command()
-def purge():
-    """Deletes merged local branches."""
-    cmd_purge.run()
+@click.option('--remote', is_flag=True, help='Delete merged cowboy/* branches on origin instead of local ones')
+@click.option('--pattern', default=cmd_purge.REMOTE_PATTERN, show_default=True, help='Remote branches to consider (glob)')
+@click.option('--yes', '-y', is_flag=True, help="Don't ask before deleting remote branches")
+@click.option('--dry-run', '-n', is_flag=True, help='Only list what would be deleted')
+def purge(remote, pattern, yes, dry_run):
+    """Deletes merged branches (local, or cowboy/* on origin with --remote)."""
+    cmd_purge.run(remote=remote, dry_run=dry_run, pattern=pattern, yes=yes)
 
 @main.command()
-def recap():
+@click.option('--workspace', '-w', type=click.Path(exists=True, file_okay=False), help='Recap every git repo under this folder')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), help='Repos queried at once (default: 8)')
+def recap(workspace, jobs):
     """Generates daily standup report."""
-    cmd_recap.run()
+    cmd_recap.run(workspace=workspace, jobs=jobs)
 
 @main.command()
 @click.option('--clean', is_flag=True, help='Delete the branch you just left')
@@ -137,9 +189,12 @@ def tree():
     cmd_tree.run()
 
 @main.command()
-def rank():
+@click.option('--refresh', is_flag=True, help='Fetch origin now instead of using cached refs')
+@click.option('--offline', is_flag=True, help='Never touch the network')
+@click.option('--history', is_flag=True, help='Also count cowboy branches since merged or deleted')
+def rank(refresh, offline, history):
     """Shows the Cowboy Leaderboard."""
-    cmd_rank.run()
+    cmd_rank.run(refresh=refresh, offline=offline, history=history)
 
 @main.command()
 @click.argument('name')
@@ -164,11 +219,16 @@ def cloud_sync():
 if __name__ == '__main__':
     import sys
     import os
+    import multiprocessing
+
+    # Frozen (.exe) builds need this so 'grid roast' worker processes boot correctly
+    multiprocessing.freeze_support()
     
     # --- CONTEXT MENU FIX ---
     # Check if the program was launched with a folder path argument
     # (This happens when you Right Click -> Open Grid Here)
-    if len(sys.argv) > 1 and os.path.isdir(sys.argv[1]):
+    # (A folder named like a subcommand, e.g. 'hooks/', is still the subcommand)
+    if len(sys.argv) > 1 and sys.argv[1] not in main.commands and os.path.isdir(sys.argv[1]):
         target_dir = sys.argv[1]
         
         # 1. Change the working directory to that folder
@@ -3,15 +3,20 @@ from setuptools import setup, find_packages
 setup(
     name='grid-cli',
     version='1.0.0',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks']),
     include_package_data=True,
     install_requires=[
         'click',
         'rich',
         'requests',
         'praw',
-        # 'tree-sitter', # Uncomment if/when you use C++ support
     ],
+    extras_require={
+        # C/C++ analysis for 'grid roast'
+        'cpp': ['tree-sitter', 'tree-sitter-c', 'tree-sitter-cpp'],
+        # Vectorized entropy scoring for the secret scanner
+        'fast': ['numpy'],
+    },
     entry_points={
         'console_scripts': [
             # TARGET: module 'grid.main', function 'run_cli'
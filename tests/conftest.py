@@ -0,0 +1,20 @@
+# Shared fixtures
+import subprocess
+import pytest
+
+def _git(*args):
+    return subprocess.run(["git", *args], check=True, capture_output=True).stdout.decode().strip()
+
+@pytest.fixture
+def git():
+    """Runs git in the current directory and returns its stdout."""
+    return _git
+
+@pytest.fixture
+def tmp_repo(tmp_path, monkeypatch):
+    """An empty git repo (on 'main') in tmp_path, which is also the working directory."""
+    monkeypatch.chdir(tmp_path)
+    _git("init", "-q", "-b", "main")
+    _git("config", "user.email", "grid@test")
+    _git("config", "user.name", "grid")
+    return tmp_path
@@ -0,0 +1,162 @@
+# Tests for the code health analyzers
+import ast
+import pytest
+from grid.core import analyzer
+
+def _metrics(source):
+    return analyzer.PythonSentinel().visit(ast.parse(source))
+
+def test_nesting_tracks_real_depth():
+    source = (
+        "for a in x:\n"
+        "    pass\n"
+        "for b in y:\n"
+        "    if b:\n"
+        "        while b:\n"
+        "            b -= 1\n"
+        "    elif a:\n"
+        "        pass\n"
+    )
+    assert _metrics(source)["max_nesting"] == 3
+
+def test_function_metrics():
+    source = (
+        "def f(a, b, *, c, d=1):\n"
+        "    if a and b or c:\n"
+        "        return [i for i in d if i]\n"
+        "    print(a)\n"
+    )
+    stats = _metrics(source)
+    assert stats["max_args"] == 4
+    assert stats["max_complexity"] == 1 + 1 + 2 + 2
+    assert stats["print_statements"] == 1
+
+def test_self_and_cls_are_not_counted_as_args():
+    source = (
+        "class A:\n"
+        "    def method(self, a, b, c):\n"
+        "        return a\n"
+        "    @classmethod\n"
+        "    def build(cls, a, b, c):\n"
+        "        return cls()\n"
+    )
+    stats = _metrics(source)
+    assert stats["max_args"] == 3
+    assert analyzer.calculate_score(stats) == 10
+
+def test_deeply_nested_code_does_not_blow_the_stack():
+    # A giant nested literal, like generated protobuf/config output
+    tree = ast.parse("x = 0")
+    for _ in range(20_000):
+        tree.body[0].value = ast.List(elts=[tree.body[0].value], ctx=ast.Load())
+    stats = analyzer.PythonSentinel().visit(tree)
+    assert stats["max_nesting"] == 0
+
+def test_cpp_metrics(tmp_path):
+    pytest.importorskip("tree_sitter_cpp")
+    source = tmp_path / "main.cpp"
+    source.write_text(
+        "int counter = 0;\n"
+        "const int LIMIT = 3;\n"
+        "int main(int argc, char **argv) {\n"
+        "    for (int i = 0; i < argc; i++) {\n"
+        "        if (argv && i) { std::cout << i; }\n"
+        "        else if (i) { printf(\"x\"); }\n"
+        "    }\n"
+        "    return 0;\n"
+        "}\n"
+    )
+    result = analyzer.analyze_file(str(source))
+    stats = result["metrics"]
+    assert stats["max_nesting"] == 2
+    assert stats["max_args"] == 2
+    assert stats["max_complexity"] == 1 + 1 + 2 + 1
+    assert stats["globals"] == 1
+    assert stats["print_statements"] == 2
+    assert result["score"] == analyzer.calculate_score(stats)
+
+def test_cpp_prototypes_are_not_globals(tmp_path):
+    pytest.importorskip("tree_sitter_cpp")
+    header = tmp_path / "api.h"
+    header.write_text(
+        "int *make(int);\n"
+        "char *dup(const char*);\n"
+        "int &at(int i);\n"
+        "int (*handler)(int);\n"
+        "int state;\n"
+    )
+    stats = analyzer.analyze_file(str(header))["metrics"]
+    assert stats["globals"] == 2  # the function pointer and 'state'
+
+def test_registry_loads_backends_lazily():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys; from grid.core import analyzer; "
+        "assert 'tree_sitter' not in sys.modules; "
+        "assert 'grid.core.cpp_analyzer' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    # Listing supported extensions and analyzing Python never imports the C/C++ backend
+    code = (
+        "import sys, importlib.util; from grid.core import analyzer; "
+        "exts = analyzer.supported_extensions(); "
+        "assert ('.c' in exts) == bool(importlib.util.find_spec('tree_sitter_c')), exts; "
+        "analyzer.analyze_file(analyzer.__file__); "
+        "assert 'tree_sitter' not in sys.modules; "
+        "assert 'grid.core.cpp_analyzer' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+@pytest.fixture
+def clean_registry(monkeypatch):
+    """Lets a test register backends without leaking them into the rest of the run."""
+    from grid.core import registry
+
+    for name in ("_specs", "_loaded", "_identities", "_registered"):
+        monkeypatch.setattr(registry, name, dict(getattr(registry, name)))
+    return registry
+
+def fixed_score(path):
+    return {"score": 9, "metrics": {}}
+
+def test_registry_accepts_custom_backends(tmp_path, clean_registry):
+    from grid.core import scanner
+
+    source = tmp_path / "thing.gridtest"
+    source.write_text("whatever")
+    before = scanner.cache_key(str(source))
+
+    clean_registry.register(".gridtest", lambda path: {"score": 9, "metrics": {}})
+    assert analyzer.analyze_file(str(source))["score"] == 9
+    assert ".gridtest" in analyzer.supported_extensions()
+    # Results cached from whatever handled the file before are not reused
+    assert scanner.cache_key(str(source)) != before
+
+def test_registered_backends_reach_spawned_workers(tmp_path, clean_registry, monkeypatch):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    from grid.core import scanner
+
+    clean_registry.register(".gridtest", f"{__name__}:fixed_score")
+    paths = []
+    for i in range(scanner.SERIAL_THRESHOLD):
+        (tmp_path / f"f{i}.gridtest").write_text("x")
+        paths.append(str(tmp_path / f"f{i}.gridtest"))
+
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(scanner, "ProcessPoolExecutor", partial(ProcessPoolExecutor, mp_context=spawn))
+    assert {stats["score"] for _, stats in scanner.scan_files(paths, jobs=2)} == {9}
+
+def test_oversized_and_binary_files_are_skipped(tmp_path):
+    big = tmp_path / "big.py"
+    big.write_text("x = 1\n" * 1000)
+    blob = tmp_path / "blob.py"
+    blob.write_bytes(b"x = 1\n\x00\x01\x02")
+
+    assert analyzer.analyze_file(str(big), max_bytes=1024) == {"score": None, "skipped": "too large"}
+    assert analyzer.analyze_file(str(blob))["skipped"] == "binary"
+    assert analyzer.analyze_file(str(big))["score"] == 10
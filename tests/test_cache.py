@@ -0,0 +1,29 @@
+# Tests for the local analysis cache
+import os
+import time
+from grid.core import cache, scanner
+
+def test_unchanged_files_are_served_from_cache(tmp_path):
+    os.chdir(tmp_path)
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("y = 2\n")
+    paths = ["a.py", "b.py"]
+
+    with cache.Store("analysis") as store:
+        first = list(scanner.scan_files(paths, jobs=1, store=store))
+    assert (store.hits, store.misses) == (0, 2)
+
+    (tmp_path / "b.py").write_text("y = 3\n")
+    with cache.Store("analysis") as store:
+        second = list(scanner.scan_files(paths, jobs=1, store=store))
+    assert (store.hits, store.misses) == (1, 1)
+    assert second == first
+
+def test_store_evicts_least_recently_used(tmp_path):
+    with cache.Store("lru", max_entries=2, root=str(tmp_path)) as store:
+        for key in ["old", "mid", "new"]:
+            store.put(key, {"key": key})
+            time.sleep(0.01)
+        store.get("old")
+        store.evict()
+        assert store.get_many(["old", "mid", "new"]).keys() == {"old", "new"}
@@ -0,0 +1,418 @@
+# Tests for the secret scanner
+import os
+import subprocess
+import pytest
+from grid.core import git_police
+
+FAKE_KEY = "ghp_" + "A1b2C3d4E5" * 3 + "F6g7H8"
+
+def test_scan_flags_banned_files_and_leaked_keys(tmp_repo, git):
+    (tmp_repo / "clean.py").write_text("x = 1\n")
+    (tmp_repo / "leak.py").write_text(f'TOKEN = "{FAKE_KEY}"\n')
+    (tmp_repo / "copy.py").write_text(f'TOKEN = "{FAKE_KEY}"\n')
+    (tmp_repo / "prod.env").write_text("A=1\n")
+    git("add", ".")
+
+    leaks = git_police.scan_for_secrets()
+    assert sorted(leaks) == ["copy.py", "leak.py", "prod.env"]
+
+def test_scan_with_nothing_staged(tmp_repo):
+    assert git_police.scan_for_secrets() == []
+
+def test_matcher_reports_pattern_ids_and_offsets():
+    rules = git_police.SECRET_RULES + [("acme-token", None, r"acme_[0-9a-f]{8}")]
+    secrets = git_police.matcher.SecretMatcher(rules)
+
+    data = b"x = 1\nkey = '" + FAKE_KEY.encode() + b"'\nother = 'acme_deadbeef'\n"
+    hits = secrets.scan(data, path="conf.py")
+
+    assert [(h.pattern_id, h.offset) for h in hits] == [
+        ("github-token", data.index(b"ghp_")),
+        ("acme-token", data.index(b"acme_")),
+    ]
+    assert secrets.scan(b"nothing to see here") == []
+
+def test_project_patterns_from_config(tmp_repo, git):
+    (tmp_repo / "a.py").write_text("TOKEN = 'acme_deadbeef'\n")
+    git("add", ".")
+
+    cfg = {"secret_patterns": {"acme-token": "acme_[0-9a-f]{8}"}}
+    findings = git_police.scan_staged(cfg=cfg)
+    assert [(f.path, f.pattern_id, f.offset) for f in findings] == [("a.py", "acme-token", 9)]
+
+def test_diff_only_scan_reports_added_lines(tmp_repo, git):
+    fixture = tmp_repo / "fixture.py"
+    fixture.write_text("".join(f"row_{i} = {i}\n" for i in range(500)))
+    (tmp_repo / "blob.bin").write_bytes(b"\x00\x01" + FAKE_KEY.encode())
+    git("add", ".")
+    git("commit", "-qm", "base")
+
+    lines = fixture.read_text().splitlines()
+    lines[299] = f'row_299 = "{FAKE_KEY}"'
+    fixture.write_text("\n".join(lines) + "\n")
+    (tmp_repo / "blob.bin").write_bytes(b"\x00\x02" + FAKE_KEY.encode())
+    git("add", ".")
+
+    findings = git_police.scan_staged(diff_only=True)
+    assert sorted((f.path, f.line, f.pattern_id) for f in findings) == [
+        ("blob.bin", 1, "github-token"),
+        ("fixture.py", 300, "github-token"),
+    ]
+    assert [f.line for f in git_police.scan_staged() if f.path == "fixture.py"] == [300]
+
+def test_diff_only_scan_fails_closed(tmp_repo, git, monkeypatch):
+    git("config", "diff.noprefix", "true")
+    (tmp_repo / "notes.md").write_text("intro\n")
+    git("add", ".")
+    git("commit", "-qm", "base")
+
+    # An added line reading "++ x" shows up as "+++ x" and must not switch files
+    (tmp_repo / "notes.md").write_text(f"intro\n++ x\n{FAKE_KEY}\n")
+    git("add", ".")
+    assert [(f.path, f.line) for f in git_police.scan_staged(diff_only=True)] == [("notes.md", 3)]
+
+    # Paths the diff never shows (here: git can't run at all) are read in full
+    monkeypatch.setattr(git_police, "iter_added_lines", lambda *args, **kwargs: iter(()))
+    assert [(f.path, f.line) for f in git_police.scan_staged(diff_only=True)] == [("notes.md", 3)]
+
+def test_audit_finds_deleted_secrets_and_resumes(tmp_repo, git):
+    from grid.core import audit
+
+    (tmp_repo / "leak.py").write_text(f'x = 1\nTOKEN = "{FAKE_KEY}"\n')
+    (tmp_repo / "prod.env").write_text("A=1\n")
+    git("add", ".")
+    git("commit", "-qm", "oops")
+    git("rm", "-q", "leak.py", "prod.env")
+    git("commit", "-qm", "cleanup")
+
+    rules = git_police.secret_rules()
+    fingerprint = git_police.build_matcher().fingerprint
+    log = audit.AuditLog(fingerprint, root=str(tmp_repo / "cache"))
+    total, scanned = audit.run(log, rules, git_police.SENSITIVE_FILES, jobs=1)
+    found = sorted((path, pattern_id, line) for path, pattern_id, _, line, _ in log.findings())
+    log.close()
+
+    assert (total, scanned) == (2, 2)
+    assert found == [("leak.py", "github-token", 2), ("prod.env", "banned-file", None)]
+
+    # Second run picks up the checkpoint and reads nothing
+    log = audit.AuditLog(fingerprint, root=str(tmp_repo / "cache"))
+    assert log.resumed
+    assert audit.run(log, rules, git_police.SENSITIVE_FILES, jobs=1) == (2, 0)
+    assert len(log.findings()) == 2
+    log.close()
+
+def test_audit_rechecks_names_of_checkpointed_blobs(tmp_repo, git):
+    from grid.core import audit
+
+    (tmp_repo / "__init__.py").write_text("")
+    git("add", ".")
+    git("commit", "-qm", "package")
+    secrets = git_police.build_matcher()
+    root = str(tmp_repo / "cache")
+
+    log = audit.AuditLog(audit.fingerprint(secrets, git_police.SENSITIVE_FILES), root=root)
+    audit.run(log, git_police.secret_rules(), git_police.SENSITIVE_FILES, jobs=1)
+    assert log.findings() == []
+    log.close()
+
+    # Same (empty) blob as __init__.py, which the checkpoint already has
+    (tmp_repo / ".env").write_text("")
+    git("add", ".")
+    git("commit", "-qm", "oops")
+    log = audit.AuditLog(audit.fingerprint(secrets, git_police.SENSITIVE_FILES), root=root)
+    assert log.resumed
+    audit.run(log, git_police.secret_rules(), git_police.SENSITIVE_FILES, jobs=1)
+    found = log.findings()
+    assert [(path, pattern_id) for path, pattern_id, *_ in found] == [(".env", "banned-file")]
+    log.close()
+
+    # One walk places each blob at the commit that first added it (here: with __init__.py)
+    first = git("log", "--reverse", "--format=%h %ad %an", "--date=short").splitlines()[0]
+    assert audit.first_commits([found[0][4]]) == {found[0][4]: first}
+
+    # Editing banned_files invalidates the checkpoint
+    assert not audit.AuditLog(audit.fingerprint(secrets, ["*.py"]), root=root).resumed
+
+def test_banned_names_sharing_a_blob_are_found(tmp_repo, git):
+    from grid.core import audit, hookd
+
+    (tmp_repo / "backup.txt").write_text("-----BEGIN-----\n")
+    (tmp_repo / "server.pem").write_text("-----BEGIN-----\n")
+    (tmp_repo / "__init__.py").write_text("")
+    (tmp_repo / ".env").write_text("")
+    git("add", ".")
+    git("commit", "-qm", "same bytes, different names")
+
+    log = audit.AuditLog("test", root=str(tmp_repo / "cache"))
+    audit.run(log, git_police.secret_rules(), git_police.SENSITIVE_FILES, jobs=1)
+    assert sorted(path for path, *_ in log.findings()) == [".env", "server.pem"]
+    log.close()
+
+    head = git("rev-parse", "HEAD")
+    findings = hookd.check("pre-push", f"refs/heads/main {head} refs/heads/main {hookd.ZERO_SHA}\n")
+    assert sorted(f.path for f in findings) == [".env", "server.pem"]
+
+def test_entropy_flags_random_tokens_only():
+    from grid.core import entropy
+
+    key = b"wJalrXUtnFEMI/K7MDENG/bPxRfiCYEXAMPLEKEY"
+    data = b"def calculate_score_for_python_file(x):\n    sha = '3f2a91c0d4e5b6a7980f1e2d3c4b5a6978695a4b'\n    secret = '" + key + b"'\n"
+    hits = entropy.EntropyDetector().scan(data, path="conf.py")
+
+    assert [(h.pattern_id, h.offset) for h in hits] == [("high-entropy", data.index(key))]
+    assert entropy.EntropyDetector().scan(data, path="package-lock.json") == []
+
+    # The array pass and the plain-Python fallback agree
+    tokens = [key, b"aaaaaaaaaaaaaaaaaaaa", b"ab" * 15]
+    assert entropy.entropies(tokens) == pytest.approx([entropy._entropy(t) for t in tokens])
+
+def test_entropy_settings_from_config(tmp_repo, git):
+    (tmp_repo / "settings.py").write_text('PASSWORD = "q8ZrT2vLw9XkP4mN7bYc1HdF6sJ3gA0e"\n')
+    git("add", ".")
+
+    assert [f.pattern_id for f in git_police.scan_staged()] == ["high-entropy"]
+    assert git_police.scan_staged(cfg={"entropy": False}) == []
+    assert git_police.scan_staged(cfg={"entropy": {"threshold": 6}}) == []
+
+def test_entropy_only_checks_added_lines(tmp_repo, git):
+    from grid.core import entropy, hookd
+
+    password = "q8ZrT2vLw9XkP4mN7bYc1HdF6sJ3gA0e"
+    (tmp_repo / "settings.py").write_text(f'PASSWORD = "{password}"\n')
+    git("add", ".")
+    git("commit", "-qm", "accepted long ago")
+    base = git("rev-parse", "HEAD")
+
+    # Appending a line doesn't re-report the token that is already committed
+    with open(tmp_repo / "settings.py", "a") as f:
+        f.write(f'SALT = "{password[::-1]}"  # grid: allow\n')
+        f.write('DEBUG = False\n')
+    assert git_police.scan_worktree(git_police.working_changes(), root=str(tmp_repo)) == []
+    git("add", ".")
+    assert git_police.scan_staged() == []
+    git("commit", "-qm", "more settings")
+
+    (tmp_repo / "keys.py").write_text(f'KEY = "{password.upper()}"\nOTHER = "{password.lower()}x9"\n')
+    git("add", ".")
+    cfg = {"entropy": {"allow": [password.upper()]}}
+    assert [(f.path, f.line) for f in git_police.scan_staged(cfg=cfg)] == [("keys.py", 2)]
+    git("commit", "-qm", "keys")
+
+    head = git("rev-parse", "HEAD")
+    findings = hookd.check("pre-push", f"refs/heads/main {head} refs/heads/main {base}\n")
+    assert sorted((f.path, f.line) for f in findings) == [("keys.py", 1), ("keys.py", 2)]
+
+    # A token can't carry more bits than log2(its length), so min_length follows the threshold
+    assert entropy.EntropyDetector(threshold=4.5, min_length=20).min_length == 23
+
+def test_hook_worker_round_trip(tmp_repo, git):
+    import threading
+    import time
+    from grid.core import hookd
+
+    (tmp_repo / "leak.py").write_text(f'TOKEN = "{FAKE_KEY}"\n')
+    git("add", ".")
+
+    sock = hookd.socket_path()
+    worker = threading.Thread(target=hookd.serve, args=(sock,), kwargs={"idle_timeout": 5})
+    worker.start()
+    try:
+        for _ in range(50):
+            if hookd.request(sock, {"hook": "ping"}):
+                break
+            time.sleep(0.05)
+        reply = hookd.request(sock, {"hook": "pre-commit", "cwd": str(tmp_repo), "env": {}})
+        assert reply == {"findings": [["leak.py", "github-token", 1]]}
+        # Same answer without a worker (the hook's fallback)
+        assert hookd.handle({"hook": "pre-commit", "cwd": str(tmp_repo)}) == reply
+        # Hooks that don't forward GIT_* are sent back to scan in-process
+        assert "error" in hookd.request(sock, {"hook": "pre-commit", "cwd": str(tmp_repo)})
+    finally:
+        hookd.request(sock, {"hook": "stop"})
+        worker.join()
+    assert not os.path.exists(sock)
+
+def test_hook_worker_sees_commit_all_index(tmp_repo, git, monkeypatch):
+    import threading
+    import time
+    from grid.core import hookd
+
+    (tmp_repo / "app.py").write_text("x = 1\n")
+    git("add", ".")
+    git("commit", "-qm", "first")
+
+    sock = hookd.socket_path()
+    hook = tmp_repo / ".git" / "hooks" / "pre-commit"
+    hook.write_text(hookd.hook_script("pre-commit", sock))
+    hook.chmod(0o755)
+
+    served = []
+    handle = hookd.handle
+    monkeypatch.setattr(hookd, "handle", lambda payload: served.append(payload) or handle(payload))
+    worker = threading.Thread(target=hookd.serve, args=(sock,), kwargs={"idle_timeout": 5})
+    worker.start()
+    try:
+        for _ in range(50):
+            if hookd.request(sock, {"hook": "ping"}):
+                break
+            time.sleep(0.05)
+
+        # Not staged: 'commit -a' stages it into a temporary index only the hook's env points at
+        (tmp_repo / "app.py").write_text(f'TOKEN = "{FAKE_KEY}"\n')
+        result = subprocess.run(["git", "commit", "-qam", "leak"], capture_output=True, text=True)
+    finally:
+        hookd.request(sock, {"hook": "stop"})
+        worker.join()
+
+    assert result.returncode == 1
+    assert "app.py:1 [github-token]" in result.stderr  # git shows hook output on stderr
+    scans = [payload for payload in served if payload["hook"] != "ping"]
+    assert [payload["hook"] for payload in scans] == ["pre-commit"]
+    assert "GIT_INDEX_FILE" in scans[0]["env"]
+    assert "GIT_INDEX_FILE" not in os.environ
+
+def test_hook_fallback_starts_a_worker(tmp_repo, git, monkeypatch):
+    import time
+    from grid.core import hookd
+
+    (tmp_repo / "hooks").mkdir()  # a folder named like the subcommand must not matter
+    (tmp_repo / "hooks" / "a.py").write_text("x = 1\n")
+    sock = hookd.socket_path()
+    hook = tmp_repo / ".git" / "hooks" / "pre-commit"
+    hook.write_text(hookd.hook_script("pre-commit", sock))
+    hook.chmod(0o755)
+
+    # The hook runs outside pytest; let it import this checkout of grid
+    package_root = os.path.abspath(os.path.join(os.path.dirname(hookd.__file__), "..", ".."))
+    monkeypatch.setenv("PYTHONPATH", package_root)
+    git("add", ".")
+    git("commit", "-qm", "clean")  # no worker yet: scans in-process, then starts one
+    try:
+        for _ in range(100):
+            if hookd.request(sock, {"hook": "ping"}):
+                break
+            time.sleep(0.05)
+        assert hookd.request(sock, {"hook": "ping"})
+    finally:
+        hookd.request(sock, {"hook": "stop"})
+
+def test_frozen_build_hooks_call_grid(tmp_repo, git, monkeypatch):
+    import sys
+    from grid.core import hookd
+
+    # Stands in for the PyInstaller grid executable
+    grid = tmp_repo / "bin dir" / "grid"
+    grid.parent.mkdir()
+    grid.write_text(f'#!/bin/sh\necho "$@" > "{tmp_repo}/called"\nexit 1\n')
+    grid.chmod(0o755)
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(sys, "executable", str(grid))
+
+    hook = tmp_repo / ".git" / "hooks" / "pre-commit"
+    hook.write_text(hookd.hook_script("pre-commit", hookd.socket_path()))
+    hook.chmod(0o755)
+    (tmp_repo / "a.py").write_text("x = 1\n")
+    git("add", ".")
+
+    assert subprocess.run(["git", "commit", "-qm", "x"], capture_output=True).returncode == 1
+    assert (tmp_repo / "called").read_text() == "hooks run pre-commit\n"
+
+def test_hook_without_grid_fails_clearly(tmp_repo, git, monkeypatch):
+    from grid.core import hookd
+
+    hook = tmp_repo / ".git" / "hooks" / "pre-commit"
+    hook.write_text(hookd.hook_script("pre-commit", hookd.socket_path()))
+    hook.chmod(0o755)
+    monkeypatch.delenv("PYTHONPATH", raising=False)  # this interpreter can't see the checkout
+    (tmp_repo / "a.py").write_text("x = 1\n")
+    git("add", ".")
+
+    result = subprocess.run(["git", "commit", "-qm", "x"], capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "can't import grid" in result.stderr
+    assert "Traceback" not in result.stderr
+
+def test_pre_push_reads_every_version_pushed(tmp_repo, git):
+    from grid.core import hookd
+
+    (tmp_repo / "config.py").write_text("x = 1\n")
+    git("add", ".")
+    git("commit", "-qm", "base")
+    base = git("rev-parse", "HEAD")
+
+    # Added and removed again inside the push: the middle commit still gets published
+    (tmp_repo / "config.py").write_text(f'TOKEN = "{FAKE_KEY}"\n')
+    git("commit", "-qam", "oops")
+    (tmp_repo / "config.py").write_text("x = 2\n")
+    git("commit", "-qam", "fix")
+    head = git("rev-parse", "HEAD")
+
+    stdin = f"refs/heads/main {head} refs/heads/main {base}\n"
+    findings = hookd.check("pre-push", stdin)
+    assert [(f.path, f.pattern_id, f.line) for f in findings] == [("config.py", "github-token", 1)]
+
+def test_pushed_revs():
+    from grid.core import hookd
+
+    new, old, zero = "a" * 40, "b" * 40, hookd.ZERO_SHA
+    stdin = (f"refs/heads/x {new} refs/heads/x {old}\n"
+             f"refs/heads/y {new} refs/heads/y {zero}\n"
+             f"(delete) {zero} refs/heads/z {old}\n")
+    assert hookd.pushed_revs(stdin) == [[new, f"^{old}"], [new, "--not", "--remotes"]]
+
+def test_verdict_cache_skips_unchanged_blobs(tmp_repo, git):
+    from grid.core import cache
+
+    (tmp_repo / "leak.py").write_text(f'x = 1\nTOKEN = "{FAKE_KEY}"\n')
+    (tmp_repo / "clean.py").write_text("x = 1\n")
+    git("add", ".")
+
+    for diff_only in (False, True):
+        # Full mode keeps a pattern verdict per blob and an entropy verdict per added-lines diff
+        lookups = 2 if diff_only else 4
+        with cache.Store("secrets", root=str(tmp_repo / "cache")) as store:
+            first = git_police.scan_staged(diff_only=diff_only, store=store)
+            assert (store.hits, store.misses) == (0, lookups)
+
+        # Same blobs, same patterns: nothing is rescanned, same answer
+        with cache.Store("secrets", root=str(tmp_repo / "cache")) as store:
+            assert git_police.scan_staged(diff_only=diff_only, store=store) == first
+            assert (store.hits, store.misses) == (lookups, 0)
+
+            # A different pattern set never reuses those verdicts
+            git_police.scan_staged(diff_only=diff_only, cfg={"secret_patterns": ["acme_[0-9]{8}"]}, store=store)
+            assert store.misses == 2
+
+    assert [(f.path, f.pattern_id, f.line) for f in first] == [("leak.py", "github-token", 2)]
+
+def test_worktree_scan_stages_only_clean_files(tmp_repo, git):
+    (tmp_repo / "old.txt").write_text("a\n")
+    (tmp_repo / "same.txt").write_text("b\n")
+    git("add", ".")
+    git("commit", "-qm", "init")
+
+    (tmp_repo / "old.txt").unlink()
+    (tmp_repo / "new file.py").write_text("x = 1\n")
+    (tmp_repo / "leak.py").write_text(f'TOKEN = "{FAKE_KEY}"\n')
+    (tmp_repo / "prod.env").write_text("A=1\n")
+
+    changes = git_police.working_changes()
+    assert sorted((c.path, c.deleted) for c in changes) == [
+        ("leak.py", False), ("new file.py", False), ("old.txt", True), ("prod.env", False)]
+
+    findings = git_police.scan_worktree(changes, root=str(tmp_repo))
+    leaked = {f.path for f in findings}
+    assert leaked == {"leak.py", "prod.env"}
+
+    git_police.stage([c.path for c in changes if c.path not in leaked])
+    assert sorted(path for path, _ in git_police.staged_blobs()) == ["new file.py"]
+    assert git_police.working_changes() and git_police.scan_staged() == []
+
+def test_stage_reports_git_errors(tmp_repo):
+    (tmp_repo / "a.py").write_text("x = 1\n")
+    (tmp_repo / ".git" / "index.lock").write_text("")  # another git (or a crashed one) holds the index
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        git_police.stage(["a.py"])
+    assert "index.lock" in error.value.stderr
@@ -0,0 +1,50 @@
+# Tests for the per-commit code health history
+from grid.core import blobs, history
+
+def _commit(git, files, message):
+    for name, body in files.items():
+        with open(name, "w") as f:
+            f.write(body)
+    git("add", ".")
+    git("commit", "-qm", message)
+
+def test_blob_reader_streams_objects(tmp_repo, git):
+    _commit(git, {"a.py": "a = 1\n", "b.py": "b = 2\n"}, "one")
+
+    with blobs.BlobReader() as reader:
+        found = dict(reader.iter_blobs(["HEAD:a.py", "HEAD:missing.py", "HEAD:b.py"]))
+        assert found == {"HEAD:a.py": b"a = 1\n", "HEAD:missing.py": None, "HEAD:b.py": b"b = 2\n"}
+        assert reader.read("HEAD:a.py") == b"a = 1\n"
+
+def test_unchanged_blobs_are_analyzed_once(tmp_repo, git):
+    _commit(git, {"stable.py": "x = 1\n", "churn.py": "y = 1\n"}, "one")
+    _commit(git, {"churn.py": "def f():\n    global y\n"}, "two")
+    _commit(git, {"notes.txt": "not code\n"}, "three")
+
+    db = history.HistoryDB()
+    commits = history.record(db, 10, jobs=1)
+    assert len(commits) == 3
+
+    blob_count = db.db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    assert blob_count == 3  # stable.py once, churn.py twice, notes.txt never
+
+    newest, oldest = commits[0][0], commits[-1][0]
+    assert db.file_scores(oldest) == {"stable.py": 10, "churn.py": 10}
+    assert db.file_scores(newest)["churn.py"] < 10
+
+    # A second run finds nothing new to analyze
+    assert history.record(db, 10, jobs=1) == commits
+    assert db.missing_blobs() == []
+    db.close()
+
+def test_larger_max_size_analyzes_skipped_blobs(tmp_repo, git):
+    _commit(git, {"big.py": "x = 1\n" * 400, "small.py": "y = 1\n"}, "one")
+
+    db = history.HistoryDB()
+    head = history.record(db, 5, jobs=1, max_bytes=1024)[0][0]
+    assert db.file_scores(head) == {"small.py": 10}
+    assert db.missing_blobs(1024) == []
+
+    history.record(db, 5, jobs=1, max_bytes=4096)
+    assert db.file_scores(head) == {"big.py": 10, "small.py": 10}
+    db.close()
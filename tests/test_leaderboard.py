@@ -0,0 +1,20 @@
+# Tests for the cowboy leaderboard bookkeeping
+from grid.core import leaderboard
+
+def test_scores_by_branch_owner():
+    branches = ["cowboy/neo/fix/a", "cowboy/neo/x/b", "cowboy/trinity/y/c", "feature/login", "cowboy/"]
+    assert leaderboard.scores(branches) == {"Neo": 2, "Trinity": 1}
+
+def test_snapshot_remembers_deleted_branches(tmp_path):
+    snapshot = leaderboard.record(leaderboard.load_snapshot(tmp_path), {"cowboy/neo/a/b": "1", "cowboy/neo/c/d": "2"}, now=1)
+    leaderboard.save_snapshot(snapshot, tmp_path)
+
+    snapshot = leaderboard.record(leaderboard.load_snapshot(tmp_path), {"cowboy/neo/a/b": "1"}, now=2)
+    assert snapshot["branches"]["cowboy/neo/c/d"]["gone"] == 2
+    assert snapshot["branches"]["cowboy/neo/a/b"]["gone"] is None
+    assert leaderboard.scores(snapshot["branches"]) == {"Neo": 2}
+
+def test_merge_subjects_name_cowboy_branches():
+    subjects = "Merge branch 'cowboy/neo/fix/slug'\nMerge pull request #12 from acme/cowboy/trinity/hotfix\n"
+    found = {m.group(1) for m in leaderboard.MERGED_COWBOY.finditer(subjects)}
+    assert found == {"cowboy/neo/fix/slug", "cowboy/trinity/hotfix"}
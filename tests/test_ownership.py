@@ -0,0 +1,38 @@
+# Tests for streaming blame aggregation
+import os
+import subprocess
+import pytest
+from grid.core import cache, ownership
+
+def _commit(author, message):
+    env = dict(os.environ, GIT_AUTHOR_NAME=author, GIT_AUTHOR_EMAIL=f"{author}@test",
+               GIT_COMMITTER_NAME=author, GIT_COMMITTER_EMAIL=f"{author}@test")
+    subprocess.run(["git", "commit", "-qam", message], check=True, env=env)
+
+def test_whole_file_and_range_ownership(tmp_path, monkeypatch):
+    os.chdir(tmp_path)
+    subprocess.run(["git", "init", "-q"], check=True)
+    (tmp_path / "app.py").write_text("".join(f"line_{i} = {i}\n" for i in range(10)))
+    subprocess.run(["git", "add", "."], check=True)
+    _commit("neo", "first")
+    (tmp_path / "app.py").write_text("".join(f"line_{i} = {i if i >= 7 or i == 0 else -i}\n" for i in range(10)))
+    _commit("trinity", "second")
+
+    report = ownership.who_owns("app.py")
+    assert report["lines"] == 10
+    assert [(name, entry["lines"]) for name, entry in ownership.ranked(report)] == [("trinity", 6), ("neo", 4)]
+
+    start, end = ownership.parse_range("8-10")
+    assert {name: e["lines"] for name, e in ownership.who_owns("app.py", start, end)["authors"].items()} == {"neo": 3}
+
+    # Second ask for the same blob never runs git blame
+    with cache.Store("blame", root=str(tmp_path / "cache")) as store:
+        first = ownership.who_owns("app.py", store=store)
+        monkeypatch.setattr(ownership, "stream_blame", lambda *a: pytest.fail("blamed again"))
+        assert ownership.who_owns("app.py", store=store) == first
+
+def test_parse_range():
+    assert ownership.parse_range(None) == (None, None)
+    assert ownership.parse_range("10,80") == (10, 80)
+    with pytest.raises(ValueError):
+        ownership.parse_range("9-3")
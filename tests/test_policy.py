@@ -0,0 +1,41 @@
+# Tests for the banned_files path policy
+from grid.core import policy
+
+def test_globs_directories_and_negation():
+    rules = policy.PathPolicy([
+        ".env",             # legacy plain name: suffix match, like before
+        "*.p12",
+        "/config/*.json",
+        "secrets/",
+        "**/fixtures/**/*.pem",
+        "!config/public.json",
+    ])
+    paths = [
+        "prod.env", "app/.env", "env.txt",
+        "certs/client.p12", "client.p12.txt",
+        "config/db.json", "config/public.json", "app/config/db.json",
+        "secrets/a/b.txt", "src/secrets/token", "secrets.txt",
+        "tests/fixtures/x/y.pem", "fixtures/z.pem",
+    ]
+    assert policy.PathPolicy([]).banned(paths) == {}
+    assert set(rules.banned(paths)) == {
+        "prod.env", "app/.env", "certs/client.p12", "config/db.json",
+        "secrets/a/b.txt", "src/secrets/token", "tests/fixtures/x/y.pem", "fixtures/z.pem",
+    }
+    assert rules.match("config/db.json") == "/config/*.json"
+    assert rules.match("config/public.json") is None
+
+def test_last_match_wins():
+    rules = policy.PathPolicy(["*.key", "!test_*.key", "test_prod.key"])
+    assert rules.banned(["a.key", "test_a.key", "test_prod.key"]) == {
+        "a.key": "*.key", "test_prod.key": "test_prod.key",
+    }
+
+def test_negated_classes_and_broken_globs():
+    rules = policy.PathPolicy(["a[!x]b", "[z-a].key", "*.pem"])
+    # A negated class never swallows the newline between batched paths (or a '/')
+    assert rules.banned(["b", "a"]) == {}
+    assert rules.banned(["ayb", "axb", "a/b"]) == {"ayb": "a[!x]b"}
+    # The broken rule is reported and skipped; the others still apply
+    assert [pattern for pattern, _ in rules.errors] == ["[z-a].key"]
+    assert rules.match("certs/x.pem") == "*.pem"
@@ -0,0 +1,117 @@
+# Tests for the shared git access layer
+import os
+import subprocess
+import pytest
+from grid.core import repo
+
+@pytest.fixture
+def project(tmp_repo, git):
+    git("remote", "add", "origin", "git@github.com:acme/widgets.git")
+    (tmp_repo / "a.py").write_text("x = 1\n")
+    git("add", ".")
+    git("commit", "-qm", "first")
+    git("branch", "feature/login")
+    return tmp_repo
+
+def test_reads_head_refs_and_remote(project, monkeypatch):
+    repository = repo.Repository()
+    assert repository.current_branch() == "main"
+    assert repository.branches() == ["feature/login", "main"]
+    assert repository.home_branch() == "main"
+    assert repository.web_url() == "https://github.com/acme/widgets"
+    assert sorted(repository.merged_branches()) == ["feature/login", "main"]
+
+    # Subfolders find the repo too
+    os.makedirs("sub")
+    monkeypatch.chdir("sub")
+    assert repo.Repository().current_branch() == "main"
+
+def test_answers_are_memoized_until_invalidated(project, git):
+    repository = repo.Repository()
+    assert repository.current_branch() == "main"
+    git("checkout", "-q", "feature/login")
+    assert repository.current_branch() == "main"
+    repository.invalidate()
+    assert repository.current_branch() == "feature/login"
+
+    git("checkout", "-q", "--detach")
+    assert repo.Repository().current_branch() == ""
+
+def test_outside_a_repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    repository = repo.Repository()
+    assert not repository.is_repo
+    assert repository.current_branch() == "unknown"
+    assert repository.branches() == []
+    assert repository.web_url() is None
+
+@pytest.mark.parametrize("name", ["pygit2", "dulwich"])
+def test_in_process_backends_agree(project, name):
+    pytest.importorskip(name)
+    backend = repo.make_backend(".", name)
+    reference = repo.SubprocessBackend(".")
+    assert backend.name == name
+    assert backend.head() == reference.head() == "refs/heads/main"
+    assert backend.refs("refs/heads/") == reference.refs("refs/heads/")
+    assert backend.config("remote.origin.url") == reference.config("remote.origin.url")
+    assert backend.config("no.such.key") is None
+
+def test_merged_remote_branches(project, git, tmp_path_factory):
+    remote = tmp_path_factory.mktemp("origin.git")
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    git("remote", "set-url", "origin", str(remote))
+    git("push", "-q", "origin", "main", "feature/login")
+    git("checkout", "-q", "-b", "wip")
+    git("commit", "-q", "--allow-empty", "-m", "unmerged")
+    git("push", "-q", "origin", "wip")
+
+    repository = repo.Repository()
+    assert repository.remote_home() == "origin/main"
+    assert repository.merged_branches(target="origin/main", remote="origin") == ["feature/login", "main"]
+
+def test_purge_deletes_in_batches_and_reads_porcelain(project, git, tmp_path_factory, monkeypatch):
+    from grid.commands import purge
+
+    remote = tmp_path_factory.mktemp("origin.git")
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    git("remote", "set-url", "origin", str(remote))
+    for name in ("cowboy/neo/a", "cowboy/neo/b"):
+        git("branch", name)
+    git("push", "-q", "origin", "main", "cowboy/neo/a", "cowboy/neo/b")
+    git("checkout", "-q", "-b", "wip")
+    git("commit", "-q", "--allow-empty", "-m", "unmerged")
+    git("checkout", "-q", "main")
+
+    # Success is read from git's output, so a translated one mustn't break it
+    monkeypatch.setenv("LANGUAGE", "de")
+    monkeypatch.setenv("LC_ALL", "de_DE.UTF-8")
+    monkeypatch.setattr(purge, "BATCH", 2)
+    deleted = purge._delete_local(["cowboy/neo/a", "cowboy/neo/b", "wip"])
+    assert deleted == ["cowboy/neo/a", "cowboy/neo/b"]
+    assert repo.Repository().branches() == ["feature/login", "main", "wip"]
+
+    assert purge._delete_remote("origin", ["cowboy/neo/a", "cowboy/neo/b", "never-existed"]) == ["cowboy/neo/a", "cowboy/neo/b"]
+    heads = subprocess.check_output(["git", "ls-remote", "--heads", "origin"], text=True)
+    assert "cowboy" not in heads
+
+def test_remote_purge_asks_and_only_takes_cowboy_branches(project, git, tmp_path_factory, monkeypatch):
+    from grid.commands import purge
+    from grid.core import utils
+
+    remote = tmp_path_factory.mktemp("origin.git")
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    git("remote", "set-url", "origin", str(remote))
+    git("branch", "cowboy/neo/a")
+    # A teammate's branch pushed a minute ago: still at main's tip, so "merged"
+    git("push", "-q", "origin", "main", "feature/login", "cowboy/neo/a")
+
+    def heads():
+        return sorted(line.split("refs/heads/")[1] for line in
+                      subprocess.check_output(["git", "ls-remote", "--heads", "origin"], text=True).splitlines())
+
+    monkeypatch.setattr(utils, "confirm", lambda question, default=False: False)
+    purge._purge_remote(repo.Repository(), dry_run=False)
+    assert heads() == ["cowboy/neo/a", "feature/login", "main"]
+
+    purge._purge_remote(repo.Repository(), dry_run=False, yes=True)
+    assert heads() == ["feature/login", "main"]
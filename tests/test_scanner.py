@@ -0,0 +1,51 @@
+# Tests for the project scan engine
+from grid.core import scanner
+
+def _make_project(root, count):
+    for i in range(count):
+        (root / f"mod_{i:03}.py").write_text(f"def f{i}(a):\n    return a + {i}\n")
+    return sorted(str(p) for p in root.glob("*.py"))
+
+def test_tiny_projects_run_serially():
+    assert scanner.resolve_jobs(8, scanner.SERIAL_THRESHOLD - 1) == 1
+    assert scanner.resolve_jobs(1, 10_000) == 1
+
+def test_parallel_scan_matches_serial_order(tmp_path):
+    paths = _make_project(tmp_path, scanner.SERIAL_THRESHOLD + 5)
+
+    serial = list(scanner.scan_files(paths, jobs=1))
+    parallel = list(scanner.scan_files(paths, jobs=2))
+
+    assert [p for p, _ in parallel] == paths
+    assert parallel == serial
+
+def test_git_selection_modes(tmp_repo, git):
+    (tmp_repo / ".gitignore").write_text("junk/\n")
+    (tmp_repo / "old.py").write_text("a = 1\n")
+    (tmp_repo / "edited.py").write_text("b = 1\n")
+    git("add", ".")
+    git("commit", "-qm", "base")
+
+    (tmp_repo / "edited.py").write_text("b = 2\n")
+    (tmp_repo / "new.py").write_text("c = 1\n")
+    (tmp_repo / "junk").mkdir()
+    (tmp_repo / "junk" / "ignored.py").write_text("d = 1\n")
+
+    assert sorted(scanner.collect_files()) == ["edited.py", "new.py", "old.py"]
+    assert scanner.collect_files(since="HEAD") == ["edited.py"]
+    assert scanner.collect_files(staged=True) == []
+
+    git("add", "new.py")
+    assert scanner.collect_files(staged=True) == ["new.py"]
+    assert scanner.collect_files(since="no-such-ref") is None
+
+def test_scoreboard_keeps_only_the_worst_files():
+    from grid.commands.roast import Scoreboard
+
+    board = Scoreboard(top=2)
+    for path, score in [("a", 9), ("b", 3), ("c", 7), ("d", 3), ("e", 10)]:
+        board.add(path, score)
+
+    assert [(p, s) for p, s, _ in board.worst()] == [("b", 3), ("d", 3)]
+    assert board.file_count == 5
+    assert board.average == 32 / 5
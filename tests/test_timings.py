@@ -0,0 +1,30 @@
+import subprocess
+import sys
+from grid.core.timings import Profiler, phase
+
+def test_subprocess_time_is_charged_to_its_phase(tmp_path):
+    profiler = Profiler()
+    with profiler.installed():
+        with phase(profiler, "child"):
+            subprocess.run([sys.executable, "-c", "import time; time.sleep(0.2)"])
+        with phase(profiler, "python"):
+            sum(range(1000))
+
+    report = profiler.report()
+    child, python = report["phases"]
+    assert child["calls"] == 1  # run() -> Popen -> communicate counted once
+    assert child["subprocess"] >= 0.2
+    assert python["subprocess"] == 0 and python["calls"] == 0
+    assert report["slowest_calls"][0]["phase"] == "child"
+
+    # Patches are removed afterwards
+    assert subprocess.run.__name__ == "run"
+
+    path = tmp_path / "timings.jsonl"
+    profiler.append_json(path, command="push")
+    profiler.append_json(path, command="push")
+    assert len(path.read_text().splitlines()) == 2
+
+def test_phase_is_a_no_op_without_profiler():
+    with phase(None, "anything"):
+        pass
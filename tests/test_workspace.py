@@ -0,0 +1,26 @@
+# Tests for multi-repo discovery and log merging
+import os
+import subprocess
+from grid.core import workspace
+
+def _commit(path, message, when):
+    env = dict(os.environ, GIT_AUTHOR_DATE=f"{when} +0000", GIT_COMMITTER_DATE=f"{when} +0000",
+               GIT_AUTHOR_NAME="neo", GIT_AUTHOR_EMAIL="neo@test",
+               GIT_COMMITTER_NAME="neo", GIT_COMMITTER_EMAIL="neo@test")
+    subprocess.run(["git", "-C", str(path), "commit", "-q", "--allow-empty", "-m", message], check=True, env=env)
+
+def test_collect_merges_repos_by_time(tmp_path):
+    for name in ("svc/api", "web", "node_modules/dep", "web/vendored"):
+        (tmp_path / name).mkdir(parents=True)
+        subprocess.run(["git", "init", "-q", str(tmp_path / name)], check=True)
+
+    repos = workspace.discover(tmp_path)
+    assert [p[len(str(tmp_path)) + 1:] for p in repos] == ["svc/api", "web"]
+
+    _commit(tmp_path / "web", "web first", 1700000000)
+    _commit(tmp_path / "svc/api", "api | second", 1700000100)
+    _commit(tmp_path / "web", "web third", 1700000200)
+
+    commits = workspace.collect(repos, since="2023-01-01", jobs=2, root=tmp_path)
+    assert [(c.repo, c.subject) for c in commits] == [
+        ("web", "web first"), ("svc/api", "api | second"), ("web", "web third")]